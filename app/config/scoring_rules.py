@@ -0,0 +1,315 @@
+# ======================================================
+# SCORING RULES (DEFAULT)
+# ======================================================
+#
+# Rule table per screener_type, dikompilasi app.core.rules.
+# Threshold / poin bisa di-tune lewat data/scoring_rules.json
+# (format sama, cukup tulis bagian yang diubah), contoh:
+#
+#   {"breakout": {"params": {"min_score": 65}}}
+#
+# groups: 1 grup = 1 rantai if / elif, rule pertama yang
+# cocok dapat poin, tidak ada yang cocok -> "default" (0).
+# Label grup = key score_breakdown (swing_trade_week: score_points,
+# score_breakdown-nya berisi metrik tampilan).
+
+def _chain(label, *rules, default=0):
+
+    return {
+        "label": label,
+        "rules": [{"when": when, "points": points} for when, points in rules],
+        "default": default,
+    }
+
+
+SCORING_RULES = {
+
+    # ==================================================
+    # BREAKOUT (BELI SORE JUAL PAGI)
+    # ==================================================
+
+    "breakout": {
+
+        "params": {
+            "rsi_max": 70,
+            "min_score": 60,
+        },
+
+        "groups": [
+
+            # + EMA DISTANCE PROTECTION
+            _chain(
+                "Breakout",
+                ("last_close >= resistance * 0.998 and ema_distance <= 4", 40),
+                ("last_close >= resistance * 0.985 and ema_distance <= 3", 25),
+            ),
+
+            _chain(
+                "Trend",
+                ("ema20_last >= ema20_prev", 20),
+            ),
+
+            # HARUS NAIK & ADA ACCELERATION
+            _chain(
+                "Volume",
+                ("vol_last > vol_ma_last and vol_last > vol_prev", 25),
+                ("vol_last > vol_ma_last * 0.8", 15),
+            ),
+
+            _chain(
+                "RSI",
+                ("rsi_last >= 55", 15),
+                ("rsi_last >= 50", 8),
+            ),
+        ],
+
+        # FINAL FILTER (MODE A — KETAT)
+        "accept": [
+            {"reject": "rsi_last >= rsi_max", "reason": "RSI Overbought"},
+            {"reject": "score < min_score", "reason": "Low Score"},
+        ],
+    },
+
+    # ==================================================
+    # ARA HUNTER (SWING TRADE DAY)
+    # ==================================================
+
+    "ara_hunter": {
+
+        # filter utama (jangan terlalu ketat)
+        "filters": [
+            {"require": "vol_last >= min_daily_volume", "reason": "Low Volume"},
+            {"require": "return_pct >= 1", "reason": "No Momentum"},
+            {"require": "last_close > ma5_last", "reason": "Below MA5"},
+            {"require": "last_close > last_open", "reason": "Red Candle"},
+            {"require": "last_close > prev_close", "reason": "Not Rising"},
+            {"require": "prev_close <= ma5_prev * 1.02", "reason": "Late Entry"},
+            {"require": "last_open <= prev_close * 1.05", "reason": "Gap Too High"},
+        ],
+
+        "base": 50,
+
+        "groups": [
+
+            _chain(
+                "Volume",
+                ("vol_ratio >= 10", 25),
+                ("vol_ratio >= 5", 20),
+                ("vol_ratio >= 3", 15),
+                ("vol_ratio >= 2", 10),
+            ),
+
+            _chain(
+                "Body",
+                ("body_pct >= 20", 20),
+                ("body_pct >= 10", 15),
+                ("body_pct >= 5", 10),
+                ("body_pct >= 2", 5),
+            ),
+
+            _chain(
+                "Close Near High",
+                ("close_near_high <= 0.3", 20),
+                ("close_near_high <= 1", 15),
+                ("close_near_high <= 2", 8),
+            ),
+
+            _chain(
+                "Momentum",
+                ("return_pct >= 25", 15),
+                ("return_pct >= 15", 12),
+                ("return_pct >= 10", 10),
+                ("return_pct >= 5", 7),
+            ),
+
+            _chain(
+                "Gap Safe",
+                ("0 <= gap_pct <= 2", 10),
+                ("gap_pct <= 5", 5),
+            ),
+
+            _chain(
+                "EMA20",
+                ("last_close >= ema20_last and ema20_last >= ema20_prev", 5),
+            ),
+
+            _chain(
+                "MACD",
+                ("macd_prev <= signal_prev and macd_last > signal_last", 5),
+                ("macd_last > signal_last", 3),
+            ),
+
+            # penalty
+            _chain(
+                "Overextended",
+                ("distance_from_ma5 >= 30", -15),
+                ("distance_from_ma5 >= 20", -8),
+            ),
+
+            _chain(
+                "Climax",
+                ("return_pct >= 35", -10),
+            ),
+        ],
+    },
+
+    # ==================================================
+    # SWING TRADE WEEK (HEALTHY PULLBACK + REBOUND)
+    # ==================================================
+
+    "swing_trade_week": {
+
+        "filters": [
+
+            # basic
+            {"reject": "vol_last < min_daily_volume", "reason": "Low Volume"},
+            {"reject": "traded_value < min_daily_value", "reason": "Low Liquidity"},
+            {"reject": "not bullish_alignment", "reason": "Weak Alignment"},
+            {"reject": "not ma50_uptrend", "reason": "MA50 Downtrend"},
+            {"reject": "distance_ma20 < -4", "reason": "Too Weak Below MA20"},
+
+            # healthy pullback
+            {"reject": "distance_ma20 >= 12", "reason": "Too Extended"},
+            {"reject": "pullback_pct <= -18", "reason": "Too Deep Pullback"},
+
+            # rebound
+            {"reject": "rebound_zone >= 35", "reason": "Too Far From Support"},
+        ],
+
+        "base": 40,
+
+        "clip": [0, 99],
+
+        "groups": [
+
+            # ================= TREND =================
+            _chain("Alignment", ("bullish_alignment", 10)),
+
+            _chain("MA20 Trend", ("ma20_uptrend", 6), default=-4),
+
+            _chain("MA50 Trend", ("ma50_uptrend", 6)),
+
+            _chain("Above MA20", ("last_close > ma20_last", 4)),
+
+            # ================= PULLBACK =================
+            _chain("Near MA20", ("abs(distance_ma20) <= 3", 8)),
+
+            _chain(
+                "Pullback",
+                ("-12 <= pullback_pct <= -2", 10),
+                ("-18 <= pullback_pct <= -12", 4),
+            ),
+
+            # ================= REBOUND =================
+            _chain(
+                "Rebound",
+                ("lower_wick >= 4", 8),
+                ("lower_wick >= 2", 4),
+            ),
+
+            # ================= VOLUME =================
+            _chain(
+                "Volume",
+                ("vol_ratio >= 5", 10),
+                ("vol_ratio >= 3", 7),
+                ("vol_ratio >= 2", 5),
+                ("vol_ratio >= 1.2", 2),
+            ),
+
+            # ================= LIQUIDITY =================
+            _chain(
+                "Liquidity",
+                ("traded_value >= 100_000_000_000", 6),
+                ("traded_value >= 50_000_000_000", 4),
+                ("traded_value >= 20_000_000_000", 2),
+            ),
+
+            # ================= VOLATILITY =================
+            # terlalu liar jangan terlalu dibonusin
+            _chain(
+                "Volatility",
+                ("10 <= atr_pct <= 20", 5),
+                ("8 <= atr_pct < 10", 3),
+                ("atr_pct > 20", 2),
+            ),
+
+            # ================= MOMENTUM =================
+            _chain(
+                "Momentum",
+                ("1 <= return_pct <= 5", 5),
+                ("0 <= return_pct < 1", 2),
+            ),
+
+            # ================= HEALTHY CANDLE =================
+            _chain("Body", ("body_pct >= 2", 3)),
+
+            _chain("Close Near High", ("close_near_high <= 1", 3)),
+
+            # ================= PENALTY =================
+            _chain(
+                "Extended",
+                ("distance_ma20 >= 12", -15),
+                ("distance_ma20 >= 10", -10),
+                ("distance_ma20 >= 8", -5),
+            ),
+
+            _chain(
+                "Weak Volume",
+                ("vol_ratio < 0.8", -8),
+                ("vol_ratio < 1", -5),
+            ),
+
+            _chain(
+                "Upper Wick",
+                ("upper_wick >= 7", -12),
+                ("upper_wick >= 5", -8),
+                ("upper_wick >= 3", -4),
+            ),
+
+            _chain(
+                "Small Body",
+                ("body_pct < 0.3", -8),
+                ("body_pct < 0.5", -5),
+            ),
+
+            _chain(
+                "Low Liquidity",
+                ("traded_value < 3_000_000_000", -15),
+                ("traded_value < 5_000_000_000", -10),
+                ("traded_value < 10_000_000_000", -5),
+            ),
+
+            _chain(
+                "Low Volatility",
+                ("atr_pct < 4", -18),
+                ("atr_pct < 5", -15),
+                ("atr_pct < 8", -8),
+            ),
+
+            _chain(
+                "Trend Stability",
+                ("trend_stability >= 25", -20),
+                ("trend_stability >= 20", -12),
+                ("trend_stability >= 15", -6),
+            ),
+
+            # terlalu dekat resistance
+            _chain(
+                "Near Resistance",
+                ("distance_high_10 <= 1", -10),
+                ("distance_high_10 <= 2", -5),
+            ),
+
+            _chain(
+                "Weak Rebound",
+                ("lower_wick < 1 and return_pct <= 0", -5),
+            ),
+
+            # sideways / dead stock
+            _chain(
+                "Sideways",
+                ("abs(return_pct) < 0.3 and atr_pct < 6", -8),
+            ),
+        ],
+    },
+}
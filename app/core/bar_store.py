@@ -0,0 +1,591 @@
+import os
+import json
+import time
+import asyncio
+import threading
+
+from datetime import datetime
+
+import pandas as pd
+
+from app.core.fetcher import (
+    download_bars,
+    download_bars_async,
+    download_batch,
+)
+from app.utils.market_hours import (
+    TZ,
+    is_market_open,
+    is_settling,
+    next_session_boundary,
+)
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+STORE_DIR = os.path.join("data", "bars")
+
+# selama market buka: data dianggap fresh N detik setelah fetch
+FRESH_SECONDS = {
+    "15m": 60,
+    "1d": 15 * 60,
+    "1wk": 15 * 60,
+}
+
+DEFAULT_FRESH_SECONDS = 60
+
+# bar terakhir yang di-fetch ulang saat update tail
+# (bar terakhir bisa masih berjalan + buat cek adjustment)
+OVERLAP_BARS = 3
+
+# yahoo cuma simpan intraday ~60 hari
+INTRADAY_MAX_DAYS = 59
+
+# beda harga bar lama > toleransi = ada split / dividen -> full refresh
+ADJ_TOLERANCE = 1e-4
+
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+
+# ======================================================
+# PERIOD HELPER
+# ======================================================
+
+def period_start(period, now=None):
+
+    """
+    "6mo" / "5y" / "10d" -> tanggal awal (naive, waktu Jakarta).
+    "max" / None -> None (semua history).
+    """
+
+    if period in (None, "max"):
+        return None
+
+    now = pd.Timestamp(now or datetime.now(TZ)).tz_localize(None).normalize()
+
+    if period == "ytd":
+        return now.replace(month=1, day=1)
+
+    for unit, offset in [
+        ("mo", lambda n: pd.DateOffset(months=n)),
+        ("wk", lambda n: pd.DateOffset(weeks=n)),
+        ("d", lambda n: pd.offsets.BDay(n)),
+        ("y", lambda n: pd.DateOffset(years=n)),
+    ]:
+
+        if period.endswith(unit):
+            return now - offset(int(period[:-len(unit)]))
+
+    raise ValueError(f"Period '{period}' tidak dikenal")
+
+
+def _local(ts, index):
+
+    """Samakan timezone ts dengan index (daily naive, intraday tz-aware)."""
+
+    ts = pd.Timestamp(ts)
+
+    if index.tz is not None and ts.tz is None:
+        return ts.tz_localize(index.tz)
+
+    if index.tz is None and ts.tz is not None:
+        return ts.tz_convert(TZ).tz_localize(None)
+
+    return ts
+
+
+def _slice(df, period):
+
+    start = period_start(period)
+
+    if df is None or start is None:
+        return df
+
+    return df[df.index >= _local(start, df.index)]
+
+
+# ======================================================
+# BAR STORE
+# ======================================================
+
+class BarStore:
+
+    """
+    Persistent OHLCV store (Parquet per ticker / interval)
+
+    - data/bars/<interval>/<symbol>.parquet -> bar mentah (belum adjust)
+    - data/bars/<interval>/<symbol>.json    -> meta (last_ts, fetched_at, covered_from)
+
+    Load:
+    - fresh -> baca dari disk saja (tanpa network)
+    - tail  -> download bar sejak last_ts (append)
+    - full  -> download ulang 1 period penuh
+    """
+
+    def __init__(self, root=STORE_DIR):
+
+        self.root = root
+
+        self._locks = {}
+
+        self._locks_guard = threading.Lock()
+
+    # ======================================================
+    # PATH
+    # ======================================================
+
+    def _path(self, symbol, interval, ext):
+
+        name = symbol.replace("^", "_").replace("/", "_")
+
+        return os.path.join(self.root, interval, f"{name}.{ext}")
+
+    def _lock(self, symbol, interval):
+
+        with self._locks_guard:
+
+            return self._locks.setdefault(
+                (symbol, interval),
+                threading.Lock()
+            )
+
+    # ======================================================
+    # READ / WRITE
+    # ======================================================
+
+    def read(self, symbol, interval):
+
+        meta_path = self._path(symbol, interval, "json")
+
+        data_path = self._path(symbol, interval, "parquet")
+
+        if not os.path.exists(meta_path) or not os.path.exists(data_path):
+            return None, {}
+
+        try:
+
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+            df = pd.read_parquet(data_path)
+
+        except Exception as e:
+            print(f"[STORE] rusak {symbol} {interval}: {e}")
+            return None, {}
+
+        return df, meta
+
+    def _write(self, symbol, interval, df, meta):
+
+        data_path = self._path(symbol, interval, "parquet")
+
+        meta_path = self._path(symbol, interval, "json")
+
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+        # tulis ke tmp lalu replace -> aman dibaca proses lain
+        df.to_parquet(data_path + ".tmp")
+        os.replace(data_path + ".tmp", data_path)
+
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump(meta, f)
+
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def last_timestamp(self, symbol, interval):
+
+        _, meta = self.read(symbol, interval)
+
+        ts = meta.get("last_ts")
+
+        return pd.Timestamp(ts) if ts else None
+
+    # ======================================================
+    # PLAN
+    # ======================================================
+
+    def _is_fresh(self, meta, interval):
+
+        fetched_at = meta.get("fetched_at")
+
+        if not fetched_at:
+            return False
+
+        now = datetime.now(TZ)
+
+        fetched = datetime.fromtimestamp(fetched_at, TZ)
+
+        # fetch saat market tutup -> valid sampai sesi berikutnya buka,
+        # kecuali masih di grace setelah close (bar hari ini belum final)
+        if not is_market_open(fetched) and not is_settling(fetched):
+            return next_session_boundary(fetched) > now
+
+        limit = FRESH_SECONDS.get(interval, DEFAULT_FRESH_SECONDS)
+
+        return (now - fetched).total_seconds() < limit
+
+    def plan(self, symbol, period, interval, stored=None, meta=None):
+
+        """
+        Return (mode, tail_start)
+        mode: "fresh" | "tail" | "full"
+        """
+
+        if stored is None:
+            stored, meta = self.read(symbol, interval)
+
+        if stored is None or stored.empty:
+            return "full", None
+
+        # period yang diminta lebih panjang dari yang tersimpan
+        covered = meta.get("covered_from")
+
+        start = period_start(period)
+
+        if covered != "max" and (
+            start is None
+            or covered is None
+            or pd.Timestamp(covered) > start
+        ):
+            return "full", None
+
+        if self._is_fresh(meta, interval):
+            return "fresh", None
+
+        if interval in INTRADAY_INTERVALS:
+
+            last_ts = pd.Timestamp(stored.index[-1])
+
+            if last_ts.tz is None:
+                last_ts = last_ts.tz_localize(TZ)
+
+            if (pd.Timestamp.now(tz=TZ) - last_ts).days >= INTRADAY_MAX_DAYS:
+                return "full", None
+
+        tail_start = stored.index[max(len(stored) - OVERLAP_BARS, 0)]
+
+        return "tail", tail_start
+
+    # ======================================================
+    # MERGE
+    # ======================================================
+
+    def merge(self, symbol, period, interval, mode, fetched, stored=None, meta=None):
+
+        """
+        Simpan hasil download ke store.
+        Return frame lengkap, atau None kalau tail tidak cocok
+        (split / dividen) -> caller harus refresh().
+        """
+
+        if mode == "full":
+
+            start = period_start(period)
+
+            meta = {
+                "covered_from": start.isoformat() if start is not None else "max",
+            }
+
+            df = fetched
+
+        elif mode == "refresh":
+
+            # download ulang seluruh range yang sudah tersimpan
+            meta = {"covered_from": meta.get("covered_from")}
+
+            df = fetched
+
+        else:
+
+            if stored is None:
+                stored, meta = self.read(symbol, interval)
+
+            # bar lama yang ikut ter-download (kecuali bar terakhir)
+            overlap = stored.index[:-1].intersection(fetched.index)
+
+            for col in ["Close", "Adj Close"]:
+
+                if col not in stored.columns or col not in fetched.columns:
+                    continue
+
+                old = stored.loc[overlap, col]
+
+                new = fetched.loc[overlap, col]
+
+                diff = ((new - old).abs() / old.abs().clip(lower=1e-9)).max()
+
+                if diff > ADJ_TOLERANCE:
+                    print(f"[STORE] adjustment berubah {symbol}, full refresh")
+                    return None
+
+            df = pd.concat([
+                stored[stored.index < fetched.index[0]],
+                fetched
+            ])
+
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+
+        if interval in INTRADAY_INTERVALS:
+
+            cutoff = df.index[-1] - pd.Timedelta(days=INTRADAY_MAX_DAYS)
+
+            df = df[df.index >= cutoff]
+
+        meta = {
+            **meta,
+            "last_ts": df.index[-1].isoformat(),
+            "fetched_at": time.time(),
+            "rows": len(df),
+        }
+
+        self._write(symbol, interval, df, meta)
+
+        return df
+
+    # ======================================================
+    # REFRESH (SPLIT / DIVIDEN)
+    # ======================================================
+
+    @staticmethod
+    def _refresh_range(period, meta):
+
+        covered = meta.get("covered_from")
+
+        if covered == "max":
+            return {"period": "max"}
+
+        if covered:
+            return {"start": covered}
+
+        return {"period": period}
+
+    def refresh(self, symbol, period, interval, meta):
+
+        """
+        Harga lama berubah (adjustment) -> download ulang
+        seluruh range yang sudah ter-cover, bukan cuma period ini.
+        """
+
+        fetched = download_bars(
+            symbol,
+            interval,
+            **self._refresh_range(period, meta)
+        )
+
+        if fetched is None:
+            return None
+
+        return self.merge(symbol, period, interval, "refresh", fetched, meta=meta)
+
+    # ======================================================
+    # LOAD (1 SYMBOL)
+    # ======================================================
+
+    def load(self, symbol, period, interval):
+
+        with self._lock(symbol, interval):
+
+            stored, meta = self.read(symbol, interval)
+
+            mode, tail_start = self.plan(symbol, period, interval, stored, meta)
+
+            if mode == "fresh":
+                return _slice(stored, period)
+
+            df = None
+
+            if mode == "tail":
+
+                fetched = download_bars(symbol, interval, start=tail_start)
+
+                if fetched is None:
+
+                    # network gagal -> pakai data lama dulu
+                    return _slice(stored, period)
+
+                df = self.merge(symbol, period, interval, "tail", fetched, stored, meta)
+
+                if df is None:
+                    df = self.refresh(symbol, period, interval, meta)
+
+                if df is None:
+                    return _slice(stored, period)
+
+            if df is None:
+
+                fetched = download_bars(symbol, interval, period=period)
+
+                if fetched is None:
+                    return None
+
+                df = self.merge(symbol, period, interval, "full", fetched)
+
+            return _slice(df, period)
+
+    # ======================================================
+    # LOAD ASYNC (1 SYMBOL)
+    # ======================================================
+
+    def _merge_locked(self, symbol, period, interval, mode, fetched, stored=None, meta=None):
+
+        with self._lock(symbol, interval):
+            return self.merge(symbol, period, interval, mode, fetched, stored, meta)
+
+    async def load_async(self, symbol, period, interval, session):
+
+        """
+        Sama dengan load(), tapi download lewat chart API async.
+        Baca / tulis parquet tetap di thread supaya event loop tidak blocking.
+        """
+
+        stored, meta = await asyncio.to_thread(self.read, symbol, interval)
+
+        mode, tail_start = self.plan(symbol, period, interval, stored, meta)
+
+        if mode == "fresh":
+            return _slice(stored, period)
+
+        if mode == "tail":
+
+            fetched = await download_bars_async(
+                session,
+                symbol,
+                interval,
+                start=tail_start
+            )
+
+            if fetched is None:
+
+                # network gagal -> pakai data lama dulu
+                return _slice(stored, period)
+
+            df = await asyncio.to_thread(
+                self._merge_locked,
+                symbol, period, interval, "tail", fetched, stored, meta
+            )
+
+            if df is None:
+
+                fetched = await download_bars_async(
+                    session,
+                    symbol,
+                    interval,
+                    **self._refresh_range(period, meta)
+                )
+
+                if fetched is not None:
+                    df = await asyncio.to_thread(
+                        self._merge_locked,
+                        symbol, period, interval, "refresh", fetched, None, meta
+                    )
+
+            return _slice(df if df is not None else stored, period)
+
+        fetched = await download_bars_async(
+            session,
+            symbol,
+            interval,
+            period=period
+        )
+
+        if fetched is None:
+            return None
+
+        df = await asyncio.to_thread(
+            self._merge_locked,
+            symbol, period, interval, "full", fetched
+        )
+
+        return _slice(df, period)
+
+    # ======================================================
+    # LOAD MANY (BATCH)
+    # ======================================================
+
+    def load_many(self, symbols, period, interval, chunk_size=None):
+
+        """
+        Versi batch: tail dikelompokkan per tanggal mulai,
+        full di-download sekaligus per chunk.
+        """
+
+        batch_kwargs = {"auto_adjust": False}
+
+        if chunk_size:
+            batch_kwargs["chunk_size"] = chunk_size
+
+        result = {}
+
+        tails = {}
+
+        fulls = []
+
+        state = {}
+
+        for symbol in dict.fromkeys(symbols):
+
+            stored, meta = self.read(symbol, interval)
+
+            mode, tail_start = self.plan(symbol, period, interval, stored, meta)
+
+            state[symbol] = (stored, meta)
+
+            if mode == "fresh":
+                result[symbol] = _slice(stored, period)
+
+            elif mode == "tail":
+                tails.setdefault(tail_start, []).append(symbol)
+
+            else:
+                fulls.append(symbol)
+
+        # ================= TAIL =================
+        for tail_start, group in tails.items():
+
+            fetched = download_batch(
+                group,
+                interval=interval,
+                start=tail_start,
+                **batch_kwargs
+            )
+
+            for symbol in group:
+
+                stored, meta = state[symbol]
+
+                if symbol not in fetched:
+                    result[symbol] = _slice(stored, period)
+                    continue
+
+                with self._lock(symbol, interval):
+
+                    df = self.merge(symbol, period, interval, "tail", fetched[symbol], stored, meta)
+
+                    if df is None:
+                        df = self.refresh(symbol, period, interval, meta)
+
+                result[symbol] = _slice(df if df is not None else stored, period)
+
+        # ================= FULL =================
+        if fulls:
+
+            fetched = download_batch(
+                fulls,
+                period=period,
+                interval=interval,
+                **batch_kwargs
+            )
+
+            for symbol, raw in fetched.items():
+
+                with self._lock(symbol, interval):
+                    df = self.merge(symbol, period, interval, "full", raw)
+
+                result[symbol] = _slice(df, period)
+
+        return result
+
+
+BAR_STORE = BarStore()
@@ -0,0 +1,158 @@
+import asyncio
+
+from app.core.scan_report import count, current_report
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# second pass: saham yang gagal fetch di-queue ulang,
+# jeda sebelum ronde ke-n = RECOVERY_DELAY * 2^n
+RECOVERY_ROUNDS = 2
+
+RECOVERY_DELAY = 2.0
+
+# jumlah kode gagal yang ditulis ke log
+MISSING_SHOWN = 20
+
+
+# ======================================================
+# SCAN COVERAGE
+# ======================================================
+
+class ScanCoverage:
+
+    """
+    Berapa saham universe yang benar-benar ter-fetch dalam 1 scan.
+
+    Screener return None untuk 2 hal berbeda:
+    - data ada, tapi tidak ada sinyal  -> tercakup (bukan gagal)
+    - load gagal (network / data kosong) atau compute error
+      -> gagal, di-queue ulang
+
+    Cuma yang kedua yang dicatat di sini dan dicoba lagi
+    lewat recover() setelah pass utama selesai.
+    """
+
+    def __init__(self, universe):
+
+        self.total = len(universe)
+
+        self.failed = set()
+
+        self.recovered = 0
+
+        self.recovered_codes = set()
+
+    # ======================================================
+    # RECORD
+    # ======================================================
+
+    def fail(self, kode):
+
+        self.failed.add(kode)
+
+    def subset(self, codes):
+
+        """Coverage sebagian universe (1 strategi dari fetch bersama)."""
+
+        part = ScanCoverage(codes)
+
+        part.failed = self.failed & set(codes)
+
+        part.recovered_codes = self.recovered_codes & set(codes)
+
+        part.recovered = len(part.recovered_codes)
+
+        return part
+
+    @property
+    def covered(self):
+        return self.total - len(self.failed)
+
+    @property
+    def missing(self):
+        return sorted(self.failed)
+
+    def __str__(self):
+        return f"{self.covered}/{self.total}"
+
+    # ======================================================
+    # SECOND PASS
+    # ======================================================
+
+    async def recover(self, attempt, rounds=RECOVERY_ROUNDS, delay=RECOVERY_DELAY):
+
+        """
+        Async generator: coba lagi HANYA saham yang gagal fetch.
+
+        attempt(kode) -> (kode, value, ok), ok False = masih gagal.
+        Yield (kode, value) untuk tiap saham yang pulih.
+        """
+
+        for round_no in range(rounds):
+
+            if not self.failed:
+                return
+
+            pending = self.missing
+
+            wait = delay * 2 ** round_no
+
+            print(
+                f"🔁 RECOVERY {round_no + 1}/{rounds}: "
+                f"{len(pending)} saham gagal fetch, "
+                f"coba lagi dalam {wait:.0f}s"
+            )
+
+            count("retries", len(pending))
+
+            # kasih napas ke Yahoo / network sebelum coba lagi
+            await asyncio.sleep(wait)
+
+            for task in asyncio.as_completed([
+                attempt(kode) for kode in pending
+            ]):
+
+                kode, value, ok = await task
+
+                if not ok:
+                    continue
+
+                self.failed.discard(kode)
+
+                self.recovered += 1
+
+                self.recovered_codes.add(kode)
+
+                yield kode, value
+
+    # ======================================================
+    # OUTPUT
+    # ======================================================
+
+    def log(self, label="COVERAGE"):
+
+        line = f"📊 {label}: {self} saham"
+
+        if self.recovered:
+            line += f" | pulih {self.recovered}"
+
+        if self.failed:
+
+            shown = ", ".join(self.missing[:MISSING_SHOWN])
+
+            more = len(self.failed) - MISSING_SHOWN
+
+            line += f" | gagal fetch: {shown}"
+
+            if more > 0:
+                line += f" (+{more})"
+
+        print(line)
+
+        report = current_report()
+
+        if report is not None:
+            report.coverage = self
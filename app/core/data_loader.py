@@ -1,71 +1,171 @@
-import yfinance as yf
-import pandas as pd
+from app.core.bar_store import BAR_STORE
+from app.core.fetcher import BATCH_CHUNK_SIZE
+from app.core.ohlcv import normalize_ohlcv
+from app.core.price_cache import PRICE_CACHE, expires_at
+from app.core.quarantine import QUARANTINE
+from app.core.resample import RESAMPLER
+from app.core.scan_report import stage
 
 
-def load_daily_data(kode: str, period="6mo"):
-    ticker = f"{kode}.JK"
+# ======================================================
+# CLEAN FRAME
+# ======================================================
+
+def _clean_frame(df):
+
+    # 1x normalisasi di sini -> semua screener terima frame
+    # kanonik (OPEN..VOLUME float64, index tz Jakarta) tanpa copy lagi
+    with stage("normalize"):
+        return normalize_ohlcv(df)
 
+
+# ======================================================
+# DAILY
+# ======================================================
+
+def _load_from_store(ticker, period, interval):
+
+    # store dulu, network cuma buat bar yang belum ada
     try:
-        df = yf.download(
-            ticker,
-            period=period,
-            interval="1d",
-            progress=False,
-            auto_adjust=False,
-            threads=False
-        )
+        df = _clean_frame(BAR_STORE.load(ticker, period, interval))
     except Exception:
-        return None
+        df = None
 
-    if df is None or df.empty:
-        return None
+    QUARANTINE.track(ticker, df)
 
-    # === FLATTEN MULTIINDEX (PENTING) ===
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    return df
 
-    # pastikan kolom wajib ada
-    required_cols = {"Open", "High", "Low", "Close", "Volume"}
-    if not required_cols.issubset(df.columns):
-        return None
 
-    # buang baris invalid
-    df = df.dropna(subset=["Open", "High", "Low", "Close", "Volume"])
+def load_daily_data(kode: str, period="6mo"):
+    ticker = f"{kode}.JK"
 
-    if df.empty:
+    # ticker mati / suspend -> skip tanpa request
+    if QUARANTINE.is_blocked(ticker):
         return None
 
-    return df
+    # frame dipakai bersama (cache) -> jangan di-mutate
+    return PRICE_CACHE.get_or_load(
+        (ticker, period, "1d", False),
+        lambda: _load_from_store(ticker, period, "1d"),
+        interval="1d"
+    )
+
+
+async def load_daily_data_async(kode: str, period="6mo", session=None):
+
+    """
+    Versi async dari load_daily_data (fetch stage ScreenerEngine).
+    session: curl_cffi AsyncSession (fetcher.async_session).
+    """
 
-def load_weekly_data(kode: str, period="2y"):
     ticker = f"{kode}.JK"
 
+    if QUARANTINE.is_blocked(ticker):
+        return None
+
+    key = (ticker, period, "1d", False)
+
+    df = PRICE_CACHE.get(key)
+
+    if df is not None:
+        return df
+
     try:
-        df = yf.download(
-            ticker,
-            period=period,
-            interval="1wk",   # 🔥 INI KUNCI UTAMA
-            progress=False,
-            auto_adjust=False,
-            threads=False
+        df = _clean_frame(
+            await BAR_STORE.load_async(ticker, period, "1d", session)
         )
     except Exception:
-        return None
+        df = None
 
-    if df is None or df.empty:
-        return None
+    QUARANTINE.track(ticker, df)
 
-    # === FLATTEN MULTIINDEX ===
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.get_level_values(0)
+    PRICE_CACHE.put(key, df, expires_at("1d"))
 
-    required_cols = {"Open", "High", "Low", "Close", "Volume"}
-    if not required_cols.issubset(df.columns):
-        return None
+    return df
+
+
+def load_daily_data_batch(
+    codes,
+    period="6mo",
+    interval="1d",
+    chunk_size=BATCH_CHUNK_SIZE
+):
 
-    df = df.dropna(subset=["Open", "High", "Low", "Close", "Volume"])
+    """
+    Versi batch dari load_daily_data untuk prefetch 1 universe.
 
-    if df.empty:
+    Return dict {kode: DataFrame}, format OHLCV kanonik
+    sama dengan load_daily_data. Kode yang gagal tidak ada di dict.
+    """
+
+    frames = {}
+
+    symbols = {}
+
+    # ================= CACHE =================
+    for kode in QUARANTINE.filter(codes):
+
+        ticker = f"{kode}.JK"
+
+        df = PRICE_CACHE.get((ticker, period, interval, False))
+
+        if df is not None:
+            frames[kode] = df
+        else:
+            symbols[ticker] = kode
+
+    if not symbols:
+        return frames
+
+    # ================= STORE / NETWORK =================
+    raw_frames = BAR_STORE.load_many(
+        list(symbols),
+        period,
+        interval,
+        chunk_size=chunk_size
+    )
+
+    expiry = expires_at(interval)
+
+    for symbol in symbols:
+
+        df = _clean_frame(raw_frames.get(symbol))
+
+        QUARANTINE.track(symbol, df)
+
+        if df is not None:
+
+            frames[symbols[symbol]] = df
+
+            PRICE_CACHE.put((symbol, period, interval, False), df, expiry)
+
+    return frames
+
+
+# ======================================================
+# WEEKLY / MONTHLY (DARI DAILY)
+# ======================================================
+
+def _load_resampled(kode, period, interval):
+
+    # bar daily dari cache / store, tanpa download 1wk / 1mo terpisah
+    daily = load_daily_data(kode, period=period)
+
+    if daily is None:
         return None
 
-    return df
\ No newline at end of file
+    return RESAMPLER.get(f"{kode}.JK", daily, interval, period)
+
+
+def load_weekly_data(kode: str, period="2y"):
+
+    """Bar weekly (minggu bursa Senin - Jumat) dari bar daily."""
+
+    return _load_resampled(kode, period, "1wk")
+
+
+def load_monthly_data(kode: str, period="5y"):
+
+    """Bar monthly dari bar daily."""
+
+    return _load_resampled(kode, period, "1mo")
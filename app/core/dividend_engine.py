@@ -1,6 +1,8 @@
 import yfinance as yf
 import pandas as pd
 
+from app.core.throttle import THROTTLE
+
 
 class DividendEngine:
 
@@ -8,8 +10,12 @@ class DividendEngine:
     def get_summary(symbol: str):
         ticker = yf.Ticker(symbol)
 
-        info = ticker.info
-        dividends = ticker.dividends
+        # 2 request ke Yahoo -> lewat limiter bersama
+        with THROTTLE.slot():
+            info = ticker.info
+
+        with THROTTLE.slot():
+            dividends = ticker.dividends
 
         # =========================
         # DEFAULT VALUES
@@ -70,7 +76,9 @@ class DividendEngine:
     @staticmethod
     def get_history(symbol: str):
         ticker = yf.Ticker(symbol)
-        return ticker.dividends
+
+        with THROTTLE.slot():
+            return ticker.dividends
 
     @staticmethod
     def scan(symbols):
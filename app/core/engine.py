@@ -1,24 +1,104 @@
-from typing import List
+from typing import Dict, List, Optional
 
+import os
+import time
+import queue
 import asyncio
-
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import contextlib
 
 from app.models.stock_result import StockResult
+from app.models.scan_update import ScanUpdate
 from app.screeners import SCREENER_MAP
+from app.core.fetcher import async_session
+from app.core.price_cache import PRICE_CACHE
+from app.core.quarantine import QUARANTINE
+from app.core.liquidity import LIQUIDITY
+from app.core.panel import UniversePanel
+from app.core.shared_frames import SharedFrames, attach
+from app.core.runtime import get_runtime
+from app.core.coverage import ScanCoverage
+from app.core.result_memo import RESULT_MEMO
+from app.core.features import FEATURE_STORE
+from app.core.scan_report import count, current_report, scan_report, stage
+from app.core.throttle import THROTTLE, MAX_CONCURRENCY
 
 # ======================================================
 # CONFIG
 # ======================================================
 
-MAX_WORKERS = 11
-
-MAX_CONCURRENT_TASKS = 11
+# batas atas task download async; jumlah request yang benar-benar
+# jalan diatur THROTTLE (AIMD + token bucket, dibagi semua fetch path)
+MAX_CONCURRENT_FETCH = MAX_CONCURRENCY
 
 MAX_RETRY = 3
 
 RETRY_DELAY = 0.7
 
+# mode compute per saham:
+# - "thread"  : thread pool (ringan, tapi pandas kena GIL)
+# - "process" : process pool, frame dikirim via shared memory
+EXECUTION_MODE = "thread"
+
+PROCESS_WORKERS = os.cpu_count() or 4
+
+# jumlah chunk per worker (pembagian beban lebih rata)
+PROCESS_CHUNKS_PER_WORKER = 4
+
+# hasil compute di-memo per (screener, kode, bar terakhir, versi)
+# -> re-scan tanpa data baru tidak compute ulang
+USE_RESULT_MEMO = True
+
+
+# ======================================================
+# PROCESS WORKER
+# ======================================================
+
+def _compute(screener, kode, df):
+
+    with stage("compute", kode):
+        return screener.compute(kode, df)
+
+
+def _analyze(screener, kode):
+
+    # screener load sendiri (blocking) -> fetch + compute
+    with stage("fetch", kode):
+        df = screener.load(kode)
+
+    return _compute(screener, kode, df)
+
+
+def _load(screener, kode):
+
+    with stage("fetch", kode):
+        return screener.load(kode)
+
+
+def _compute_chunk(spec, screener_cls, codes):
+
+    """
+    Jalan di worker process: frame dari shared memory ->
+    [(kode, result, ok)], ok False = compute error (bukan tidak ada sinyal).
+    """
+
+    screener = screener_cls()
+
+    results = []
+
+    for kode, df in attach(spec, codes):
+
+        try:
+            results.append((kode, screener.compute(kode, df), True))
+        except Exception as e:
+            print(f"[FAILED] {kode}: {e}")
+            results.append((kode, None, False))
+
+        del df
+
+    return results
+
+
 # ======================================================
 # ENGINE
 # ======================================================
@@ -29,50 +109,76 @@ class ScreenerEngine:
     Stable Async Screener Engine
 
     Features:
-    - parallel scanning
+    - fetch stage async (curl_cffi, tanpa thread)
+    - compute stage di thread pool / process pool (mode="process")
+    - loop + pool dari EngineRuntime (dibagi, tidak dibuat per scan)
     - retry otomatis
     - semaphore limiter
-    - anti random skip
+    - anti random skip (gagal fetch di-queue ulang + coverage)
     - stable untuk yfinance/API
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        mode: str = EXECUTION_MODE,
+        workers: Optional[int] = None,
+        runtime=None
+    ):
+
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Mode engine '{mode}' tidak dikenal")
 
-        # thread pool
-        self.executor = ThreadPoolExecutor(
-            max_workers=MAX_WORKERS
-        )
+        self.mode = mode
+
+        self.workers = workers or PROCESS_WORKERS
 
-        # limiter async
+        # event loop + pool jangka panjang (singleton per proses)
+        self.runtime = runtime or get_runtime()
+
+        # limiter download async
         self.semaphore = asyncio.Semaphore(
-            MAX_CONCURRENT_TASKS
+            MAX_CONCURRENT_FETCH
         )
 
+    @property
+    def executor(self):
+        return self.runtime.executor
+
     # ======================================================
-    # ASYNC ANALYZE
+    # FETCH STAGE (ASYNC I/O)
     # ======================================================
 
-    async def analyze_async(
+    async def fetch_async(
         self,
         screener,
-        kode: str
+        kode: str,
+        session
     ):
 
+        queued = time.perf_counter()
+
         async with self.semaphore:
 
-            loop = asyncio.get_running_loop()
+            report = current_report()
+
+            if report is not None:
+                report.add("queue", time.perf_counter() - queued, kode)
 
             for attempt in range(MAX_RETRY):
 
                 try:
 
-                    result = await loop.run_in_executor(
-                        self.executor,
-                        screener.analyze,
-                        kode
-                    )
+                    with stage("fetch", kode):
+
+                        df = await screener.load_async(
+                            kode,
+                            session
+                        )
+
+                    if df is None:
+                        count("failures")
 
-                    return result
+                    return df
 
                 except Exception as e:
 
@@ -81,26 +187,160 @@ class ScreenerEngine:
                         f"{kode}: {e}"
                     )
 
+                    count("retries")
+
                     # kasih napas sedikit
                     await asyncio.sleep(RETRY_DELAY)
 
             print(f"[FAILED] {kode}")
 
+            count("failures")
+
             return None
 
     # ======================================================
-    # ASYNC RUNNER
+    # ASYNC ANALYZE (FETCH -> COMPUTE)
     # ======================================================
 
-    async def run_async(
+    async def analyze_async(
         self,
-        saham_list: List[str],
-        screener_type: str
-    ) -> List[StockResult]:
+        screener,
+        kode: str,
+        df=None,
+        session=None
+    ):
 
-        # ======================================================
-        # VALIDATION
-        # ======================================================
+        if df is None and session is not None:
+
+            df = await self.fetch_async(
+                screener,
+                kode,
+                session
+            )
+
+            if df is None:
+                return None
+
+        result, _ = await self._compute_one(screener, kode, df)
+
+        return result
+
+    async def _compute_one(self, screener, kode, df=None):
+
+        """(result, ok), ok False = compute error (bukan tidak ada sinyal)."""
+
+        try:
+
+            # tanpa fetch stage -> screener load sendiri (blocking)
+            if df is None:
+
+                result = await self.runtime.call(
+                    _analyze,
+                    screener,
+                    kode,
+                    kode=kode
+                )
+
+            else:
+
+                result = await self.runtime.call(
+                    _compute,
+                    screener,
+                    kode,
+                    df,
+                    kode=kode
+                )
+
+        except Exception as e:
+
+            print(f"[FAILED] {kode}: {e}")
+
+            count("failures")
+
+            return None, False
+
+        return result, True
+
+    # ======================================================
+    # 1 SAHAM: GAGAL FETCH != TIDAK ADA SINYAL
+    # ======================================================
+
+    @staticmethod
+    async def _session(stack, prefetch):
+
+        # prefetch -> download async (curl_cffi), selain itu load blocking
+        if not prefetch:
+            return None
+
+        return await stack.enter_async_context(
+            async_session(MAX_CONCURRENT_FETCH)
+        )
+
+    async def _fetch_one(self, screener, kode, session):
+
+        """(kode, df, ok), ok False = fetch gagal (di-queue ulang)."""
+
+        if session is not None:
+
+            df = await self.fetch_async(screener, kode, session)
+
+            return kode, df, df is not None
+
+        try:
+
+            df = await self.runtime.call(
+                _load,
+                screener,
+                kode,
+                kode=kode
+            )
+
+        except Exception as e:
+
+            print(f"[FAILED] {kode}: {e}")
+
+            df = None
+
+        if df is None:
+            count("failures")
+
+        return kode, df, df is not None
+
+    async def _analyze_one(self, screener, kode, session):
+
+        """
+        (kode, result, ok), result None + ok True = tidak ada sinyal.
+        ok False = fetch / compute gagal -> di-queue ulang, tidak di-memo.
+        """
+
+        kode, df, ok = await self._fetch_one(screener, kode, session)
+
+        if not ok:
+            return kode, None, False
+
+        hit, result = False, None
+
+        if USE_RESULT_MEMO:
+            hit, result = RESULT_MEMO.lookup(screener, kode, df)
+
+        if not hit:
+
+            result, ok = await self._compute_one(screener, kode, df)
+
+            if not ok:
+                return kode, None, False
+
+            if USE_RESULT_MEMO:
+                RESULT_MEMO.store(screener, kode, df, result)
+
+        return kode, result, True
+
+    # ======================================================
+    # UNIVERSE (KARANTINA + LIKUIDITAS)
+    # ======================================================
+
+    @staticmethod
+    def _screener(screener_type):
 
         if screener_type not in SCREENER_MAP:
 
@@ -109,86 +349,1040 @@ class ScreenerEngine:
                 f"tidak ditemukan"
             )
 
-        # ======================================================
-        # INIT SCREENER
-        # ======================================================
-
-        screener_cls = SCREENER_MAP[
-            screener_type
-        ]
+        return SCREENER_MAP[screener_type]()
 
-        screener = screener_cls()
+    @staticmethod
+    def _quarantine(saham_list):
 
-        # ======================================================
-        # CREATE TASKS
-        # ======================================================
+        # ticker mati / suspend -> skip tanpa request
+        universe = QUARANTINE.filter(saham_list)
 
-        tasks = [
+        if len(universe) < len(saham_list):
 
-            self.analyze_async(
-                screener,
-                kode
+            print(
+                f"🚫 QUARANTINE: skip "
+                f"{len(saham_list) - len(universe)} saham"
             )
 
-            for kode in saham_list
+        return universe
 
-        ]
+    async def _prune(self, screener, universe):
 
-        # ======================================================
-        # RUN PARALLEL
-        # ======================================================
+        # index likuiditas daily, 1x build per hari
+        if not (screener.min_daily_volume or screener.min_daily_value):
+            return universe
 
-        results = await asyncio.gather(
-            *tasks,
-            return_exceptions=False
+        liquid = await self.runtime.call(
+            lambda: LIQUIDITY.prune(
+                universe,
+                min_daily_volume=screener.min_daily_volume,
+                min_daily_value=screener.min_daily_value
+            )
         )
 
-        # ======================================================
-        # CLEAN RESULTS
-        # ======================================================
+        if len(liquid) < len(universe):
 
-        results = [
+            print(
+                f"💧 ILLIQUID ({screener.screener_type}): skip "
+                f"{len(universe) - len(liquid)} saham"
+            )
 
-            r for r in results
-            if r is not None
+        return liquid
 
-        ]
+    @staticmethod
+    def _report_tickers(n):
 
-        # ======================================================
-        # SORT
-        # ======================================================
+        report = current_report()
 
-        results.sort(
-            key=lambda x: x.score,
-            reverse=True
-        )
+        if report is not None:
+            report.tickers = n
 
-        # ======================================================
-        # DEBUG
-        # ======================================================
+    # ======================================================
+    # FETCH SEMUA (UNTUK PANEL / MULTI SCREENER)
+    # ======================================================
 
-        print(
-            f"\n✅ SUCCESS SCAN: "
-            f"{len(results)} saham"
-        )
+    async def fetch_frames(
+        self,
+        screener,
+        universe: List[str],
+        prefetch: bool = True,
+        coverage=None
+    ) -> Dict[str, object]:
+
+        """
+        {kode: frame} urut universe. Saham yang gagal fetch
+        di-queue ulang (backoff), sisanya tidak ada di dict.
+
+        coverage opsional: ScanCoverage milik caller (caller yang log,
+        setelah compute error ikut dicatat).
+        """
+
+        owned = coverage is None
+
+        if owned:
+            coverage = ScanCoverage(universe)
+
+        frames = {}
+
+        async with contextlib.AsyncExitStack() as stack:
+
+            session = await self._session(stack, prefetch)
+
+            def attempt(kode):
+                return self._fetch_one(screener, kode, session)
+
+            outputs = await asyncio.gather(*[
+                attempt(kode) for kode in universe
+            ])
+
+            for kode, df, ok in outputs:
+
+                if ok:
+                    frames[kode] = df
+                else:
+                    coverage.fail(kode)
+
+            # ================= SECOND PASS =================
+            async for kode, df in coverage.recover(attempt):
+                frames[kode] = df
+
+        if owned:
+            coverage.log()
+
+        return {
+
+            kode: frames[kode]
+            for kode in universe
+            if kode in frames
+
+        }
+
+    # ======================================================
+    # COMPUTE DARI FRAME YANG SUDAH ADA
+    # ======================================================
+
+    @staticmethod
+    def _panel_table(screener, frames, panel=None):
+
+        with stage("compute"):
+            return ScreenerEngine._panel_scores(screener, frames, panel)
+
+    @staticmethod
+    def _panel_scores(screener, frames, panel):
+
+        if panel is None:
+            panel = UniversePanel.from_frames(frames)
+        else:
+            panel = panel.select(list(frames))
+
+        return screener.analyze_panel(panel)
+
+    async def compute_frames(
+        self,
+        screener,
+        frames: Dict[str, object],
+        panel=None,
+        shared=None,
+        failed=None
+    ) -> List[StockResult]:
+
+        """
+        Panel (vektor) kalau screener mendukung, selain itu
+        compute per saham di thread pool / process pool.
+        panel / shared opsional: UniversePanel / SharedFrames yang
+        sudah dibangun (dipakai bersama beberapa screener).
+
+        Saham yang bar terakhirnya sama dengan scan sebelumnya
+        diambil dari RESULT_MEMO, cuma sisanya yang di-compute.
+
+        failed (set, opsional) diisi kode yang compute-nya error
+        (lihat _recover_compute).
+        """
+
+        if failed is None:
+            failed = set()
+
+        if not USE_RESULT_MEMO:
+            return await self._compute_fresh(screener, frames, panel, shared, failed)
+
+        hits, misses = RESULT_MEMO.split(screener, frames)
+
+        results = list(hits.values())
+
+        if misses:
+
+            computed = await self._compute_fresh(
+                screener,
+                misses,
+                panel,
+                shared,
+                failed
+            )
+
+            # compute error tidak di-memo (dicoba lagi scan berikutnya)
+            RESULT_MEMO.store_many(screener, misses, computed, skip=failed)
+
+            results += computed
 
         return results
 
+    async def _compute_fresh(self, screener, frames, panel, shared, failed=None):
+
+        """failed (set, opsional) diisi kode yang compute-nya error."""
+
+        if screener.supports_panel:
+
+            try:
+
+                table = await self.runtime.call(
+                    self._panel_table,
+                    screener,
+                    frames,
+                    panel
+                )
+
+                return list(table["result"].dropna())
+
+            except Exception as e:
+
+                # panel gagal -> fallback compute per saham
+                print(f"[PANEL FAILED] {screener.screener_type}: {e}")
+
+        if self.mode == "process":
+
+            return await self.compute_process(
+                screener,
+                frames,
+                shared,
+                failed
+            )
+
+        outputs = await asyncio.gather(*[
+
+            self._compute_one(
+                screener,
+                kode,
+                df
+            )
+
+            for kode, df in frames.items()
+
+        ])
+
+        if failed is not None:
+
+            failed.update(
+                kode
+                for kode, (_, ok) in zip(frames, outputs)
+                if not ok
+            )
+
+        return [result for result, _ in outputs]
+
     # ======================================================
-    # PUBLIC RUN
+    # PROCESS POOL (FRAME VIA SHARED MEMORY)
     # ======================================================
 
-    def run(
+    async def compute_process(
         self,
-        saham_list: List[str],
-        screener_type: str
+        screener,
+        frames: Dict[str, object],
+        shared=None,
+        failed=None
     ) -> List[StockResult]:
 
-        return asyncio.run(
+        """failed (set, opsional) diisi kode yang compute-nya error."""
 
-            self.run_async(
-                saham_list,
-                screener_type
+        if not frames:
+            return []
+
+        loop = asyncio.get_running_loop()
+
+        # shared milik caller tidak memuat semua kode -> pack sendiri
+        owned = shared is None or any(
+            kode not in shared.spec["offsets"] for kode in frames
+        )
+
+        if owned:
+
+            shared = await self.runtime.call(
+                SharedFrames.pack,
+                frames
             )
 
-        )
\ No newline at end of file
+        try:
+
+            codes = [
+                kode for kode in frames
+                if kode in shared.spec["offsets"]
+            ]
+
+            n_chunks = self.workers * PROCESS_CHUNKS_PER_WORKER
+
+            size = max(1, -(-len(codes) // n_chunks))
+
+            pool = self.runtime.process_pool(self.workers)
+
+            with stage("compute"):
+
+                outputs = await asyncio.gather(*[
+
+                    loop.run_in_executor(
+                        pool,
+                        _compute_chunk,
+                        shared.spec,
+                        type(screener),
+                        codes[i:i + size]
+                    )
+
+                    for i in range(0, len(codes), size)
+
+                ])
+
+        finally:
+
+            if owned:
+                shared.close()
+
+        rows = [row for chunk in outputs for row in chunk]
+
+        if failed is not None:
+            failed.update(kode for kode, _, ok in rows if not ok)
+
+        count("failures", sum(1 for _, _, ok in rows if not ok))
+
+        return [result for _, result, _ in rows]
+
+    async def _recover_compute(self, screener, failed, coverage):
+
+        """
+        Async generator: saham yang compute-nya error di-queue ulang
+        per saham (load + compute, tanpa panel / process pool).
+        Yield (kode, result) yang pulih, sisanya dicatat gagal di coverage.
+        """
+
+        if not failed:
+            return
+
+        retry = ScanCoverage(failed)
+
+        for kode in failed:
+            retry.fail(kode)
+
+        def attempt(kode):
+            return self._analyze_one(screener, kode, None)
+
+        async for kode, result in retry.recover(attempt):
+            yield kode, result
+
+        for kode in retry.failed:
+            coverage.fail(kode)
+
+        coverage.recovered += retry.recovered
+
+        coverage.recovered_codes |= retry.recovered_codes
+
+    async def run_staged_async(
+        self,
+        screener,
+        universe: List[str],
+        prefetch: bool = True
+    ) -> List[StockResult]:
+
+        coverage = ScanCoverage(universe)
+
+        frames = await self.fetch_frames(
+            screener,
+            universe,
+            prefetch,
+            coverage
+        )
+
+        failed = set()
+
+        results = await self.compute_frames(
+            screener,
+            frames,
+            failed=failed
+        )
+
+        # ================= SECOND PASS (COMPUTE ERROR) =================
+        async for kode, result in self._recover_compute(screener, failed, coverage):
+            results.append(result)
+
+        coverage.log()
+
+        return results
+
+    # ======================================================
+    # RESULT + DEBUG
+    # ======================================================
+
+    @staticmethod
+    def _finish(results) -> List[StockResult]:
+
+        results = [
+
+            r for r in results
+            if r is not None
+
+        ]
+
+        results.sort(
+            key=lambda x: x.score,
+            reverse=True
+        )
+
+        return results
+
+    async def _flush_memo(self):
+
+        if USE_RESULT_MEMO:
+            await self.runtime.call(RESULT_MEMO.flush)
+
+    @staticmethod
+    def _print_stats():
+
+        cache = PRICE_CACHE.stats()
+
+        print(
+            f"🗄️ CACHE: hit {cache['hits']} | "
+            f"miss {cache['misses']} | "
+            f"entries {cache['entries']}"
+        )
+
+        limiter = THROTTLE.stats()
+
+        print(
+            f"🚦 THROTTLE: limit {limiter['limit']} | "
+            f"{limiter['throughput']} req/s | "
+            f"ok {limiter['ok']} | "
+            f"err {limiter['errors']} | "
+            f"429 {limiter['throttled']}"
+        )
+
+        if USE_RESULT_MEMO:
+
+            memo = RESULT_MEMO.stats()
+
+            print(
+                f"🧠 MEMO: hit {memo['hits']} | "
+                f"miss {memo['misses']} | "
+                f"entries {memo['entries']}"
+            )
+
+        FEATURE_STORE.log()
+
+    # ======================================================
+    # ASYNC RUNNER
+    # ======================================================
+
+    async def run_async(
+        self,
+        saham_list: List[str],
+        screener_type: str,
+        prefetch: bool = True
+    ) -> List[StockResult]:
+
+        with scan_report(screener_type):
+
+            return await self._run_async(
+                saham_list,
+                screener_type,
+                prefetch
+            )
+
+    async def _run_async(
+        self,
+        saham_list,
+        screener_type,
+        prefetch
+    ):
+
+        # ======================================================
+        # INIT SCREENER
+        # ======================================================
+
+        screener = self._screener(screener_type)
+
+        # ======================================================
+        # UNIVERSE (KARANTINA + LIKUIDITAS)
+        # ======================================================
+
+        universe = self._quarantine(saham_list)
+
+        universe = await self._prune(screener, universe)
+
+        self._report_tickers(len(universe))
+
+        # ======================================================
+        # RUN PARALLEL (FETCH ASYNC -> COMPUTE POOL)
+        # ======================================================
+
+        if screener.supports_panel or self.mode == "process":
+
+            results = await self.run_staged_async(
+                screener,
+                universe,
+                prefetch
+            )
+
+        else:
+
+            coverage = ScanCoverage(universe)
+
+            async with contextlib.AsyncExitStack() as stack:
+
+                session = await self._session(stack, prefetch)
+
+                def attempt(kode):
+                    return self._analyze_one(screener, kode, session)
+
+                results = []
+
+                for kode, result, ok in await asyncio.gather(*[
+                    attempt(kode) for kode in universe
+                ]):
+
+                    results.append(result)
+
+                    if not ok:
+                        coverage.fail(kode)
+
+                # ================= SECOND PASS =================
+                async for kode, result in coverage.recover(attempt):
+                    results.append(result)
+
+            coverage.log()
+
+        # ======================================================
+        # CLEAN + SORT
+        # ======================================================
+
+        results = self._finish(results)
+
+        # ======================================================
+        # DEBUG
+        # ======================================================
+
+        print(
+            f"\n✅ SUCCESS SCAN: "
+            f"{len(results)} saham"
+        )
+
+        await self._flush_memo()
+
+        self._print_stats()
+
+        return results
+
+    # ======================================================
+    # STREAMING (HASIL PER SAHAM BEGITU SELESAI)
+    # ======================================================
+
+    async def run_iter_async(
+        self,
+        saham_list: List[str],
+        screener_type: str,
+        prefetch: bool = True
+    ):
+
+        """
+        Async generator ScanUpdate, 1 per saham begitu selesai
+        (urutan selesai, bukan urutan skor).
+
+        Screener panel / mode process: progress dikirim per saham
+        saat fetch, hasil dikirim sekaligus setelah compute vektor.
+        """
+
+        with scan_report(screener_type):
+
+            async for update in self._iter_async(
+                saham_list,
+                screener_type,
+                prefetch
+            ):
+                yield update
+
+    async def _iter_async(
+        self,
+        saham_list,
+        screener_type,
+        prefetch
+    ):
+
+        screener = self._screener(screener_type)
+
+        universe = self._quarantine(saham_list)
+
+        universe = await self._prune(screener, universe)
+
+        self._report_tickers(len(universe))
+
+        total = len(universe)
+
+        done = 0
+
+        coverage = ScanCoverage(universe)
+
+        async with contextlib.AsyncExitStack() as stack:
+
+            session = await self._session(stack, prefetch)
+
+            # ==================================================
+            # PANEL / PROCESS: FETCH STREAM -> COMPUTE 1X
+            # ==================================================
+
+            if screener.supports_panel or self.mode == "process":
+
+                frames = {}
+
+                def attempt(kode):
+                    return self._fetch_one(screener, kode, session)
+
+                for task in asyncio.as_completed([
+                    attempt(kode) for kode in universe
+                ]):
+
+                    kode, df, ok = await task
+
+                    done += 1
+
+                    if ok:
+                        frames[kode] = df
+                    else:
+                        coverage.fail(kode)
+
+                    yield ScanUpdate(kode, None, done, total, len(coverage.failed))
+
+                # ================= SECOND PASS =================
+                async for kode, df in coverage.recover(attempt):
+
+                    frames[kode] = df
+
+                    yield ScanUpdate(kode, None, done, total, len(coverage.failed))
+
+                failed = set()
+
+                results = self._finish(await self.compute_frames(
+                    screener,
+                    {kode: frames[kode] for kode in universe if kode in frames},
+                    failed=failed
+                ))
+
+                for r in results:
+                    yield ScanUpdate(r.kode, r, done, total, len(coverage.failed))
+
+                # ============ SECOND PASS (COMPUTE ERROR) ============
+                async for kode, result in self._recover_compute(screener, failed, coverage):
+                    yield ScanUpdate(kode, result, done, total, len(coverage.failed))
+
+            # ==================================================
+            # PER SAHAM: FETCH -> COMPUTE -> YIELD
+            # ==================================================
+
+            else:
+
+                def attempt(kode):
+                    return self._analyze_one(screener, kode, session)
+
+                for task in asyncio.as_completed([
+                    attempt(kode) for kode in universe
+                ]):
+
+                    kode, result, ok = await task
+
+                    done += 1
+
+                    if not ok:
+                        coverage.fail(kode)
+
+                    yield ScanUpdate(kode, result, done, total, len(coverage.failed))
+
+                # ================= SECOND PASS =================
+                async for kode, result in coverage.recover(attempt):
+                    yield ScanUpdate(kode, result, done, total, len(coverage.failed))
+
+        print(
+            f"\n✅ SCAN SELESAI: {done}/{total} saham | "
+            f"gagal {len(coverage.failed)}"
+        )
+
+        coverage.log()
+
+        await self._flush_memo()
+
+        self._print_stats()
+
+    def run_iter(
+        self,
+        saham_list: List[str],
+        screener_type: str,
+        prefetch: bool = True
+    ):
+
+        """
+        Versi sync dari run_iter_async (untuk Streamlit):
+        scan jalan di loop runtime, caller menerima
+        ScanUpdate lewat queue tanpa menunggu scan selesai.
+        """
+
+        updates = queue.Queue()
+
+        stop = threading.Event()
+
+        finished = object()
+
+        async def pump():
+
+            try:
+
+                async for update in self.run_iter_async(
+                    saham_list,
+                    screener_type,
+                    prefetch
+                ):
+
+                    # caller berhenti iterasi -> scan dihentikan
+                    if stop.is_set():
+                        break
+
+                    updates.put(update)
+
+            except Exception as e:
+                updates.put(e)
+
+            finally:
+                updates.put(finished)
+
+        self.runtime.submit(pump())
+
+        try:
+
+            while True:
+
+                item = updates.get()
+
+                if item is finished:
+                    return
+
+                if isinstance(item, Exception):
+                    raise item
+
+                yield item
+
+        finally:
+            stop.set()
+
+    # ======================================================
+    # MULTI SCREENER (1X FETCH, SEMUA SCREENER)
+    # ======================================================
+
+    async def run_many_async(
+        self,
+        saham_list: List[str],
+        screener_types: Optional[List[str]] = None,
+        prefetch: bool = True
+    ) -> Dict[str, List[StockResult]]:
+
+        """
+        Jalankan beberapa screener daily dalam 1 pass:
+        - tiap saham di-fetch 1x per loader (frame dibagi screener
+          dengan loader_key sama, lihat BaseScreener.loader_key)
+        - panel dibangun 1x untuk screener yang mendukung
+        - gate likuiditas tetap per screener
+
+        screener_types None = semua screener di SCREENER_MAP.
+        Return {screener_type: [StockResult]}.
+        """
+
+        with scan_report("+".join(screener_types or SCREENER_MAP)):
+
+            return await self._run_many_async(
+                saham_list,
+                screener_types,
+                prefetch
+            )
+
+    async def _run_many_async(
+        self,
+        saham_list,
+        screener_types,
+        prefetch
+    ):
+
+        screener_types = list(screener_types or SCREENER_MAP)
+
+        screeners = {
+
+            screener_type: self._screener(screener_type)
+            for screener_type in screener_types
+
+        }
+
+        # ======================================================
+        # UNIVERSE PER SCREENER
+        # ======================================================
+
+        universe = self._quarantine(saham_list)
+
+        universes = {}
+
+        for screener_type, screener in screeners.items():
+
+            universes[screener_type] = await self._prune(
+                screener,
+                universe
+            )
+
+        wanted = set().union(*universes.values())
+
+        fetch_list = [kode for kode in universe if kode in wanted]
+
+        self._report_tickers(len(fetch_list))
+
+        # ======================================================
+        # GROUP PER LOADER (FRAME CUMA DIBAGI KALAU LOAD SAMA)
+        # ======================================================
+
+        groups = {}
+
+        for screener_type, screener in screeners.items():
+            groups.setdefault(screener.loader_key, {})[screener_type] = screener
+
+        grouped = {}
+
+        fetched = 0
+
+        coverages = []
+
+        for group in groups.values():
+
+            results, n_frames, coverage = await self._run_group(
+                group,
+                universes,
+                universe,
+                prefetch,
+                label="COVERAGE" if len(groups) == 1 else f"COVERAGE {'+'.join(group)}"
+            )
+
+            grouped.update(results)
+
+            fetched += n_frames
+
+            coverages.append(coverage)
+
+        # loader > 1 -> coverage gabungan untuk report
+        if len(coverages) > 1:
+
+            coverage = ScanCoverage(fetch_list)
+
+            for part in coverages:
+
+                coverage.failed |= part.failed
+
+                coverage.recovered_codes |= part.recovered_codes
+
+            coverage.recovered = len(coverage.recovered_codes)
+
+            coverage.log()
+
+        grouped = {screener_type: grouped[screener_type] for screener_type in screeners}
+
+        # ======================================================
+        # DEBUG
+        # ======================================================
+
+        print(
+            f"\n✅ SUCCESS SCAN: {fetched} saham di-fetch | "
+            + " | ".join(
+                f"{screener_type} {len(results)}"
+                for screener_type, results in grouped.items()
+            )
+        )
+
+        await self._flush_memo()
+
+        self._print_stats()
+
+        return grouped
+
+    async def _run_group(self, screeners, universes, universe, prefetch, label):
+
+        """
+        1 grup screener dengan loader yang sama: fetch 1x, panel /
+        shared memory 1x, compute semua screener grup.
+        Return ({screener_type: [StockResult]}, jumlah frame, ScanCoverage).
+        """
+
+        wanted = set().union(*[universes[screener_type] for screener_type in screeners])
+
+        fetch_list = [kode for kode in universe if kode in wanted]
+
+        # ======================================================
+        # FETCH 1X (SEMUA SCREENER GRUP PAKAI LOAD YANG SAMA)
+        # ======================================================
+
+        loader = next(iter(screeners.values()))
+
+        coverage = ScanCoverage(fetch_list)
+
+        frames = await self.fetch_frames(
+            loader,
+            fetch_list,
+            prefetch,
+            coverage
+        )
+
+        # ======================================================
+        # MEMO (CUMA SAHAM DENGAN BAR BARU YANG DI-COMPUTE)
+        # ======================================================
+
+        inputs = {
+
+            screener_type: {
+                kode: frames[kode]
+                for kode in universes[screener_type]
+                if kode in frames
+            }
+            for screener_type in screeners
+
+        }
+
+        # saham yang bar terakhirnya belum berubah diambil dari memo
+        # -> panel / shared memory cukup untuk sisanya
+        stale = {
+
+            screener_type: (
+                RESULT_MEMO.changed(screener, inputs[screener_type])
+                if USE_RESULT_MEMO else list(inputs[screener_type])
+            )
+            for screener_type, screener in screeners.items()
+
+        }
+
+        def stale_frames(panel_screeners):
+
+            codes = set().union(*[
+                stale[screener_type]
+                for screener_type, screener in screeners.items()
+                if screener.supports_panel == panel_screeners
+            ])
+
+            return {kode: df for kode, df in frames.items() if kode in codes}
+
+        # ======================================================
+        # PANEL 1X (KALAU ADA SCREENER YANG MENDUKUNG)
+        # ======================================================
+
+        panel = None
+
+        panel_frames = stale_frames(True)
+
+        if panel_frames:
+
+            panel = await self.runtime.call(
+                UniversePanel.from_frames,
+                panel_frames
+            )
+
+        # ======================================================
+        # SHARED MEMORY 1X (MODE PROCESS)
+        # ======================================================
+
+        shared = None
+
+        process_frames = stale_frames(False)
+
+        if self.mode == "process" and process_frames:
+
+            shared = await self.runtime.call(
+                SharedFrames.pack,
+                process_frames
+            )
+
+        # ======================================================
+        # COMPUTE SEMUA SCREENER (PARALEL)
+        # ======================================================
+
+        failed = {screener_type: set() for screener_type in screeners}
+
+        try:
+
+            outputs = await asyncio.gather(*[
+
+                self.compute_frames(
+                    screener,
+                    inputs[screener_type],
+                    panel,
+                    shared,
+                    failed[screener_type]
+                )
+
+                for screener_type, screener in screeners.items()
+
+            ])
+
+        finally:
+
+            if shared is not None:
+                shared.close()
+
+        # ================= SECOND PASS (COMPUTE ERROR) =================
+        for (screener_type, screener), results in zip(screeners.items(), outputs):
+
+            async for kode, result in self._recover_compute(
+                screener,
+                failed[screener_type],
+                coverage
+            ):
+                results.append(result)
+
+        coverage.log(label)
+
+        grouped = {
+
+            screener_type: self._finish(results)
+            for screener_type, results in zip(screeners, outputs)
+
+        }
+
+        return grouped, len(frames), coverage
+
+    # ======================================================
+    # PUBLIC RUN
+    # ======================================================
+
+    def run(
+        self,
+        saham_list: List[str],
+        screener_type: str,
+        prefetch: bool = True
+    ) -> List[StockResult]:
+
+        return self.runtime.run(
+
+            self.run_async(
+                saham_list,
+                screener_type,
+                prefetch
+            )
+
+        )
+
+    def run_many(
+        self,
+        saham_list: List[str],
+        screener_types: Optional[List[str]] = None,
+        prefetch: bool = True
+    ) -> Dict[str, List[StockResult]]:
+
+        return self.runtime.run(
+
+            self.run_many_async(
+                saham_list,
+                screener_types,
+                prefetch
+            )
+
+        )
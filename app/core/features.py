@@ -0,0 +1,387 @@
+import re
+import threading
+
+from collections import OrderedDict, defaultdict
+
+from app.core.indicators import STREAM_INDICATORS, STREAMS, ema, macd, rsi
+from app.core.levels import LEVEL_WINDOWS, level_at, rolling_extrema
+from app.core.result_memo import frame_signature
+from app.core.scan_report import count
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+MAX_ENTRIES = 2048
+
+# interval bot (bar baru tiap cycle): nilai terakhir lewat stream
+# incremental per ticker (app.core.indicators.STREAMS)
+STREAMING_INTERVALS = ("15m",)
+
+
+# ======================================================
+# FEATURE DEFINITIONS
+# ======================================================
+#
+# Nama fitur = jenis + period, contoh:
+#   ma5, ma20, ma50, ema20, rsi14, vol_ma20, std200, macd
+#
+# Nilai = Series seindex frame (macd -> (line, signal, histogram)),
+# dipakai bersama -> JANGAN di-mutate.
+
+def _ma(df, period):
+    return df["CLOSE"].rolling(period).mean()
+
+
+def _ema(df, period):
+    return ema(df["CLOSE"], period)
+
+
+def _rsi(df, period):
+    return rsi(df["CLOSE"], period)
+
+
+def _vol_ma(df, period):
+    return df["VOLUME"].rolling(period).mean()
+
+
+def _std(df, period):
+    return df["CLOSE"].rolling(period).std()
+
+
+def _macd(df, period=None):
+    return macd(df["CLOSE"])
+
+
+FEATURES = {
+    "ma": _ma,
+    "ema": _ema,
+    "rsi": _rsi,
+    "vol_ma": _vol_ma,
+    "std": _std,
+    "macd": _macd,
+}
+
+_NAME = re.compile(r"^(vol_ma|ma|ema|rsi|std|macd)(\d*)$")
+
+
+def parse_feature(name):
+
+    """'vol_ma20' -> (fungsi, 20), 'macd' -> (fungsi, None)."""
+
+    match = _NAME.match(name)
+
+    if match is None:
+        raise KeyError(f"Fitur '{name}' tidak dikenal")
+
+    kind, period = match.groups()
+
+    if kind != "macd" and not period:
+        raise KeyError(f"Fitur '{name}' butuh period (contoh {kind}20)")
+
+    return FEATURES[kind], int(period) if period else None
+
+
+# ======================================================
+# FEATURE FRAME (VIEW 1 FRAME)
+# ======================================================
+
+class FeatureFrame:
+
+    """
+    Akses fitur 1 frame, signature frame cuma dihitung sekali:
+
+        f = FEATURE_STORE.frame(df, kode, "1d")
+        ma20, vol_ma20 = f["ma20"], f["vol_ma20"]
+        ma20_last = f.last("ma20")
+        resistance = f.high(10, shift=1)    # high.iloc[-11:-1].max()
+    """
+
+    def __init__(self, store, df, entry, symbol=None, interval="1d"):
+
+        self._store = store
+
+        self._df = df
+
+        self._entry = entry
+
+        self._symbol = symbol
+
+        self._interval = interval
+
+        self._stream = None
+
+    def __getitem__(self, name):
+
+        return self._store._feature(self._entry, self._df, name)
+
+    def get(self, *names):
+
+        return tuple(self[name] for name in names)
+
+    def _streaming(self, name):
+
+        if (
+            self._symbol is None
+            or self._interval not in STREAMING_INTERVALS
+            or name not in STREAM_INDICATORS
+        ):
+            return None
+
+        if self._stream is None:
+            self._stream = STREAMS.sync(self._symbol, self._df, self._interval)
+
+        count("features_streamed")
+
+        return self._stream
+
+    def last(self, name):
+
+        """
+        Nilai bar terakhir saja (macd -> tuple).
+
+        Intraday + ticker diketahui -> dari stream incremental:
+        cuma bar baru / bar berjalan yang dihitung, bukan seluruh Series.
+        """
+
+        stream = self._streaming(name)
+
+        if stream is not None:
+            return stream.value(name)
+
+        value = self[name]
+
+        if isinstance(value, tuple):
+            return tuple(v.iloc[-1] for v in value)
+
+        return value.iloc[-1]
+
+    # ======================================================
+    # LEVEL (SUPPORT / RESISTANCE)
+    # ======================================================
+
+    def level(self, column, mode, window, shift=0):
+
+        """
+        Ekstrem `window` bar terakhir kolom (mode "max" / "min"),
+        setara df[column].tail(window).max(); shift=1 -> tanpa bar
+        terakhir (df[column].iloc[-window - 1:-1].max()).
+        """
+
+        name = f"{column.lower()}_{mode}"
+
+        if not shift and window in LEVEL_WINDOWS:
+
+            stream = self._streaming(name)
+
+            if stream is not None:
+                return stream.level(name, window)
+
+        return level_at(
+            self._store._levels(self._entry, self._df, column, mode, window),
+            shift
+        )
+
+    def high(self, window, shift=0):
+
+        return self.level("HIGH", "max", window, shift)
+
+    def low(self, window, shift=0):
+
+        return self.level("LOW", "min", window, shift)
+
+
+# ======================================================
+# FEATURE STORE
+# ======================================================
+
+class FeatureStore:
+
+    """
+    Memo indikator per (ticker, interval, bar terakhir).
+
+    - entry per (ticker, interval), isi {nama fitur: Series}
+    - signature frame berubah (bar baru / bar berjalan bergerak /
+      adjustment) -> semua fitur ticker itu dihitung ulang
+    - ticker tidak diketahui (None) -> signature frame jadi key
+
+    Screener, scanner intraday dan stock analysis baca dari sini,
+    jadi MA20 saham yang sama cukup dihitung 1x per bar walau
+    dipakai beberapa fungsi.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+
+        self.max_entries = max_entries
+
+        self._data = OrderedDict()
+
+        self._lock = threading.Lock()
+
+        self._computed = defaultdict(int)
+
+        self._reused = defaultdict(int)
+
+    # ======================================================
+    # ENTRY
+    # ======================================================
+
+    def _entry(self, df, symbol, interval):
+
+        signature = frame_signature(df)
+
+        key = (symbol, interval) if symbol is not None else (None, interval, signature)
+
+        with self._lock:
+
+            entry = self._data.get(key)
+
+            if entry is None or entry["signature"] != signature:
+
+                entry = {"signature": signature, "features": {}}
+
+                self._data[key] = entry
+
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+        return entry
+
+    def _feature(self, entry, df, name):
+
+        features = entry["features"]
+
+        value = features.get(name)
+
+        if value is not None:
+
+            with self._lock:
+                self._reused[name] += 1
+
+            count("features_reused")
+
+            return value
+
+        fn, period = parse_feature(name)
+
+        # dihitung di luar lock; 2 thread bersamaan paling buruk hitung 2x
+        value = fn(df, period)
+
+        features[name] = value
+
+        with self._lock:
+            self._computed[name] += 1
+
+        count("features_computed")
+
+        return value
+
+    def _levels(self, entry, df, column, mode, window):
+
+        """
+        Rolling ekstrem 1 kolom: semua LEVEL_WINDOWS dihitung sekali
+        (app.core.levels.rolling_extrema), dipakai semua modul.
+        """
+
+        name = f"{column.lower()}_{mode}"
+
+        levels = entry["features"].get(name)
+
+        if levels is not None and window in levels:
+
+            with self._lock:
+                self._reused[name] += 1
+
+            count("features_reused")
+
+            return levels[window]
+
+        windows = set(LEVEL_WINDOWS) | set(levels or ()) | {window}
+
+        levels = rolling_extrema(df[column].to_numpy(), windows, mode)
+
+        entry["features"][name] = levels
+
+        with self._lock:
+            self._computed[name] += 1
+
+        count("features_computed")
+
+        return levels[window]
+
+    # ======================================================
+    # PUBLIC
+    # ======================================================
+
+    def frame(self, df, symbol=None, interval="1d"):
+
+        return FeatureFrame(self, df, self._entry(df, symbol, interval), symbol, interval)
+
+    def get(self, df, name, symbol=None, interval="1d"):
+
+        return self.frame(df, symbol, interval)[name]
+
+    # ======================================================
+    # MAINTENANCE
+    # ======================================================
+
+    def invalidate(self, symbol=None):
+
+        with self._lock:
+
+            if symbol is None:
+                self._data.clear()
+                return
+
+            for key in [k for k in self._data if k[0] == symbol]:
+                del self._data[key]
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "entries": len(self._data),
+                "computed": sum(self._computed.values()),
+                "reused": sum(self._reused.values()),
+                "by_feature": {
+                    name: (self._computed[name], self._reused[name])
+                    for name in sorted(set(self._computed) | set(self._reused))
+                },
+            }
+
+    def log(self):
+
+        stats = self.stats()
+
+        detail = " ".join(
+            f"{name} {computed}/{reused}"
+            for name, (computed, reused) in stats["by_feature"].items()
+        )
+
+        print(
+            f"🧮 FEATURES: hitung {stats['computed']} | "
+            f"reuse {stats['reused']} | "
+            f"entries {stats['entries']}"
+            + (f" | {detail}" if detail else "")
+        )
+
+        streams = STREAMS.stats()
+
+        if streams["entries"]:
+
+            print(
+                f"🧮 STREAM: bar update {streams['updates']} | "
+                f"replay {streams['replays']} | "
+                f"ticker {streams['entries']}"
+            )
+
+
+# ======================================================
+# SINGLETON
+# ======================================================
+
+FEATURE_STORE = FeatureStore()
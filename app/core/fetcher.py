@@ -0,0 +1,364 @@
+import yfinance as yf
+import numpy as np
+import pandas as pd
+
+from curl_cffi.requests import AsyncSession
+
+from app.core.quarantine import QUARANTINE
+from app.core.scan_report import add_bytes
+from app.core.throttle import THROTTLE, is_rate_limited
+from app.utils.market_hours import TZ
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# jumlah ticker per 1x panggilan yf.download
+BATCH_CHUNK_SIZE = 100
+
+# chart API yang sama dengan yang dipakai yfinance
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+ASYNC_TIMEOUT = 20
+
+INTRADAY_SUFFIX = ("m", "h")
+
+
+# ======================================================
+# FLATTEN COLUMN
+# ======================================================
+
+def _flatten(df):
+
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = df.columns.get_level_values(0)
+
+    return df
+
+
+# ======================================================
+# RATE LIMIT CHECK
+# ======================================================
+
+def _rate_limited(symbols):
+
+    """Error per ticker dari yf.download terakhir menandakan kena limit?"""
+
+    errors = getattr(yf.shared, "_ERRORS", None) or {}
+
+    return any(
+        is_rate_limited(errors.get(s.upper(), ""))
+        for s in symbols
+    )
+
+
+# ======================================================
+# AUTO ADJUST
+# ======================================================
+
+def adjust_prices(df):
+
+    """
+    Sama dengan auto_adjust=True di yfinance:
+    OHLC dikali rasio Adj Close / Close.
+    """
+
+    if df is None or df.empty or "Adj Close" not in df.columns:
+        return df
+
+    df = df.copy()
+
+    ratio = df["Adj Close"] / df["Close"]
+
+    for col in ["Open", "High", "Low"]:
+        df[col] = df[col] * ratio
+
+    df["Close"] = df["Adj Close"]
+
+    return df.drop(columns=["Adj Close"])
+
+
+# ======================================================
+# SINGLE DOWNLOAD (RAW)
+# ======================================================
+
+def download_bars(
+    symbol,
+    interval="1d",
+    period=None,
+    start=None
+):
+
+    """
+    1 symbol, kolom flat, harga belum di-adjust (ada Adj Close).
+    Pakai period ATAU start (start = ambil tail saja).
+    """
+
+    with THROTTLE.slot() as slot:
+
+        try:
+            df = yf.download(
+                symbol,
+                period=None if start is not None else period,
+                start=start,
+                interval=interval,
+                progress=False,
+                auto_adjust=False,
+                threads=False
+            )
+        except Exception as e:
+            print("YF ERROR:", symbol, e)
+            slot.failed(throttled=is_rate_limited(repr(e)))
+            return None
+
+        if df is None or df.empty:
+            slot.failed(throttled=_rate_limited([symbol]))
+            return None
+
+    return _flatten(df)
+
+
+# ======================================================
+# SPLIT MULTI TICKER FRAME
+# ======================================================
+
+def _split_ticker(raw, symbol):
+
+    """
+    Ambil frame 1 ticker dari hasil yf.download multi ticker.
+
+    group_by="ticker" -> kolom (Ticker, Price)
+    default           -> kolom (Price, Ticker)
+    """
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        return raw.copy()
+
+    if symbol in raw.columns.get_level_values(0):
+        df = raw[symbol]
+
+    elif symbol in raw.columns.get_level_values(1):
+        df = raw.xs(symbol, axis=1, level=1)
+
+    else:
+        return None
+
+    # baris kosong = tanggal milik ticker lain
+    return df.dropna(how="all").copy()
+
+
+# ======================================================
+# BATCH DOWNLOAD (RAW)
+# ======================================================
+
+def download_batch(
+    symbols,
+    period="6mo",
+    interval="1d",
+    chunk_size=BATCH_CHUNK_SIZE,
+    start=None,
+    **kwargs
+):
+
+    """
+    Download banyak symbol per chunk (1x yf.download per chunk)
+    lalu pecah MultiIndex jadi frame per symbol.
+
+    Return:
+    - dict {symbol: DataFrame} (kolom belum dibersihkan)
+    - symbol yang gagal / kosong tidak ada di dict
+    """
+
+    frames = {}
+
+    symbols = list(dict.fromkeys(symbols))
+
+    for i in range(0, len(symbols), chunk_size):
+
+        chunk = symbols[i:i + chunk_size]
+
+        # 1 yf.download multi ticker = 1 request per ticker
+        with THROTTLE.slot(cost=len(chunk)) as slot:
+
+            try:
+                raw = yf.download(
+                    chunk,
+                    period=None if start is not None else period,
+                    start=start,
+                    interval=interval,
+                    group_by="ticker",
+                    progress=False,
+                    threads=True,
+                    **kwargs
+                )
+            except Exception as e:
+                print(f"[BATCH ERROR] {len(chunk)} ticker: {e}")
+                slot.failed(throttled=is_rate_limited(repr(e)))
+                continue
+
+            # 1 chunk kosong semua = hampir pasti diblok
+            if raw is None or raw.empty:
+                slot.failed(throttled=True)
+                continue
+
+            if _rate_limited(chunk):
+                slot.failed(throttled=True)
+
+        for symbol in chunk:
+
+            df = _split_ticker(raw, symbol)
+
+            if df is not None and not df.empty:
+                frames[symbol] = df
+
+    return frames
+
+
+# ======================================================
+# ASYNC DOWNLOAD (CHART API)
+# ======================================================
+
+def async_session(max_clients):
+
+    """
+    1 session curl_cffi untuk 1 scan.
+    max_clients = jumlah request yang boleh jalan bersamaan.
+    """
+
+    return AsyncSession(
+        impersonate="chrome",
+        max_clients=max_clients,
+        timeout=ASYNC_TIMEOUT
+    )
+
+
+def _parse_chart(payload, interval):
+
+    """
+    JSON chart API -> frame dengan format sama seperti download_bars
+    (kolom flat, harga belum di-adjust, ada Adj Close).
+
+    - daily / weekly -> index tanggal naive (seperti yf.download)
+    - intraday       -> index tz-aware waktu exchange
+    """
+
+    result = (payload.get("chart") or {}).get("result") or []
+
+    if not result:
+        return None
+
+    result = result[0]
+
+    timestamps = result.get("timestamp")
+
+    quote = (result.get("indicators", {}).get("quote") or [{}])[0]
+
+    if not timestamps or not quote:
+        return None
+
+    tz = result.get("meta", {}).get("exchangeTimezoneName") or TZ.key
+
+    index = pd.to_datetime(timestamps, unit="s", utc=True).tz_convert(tz)
+
+    intraday = interval.endswith(INTRADAY_SUFFIX)
+
+    if intraday:
+        index.name = "Datetime"
+    else:
+        index = index.normalize().tz_localize(None)
+        index.name = "Date"
+
+    def column(values):
+        return np.array(
+            [np.nan if v is None else v for v in values],
+            dtype="float64"
+        )
+
+    close = column(quote.get("close", []))
+
+    adj = (result["indicators"].get("adjclose") or [{}])[0].get("adjclose")
+
+    df = pd.DataFrame(
+        {
+            "Open": column(quote.get("open", [])),
+            "High": column(quote.get("high", [])),
+            "Low": column(quote.get("low", [])),
+            "Close": close,
+            "Adj Close": column(adj) if adj else close,
+            "Volume": column(quote.get("volume", [])),
+        },
+        index=index
+    )
+
+    # bar live kadang dikirim 2x -> ambil yang terakhir
+    df = df[~df.index.duplicated(keep="last")]
+
+    df = df.dropna(how="all")
+
+    return df if not df.empty else None
+
+
+async def download_bars_async(
+    session,
+    symbol,
+    interval="1d",
+    period=None,
+    start=None
+):
+
+    """
+    Versi async dari download_bars (tanpa thread):
+    banyak request bisa jalan bersamaan di 1 event loop.
+    """
+
+    params = {
+        "interval": interval,
+        "includePrePost": "false",
+        "events": "div,splits",
+    }
+
+    if start is not None:
+
+        start = pd.Timestamp(start)
+
+        if start.tz is None:
+            start = start.tz_localize(TZ)
+
+        params["period1"] = int(start.timestamp())
+        params["period2"] = int(pd.Timestamp.now(tz=TZ).timestamp())
+
+    else:
+        params["range"] = period or "1mo"
+
+    async with THROTTLE.slot_async(symbol=symbol) as slot:
+
+        try:
+            resp = await session.get(
+                CHART_URL.format(symbol=symbol),
+                params=params
+            )
+        except Exception as e:
+            print("YF ERROR:", symbol, e)
+            slot.failed(throttled=is_rate_limited(repr(e)))
+            return None
+
+        if resp.status_code != 200:
+            print(f"YF ERROR: {symbol} HTTP {resp.status_code}")
+            slot.failed(throttled=resp.status_code == 429)
+            return None
+
+        add_bytes(len(resp.content))
+
+        try:
+            df = _parse_chart(resp.json(), interval)
+        except Exception as e:
+            print("YF PARSE ERROR:", symbol, e)
+            df = None
+
+        # 200 tapi kosong = bisa soft block Yahoo (back-off kalau menyebar);
+        # symbol yang sudah dicatat karantina cukup dianggap gagal
+        if df is None or df.empty:
+            slot.failed(empty=not QUARANTINE.is_suspect(symbol))
+
+    return df
@@ -1,5 +1,14 @@
+import re
+import math
+import threading
+
+from collections import OrderedDict, deque
+
+import numpy as np
 import pandas as pd
 
+from app.core.levels import LEVEL_WINDOWS, MonotonicExtrema
+
 
 # ======================================================
 # EMA
@@ -81,4 +90,470 @@ def macd(
 
     histogram = macd_line - signal_line
 
-    return macd_line, signal_line, histogram
\ No newline at end of file
+    return macd_line, signal_line, histogram
+
+
+# ======================================================
+# STREAMING (INCREMENTAL O(1) PER BAR)
+# ======================================================
+#
+# Versi stateful dari fungsi di atas untuk loop bot 15m:
+#
+#   - update(x) : bar baru ditambahkan
+#   - revise(x) : bar terakhir (masih berjalan) berubah
+#
+# Rumus rekursif sama dengan pandas (ewm adjust=False,
+# rolling min_periods=window, termasuk bar NaN), jadi hasil
+# sama dengan versi batch sampai toleransi floating point.
+
+def _nan():
+    return float("nan")
+
+
+class StreamingEMA:
+
+    """Setara ema() / Series.ewm(alpha=..., adjust=False).mean()."""
+
+    def __init__(self, period=None, alpha=None):
+
+        self.alpha = alpha if alpha is not None else 2 / (period + 1)
+
+        self._state = (_nan(), 1.0)
+
+        self._before_last = None
+
+    @property
+    def value(self):
+        return self._state[0]
+
+    def _step(self, state, x):
+
+        weighted, old_wt = state
+
+        # recurrence pandas ewm (adjust=False, ignore_na=False)
+        if weighted == weighted:
+
+            old_wt *= 1 - self.alpha
+
+            if x == x:
+
+                if weighted != x:
+                    weighted = (old_wt * weighted + self.alpha * x) / (old_wt + self.alpha)
+
+                old_wt = 1.0
+
+        elif x == x:
+            weighted = x
+
+        return weighted, old_wt
+
+    def update(self, x):
+
+        self._before_last = self._state
+
+        self._state = self._step(self._state, float(x))
+
+        return self.value
+
+    def revise(self, x):
+
+        if self._before_last is None:
+            return self.update(x)
+
+        self._state = self._step(self._before_last, float(x))
+
+        return self.value
+
+
+class StreamingSMA:
+
+    """Setara Series.rolling(window).mean() (NaN di jendela -> NaN)."""
+
+    def __init__(self, window):
+
+        self.window = window
+
+        self._values = deque()
+
+        self._sum = 0.0
+
+        self._nans = 0
+
+        self._since_resum = 0
+
+    @property
+    def value(self):
+
+        if len(self._values) < self.window or self._nans:
+            return _nan()
+
+        return self._sum / self.window
+
+    def _add(self, x):
+
+        self._values.append(x)
+
+        if x == x:
+            self._sum += x
+        else:
+            self._nans += 1
+
+    def _resum(self):
+
+        self._sum = math.fsum(x for x in self._values if x == x)
+
+        self._since_resum = 0
+
+    def _drop(self, x):
+
+        if x == x:
+            self._sum -= x
+        else:
+            self._nans -= 1
+
+    def update(self, x):
+
+        self._add(float(x))
+
+        if len(self._values) > self.window:
+            self._drop(self._values.popleft())
+
+        # jumlah berjalan dihitung ulang tiap `window` bar (amortized O(1))
+        # supaya error pembulatan tidak menumpuk
+        self._since_resum += 1
+
+        if self._since_resum >= self.window:
+            self._resum()
+
+        return self.value
+
+    def revise(self, x):
+
+        if not self._values:
+            return self.update(x)
+
+        self._drop(self._values.pop())
+
+        self._add(float(x))
+
+        return self.value
+
+
+class StreamingRSI:
+
+    """Setara rsi() (Wilder smoothing, alpha = 1 / period)."""
+
+    def __init__(self, period=14):
+
+        self._gain = StreamingEMA(alpha=1 / period)
+
+        self._loss = StreamingEMA(alpha=1 / period)
+
+        self._prev = _nan()
+
+        self._before_last = None
+
+    @property
+    def value(self):
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(self._gain.value) / np.float64(self._loss.value)
+
+        return float(100 - (100 / (1 + rs)))
+
+    def _step(self, x, revise):
+
+        delta = x - self._prev
+
+        # delta NaN -> gain / loss NaN (sama dengan clip di pandas)
+        gain = max(delta, 0.0) if delta == delta else _nan()
+
+        loss = max(-delta, 0.0) if delta == delta else _nan()
+
+        if revise:
+            self._gain.revise(gain)
+            self._loss.revise(loss)
+        else:
+            self._gain.update(gain)
+            self._loss.update(loss)
+
+        return self.value
+
+    def update(self, x):
+
+        x = float(x)
+
+        self._before_last = self._prev
+
+        value = self._step(x, revise=False)
+
+        self._prev = x
+
+        return value
+
+    def revise(self, x):
+
+        if self._before_last is None:
+            return self.update(x)
+
+        x = float(x)
+
+        self._prev = self._before_last
+
+        value = self._step(x, revise=True)
+
+        self._prev = x
+
+        return value
+
+
+class StreamingMACD:
+
+    """Setara macd(): value = (macd_line, signal_line, histogram)."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+
+        self._fast = StreamingEMA(fast)
+
+        self._slow = StreamingEMA(slow)
+
+        self._signal = StreamingEMA(signal)
+
+    @property
+    def value(self):
+
+        line = self._fast.value - self._slow.value
+
+        signal = self._signal.value
+
+        return line, signal, line - signal
+
+    def update(self, x):
+
+        line = self._fast.update(x) - self._slow.update(x)
+
+        self._signal.update(line)
+
+        return self.value
+
+    def revise(self, x):
+
+        line = self._fast.revise(x) - self._slow.revise(x)
+
+        self._signal.revise(line)
+
+        return self.value
+
+
+# ======================================================
+# STREAM PER TICKER
+# ======================================================
+
+# nama indikator (sama dengan FeatureStore) -> (kolom input, factory)
+_STREAMING = {
+    "ma": ("CLOSE", StreamingSMA),
+    "vol_ma": ("VOLUME", StreamingSMA),
+    "ema": ("CLOSE", StreamingEMA),
+    "rsi": ("CLOSE", StreamingRSI),
+    "macd": ("CLOSE", lambda period: StreamingMACD()),
+    # support / resistance: semua LEVEL_WINDOWS dalam 1 indikator
+    "high_max": ("HIGH", lambda period: MonotonicExtrema(LEVEL_WINDOWS, "max")),
+    "low_min": ("LOW", lambda period: MonotonicExtrema(LEVEL_WINDOWS, "min")),
+}
+
+_STREAM_NAME = re.compile(r"^(vol_ma|ma|ema|rsi|macd|high_max|low_min)(\d*)$")
+
+_NO_PERIOD = ("macd", "high_max", "low_min")
+
+STREAM_INDICATORS = (
+    "ma5", "ma20", "ma50", "vol_ma20", "ema20", "rsi14", "macd",
+    "high_max", "low_min",
+)
+
+
+def streaming_indicator(name):
+
+    """'ma20' -> (kolom input, StreamingSMA(20))."""
+
+    match = _STREAM_NAME.match(name)
+
+    if match is None or (match.group(1) not in _NO_PERIOD and not match.group(2)):
+        raise KeyError(f"Indikator streaming '{name}' tidak dikenal")
+
+    kind, period = match.groups()
+
+    column, factory = _STREAMING[kind]
+
+    return column, factory(int(period) if period else None)
+
+
+class TickerStream:
+
+    """
+    State indikator streaming 1 (ticker, interval).
+
+    sync(df) tiap cycle:
+    - bar baru di ekor frame      -> update() per bar baru
+    - bar terakhir lama berubah   -> revise() (bar masih berjalan)
+    - awal frame bergeser / history beda
+                                  -> replay penuh (jarang, mis. 1x sehari
+                                     saat jendela 10d geser)
+    """
+
+    def __init__(self, names=STREAM_INDICATORS):
+
+        self.names = tuple(names)
+
+        # 1 ticker disinkron 1 thread sekaligus
+        self._lock = threading.Lock()
+
+        self._reset()
+
+    def _reset(self):
+
+        self._indicators = {name: streaming_indicator(name) for name in self.names}
+
+        self.first_ts = None
+
+        self.last_ts = None
+
+        self.rows = 0
+
+    def _feed(self, rows, revise=False):
+
+        for row in rows:
+
+            for column, indicator in self._indicators.values():
+
+                x = row[column]
+
+                if revise:
+                    indicator.revise(x)
+                else:
+                    indicator.update(x)
+
+    def sync(self, df):
+
+        """Samakan state dengan frame; return (bar update, replay?)."""
+
+        index = df.index.asi8
+
+        n = len(index)
+
+        replay = not (
+            self.rows
+            and n >= self.rows
+            and index[0] == self.first_ts
+            and index[self.rows - 1] == self.last_ts
+        )
+
+        if replay:
+            self._reset()
+
+        columns = {column for column, _ in self._indicators.values()}
+
+        values = {column: df[column].to_numpy() for column in columns}
+
+        def rows(start, stop):
+            return ({c: v[i] for c, v in values.items()} for i in range(start, stop))
+
+        start = self.rows
+
+        # bar terakhir lama bisa masih berjalan saat sync sebelumnya
+        if start:
+            self._feed(rows(start - 1, start), revise=True)
+
+        self._feed(rows(start, n))
+
+        self.first_ts = index[0] if n else None
+
+        self.last_ts = index[-1] if n else None
+
+        self.rows = n
+
+        return n - start, replay
+
+    def value(self, name):
+
+        return self._indicators[name][1].value
+
+    def level(self, name, window):
+
+        """high_max / low_min untuk 1 window (setara tail(window).max / min)."""
+
+        return self._indicators[name][1].get(window)
+
+    def values(self):
+
+        return {name: self.value(name) for name in self.names}
+
+
+class IndicatorStreams:
+
+    """Registry TickerStream per (ticker, interval), dipakai ulang antar cycle bot."""
+
+    def __init__(self, names=STREAM_INDICATORS, max_entries=2048):
+
+        self.names = tuple(names)
+
+        self.max_entries = max_entries
+
+        self._data = OrderedDict()
+
+        self._lock = threading.Lock()
+
+        self.updates = 0
+
+        self.replays = 0
+
+    def sync(self, symbol, df, interval="15m"):
+
+        key = (symbol, interval)
+
+        with self._lock:
+
+            stream = self._data.get(key)
+
+            if stream is None:
+                stream = self._data[key] = TickerStream(self.names)
+
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+        with stream._lock:
+            updated, replay = stream.sync(df)
+
+        with self._lock:
+
+            if replay:
+                self.replays += 1
+            else:
+                self.updates += updated
+
+        return stream
+
+    def invalidate(self, symbol=None):
+
+        with self._lock:
+
+            if symbol is None:
+                self._data.clear()
+                return
+
+            for key in [k for k in self._data if k[0] == symbol]:
+                del self._data[key]
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "entries": len(self._data),
+                "updates": self.updates,
+                "replays": self.replays,
+            }
+
+
+STREAMS = IndicatorStreams()
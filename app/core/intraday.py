@@ -0,0 +1,466 @@
+import time
+import asyncio
+import logging
+import importlib
+
+from collections import defaultdict
+
+import pandas as pd
+
+from app.core.liquidity import LIQUIDITY, intraday_volume
+from app.core.quarantine import QUARANTINE
+from app.core.runtime import get_runtime
+from app.core.coverage import ScanCoverage
+from app.core.features import FEATURE_STORE
+from app.core.scan_report import count, current_report, scan_report, stage, stage_timer
+from app.services.data import get_price_data, get_price_data_batch
+
+# ======================================================
+# HOT LIST PRIORITY
+# ======================================================
+
+try:
+
+    from app.config.hot_saham_list import HOT_SAHAM_LIST as SAHAM_LIST
+
+    print("🔥 USING HOT_SAHAM_LIST")
+
+except:
+
+    from app.config.saham_list import SAHAM_LIST
+
+    print("📦 USING FULL SAHAM_LIST")
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# jumlah baris tabel hasil scan
+TOP_RESULTS = 15
+
+# retry fetch 15m per ticker (kalau tidak ada dari prefetch)
+MAX_RETRY = 2
+
+RETRY_DELAY = 0.7
+
+# nama strategi -> modul yang mendaftarkannya (import saat dipakai)
+STRATEGY_MODULES = {
+    "day": "app.core.scanner",
+    "bsjp": "app.core.scanner_bsjp",
+}
+
+# ======================================================
+# RANK TABLE
+# ======================================================
+
+def rank_table(rows, top=TOP_RESULTS):
+
+    """
+    Baris hasil (list dict / DataFrame) -> tabel top N urut Score,
+    index mulai 1. Dipakai juga untuk gabung hasil shard.
+    """
+
+    df = pd.DataFrame(rows)
+
+    if not df.empty:
+
+        df = df.sort_values(
+            by=["Score"],
+            ascending=False
+        ).reset_index(drop=True)
+
+        df.index = df.index + 1
+
+        df = df.head(top)
+
+    return df
+
+# ======================================================
+# FETCH SINGLE TICKER
+# ======================================================
+
+def fetch_frame(ticker):
+
+    """Frame 15m 1 ticker dengan retry. None kalau tetap gagal."""
+
+    for attempt in range(MAX_RETRY):
+
+        try:
+
+            df = get_price_data(ticker)
+
+            if df is not None and not df.empty:
+                return df
+
+        except Exception as e:
+
+            logging.warning(
+
+                f"[RETRY {attempt+1}/{MAX_RETRY}] "
+                f"{ticker}: {e}"
+
+            )
+
+            count("retries")
+
+        time.sleep(RETRY_DELAY)
+
+    return None
+
+# ======================================================
+# STRATEGY
+# ======================================================
+
+class IntradayStrategy:
+
+    """
+    1 jenis scan intraday di atas frame 15m bersama.
+
+    Subclass isi:
+    - name           : key hasil & state ("day", "bsjp")
+    - label          : judul log scan
+    - min_avg_volume : gate likuiditas per bar 15m (prune sebelum fetch)
+    - totals         : counter tambahan per ticker yang dijumlah (log)
+    - process()      : 1 ticker -> {"results": [...], "alerts": [...], ...}
+
+    Frame & FeatureFrame dipakai bersama strategi lain -> JANGAN di-mutate.
+    """
+
+    name = None
+
+    label = None
+
+    min_avg_volume = 0
+
+    totals = ()
+
+    def new_state(self):
+
+        return {"alerted": {}}
+
+    def process(self, ticker, df, state):
+
+        raise NotImplementedError
+
+    def table(self, results):
+
+        return rank_table(results)
+
+    def log(self, summary):
+
+        print(f"\n{self.label}: {summary['scanned']}")
+
+        summary["coverage"].log()
+
+        print(f"QUARANTINE: {summary['skipped']}")
+
+        print(f"ILLIQUID: {summary['illiquid']}")
+
+        for name in self.totals:
+            print(f"{name.upper()}: {summary[name]}")
+
+        print(f"RESULT: {summary['results']}")
+
+        print(f"ALERT: {summary['alerts']}\n")
+
+
+STRATEGIES = {}
+
+
+def register_strategy(strategy):
+
+    STRATEGIES[strategy.name] = strategy
+
+    return strategy
+
+
+def resolve_strategy(strategy):
+
+    """Nama ("day") atau instance -> IntradayStrategy."""
+
+    if isinstance(strategy, IntradayStrategy):
+        return strategy
+
+    if strategy not in STRATEGIES and strategy in STRATEGY_MODULES:
+        importlib.import_module(STRATEGY_MODULES[strategy])
+
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Strategi intraday '{strategy}' tidak dikenal")
+
+    return STRATEGIES[strategy]
+
+# ======================================================
+# PIPELINE
+# ======================================================
+
+class IntradayPipeline:
+
+    """
+    1 cycle scan intraday untuk beberapa strategi sekaligus:
+
+    quarantine -> prune (gate tiap strategi) -> fetch gabungan 1x
+    -> semua strategi jalan di frame yang sama (1 runtime.call / ticker)
+    -> second pass hanya untuk yang gagal fetch.
+
+    Frame 15m tidak disimpan di pipeline: scan strategi lain sesudahnya
+    (mis. scan_bsjp setelah scan_day) dapat frame yang sama dari
+    PRICE_CACHE selama TTL 15m-nya (60 detik), sesudah itu fetch baru.
+    """
+
+    # ======================================================
+    # PER TICKER (THREAD POOL)
+    # ======================================================
+
+    def _process_ticker(self, ticker, df, strategies, plans, states):
+
+        if df is None or df.empty:
+
+            lap = stage_timer(ticker)
+
+            df = fetch_frame(ticker)
+
+            lap("fetch")
+
+            # bukan "tidak ada sinyal" -> di-queue ulang (second pass)
+            if df is None:
+
+                count("failures")
+
+                return None
+
+        return {
+
+            strategy.name: strategy.process(ticker, df, states[strategy.name])
+
+            for strategy in strategies
+            if ticker in plans[strategy.name]
+
+        }
+
+    # ======================================================
+    # RUN
+    # ======================================================
+
+    async def run_async(self, strategies, states=None, prefetch=True, universe=None):
+
+        """
+        strategies: nama / instance IntradayStrategy.
+        states    : {nama: state}, None -> new_state() strategi.
+
+        Return {nama: (df, alerts, state)}.
+        """
+
+        strategies = [resolve_strategy(s) for s in strategies]
+
+        # timing per stage -> bot.log (lihat app.core.scan_report)
+        name = "scan_" + "_".join(s.name for s in strategies)
+
+        with scan_report(name):
+
+            return await self._run(strategies, states, prefetch, universe)
+
+    async def _run(self, strategies, states, prefetch, universe):
+
+        runtime = get_runtime()
+
+        states = dict(states or {})
+
+        for strategy in strategies:
+
+            if states.get(strategy.name) is None:
+                states[strategy.name] = strategy.new_state()
+
+        # universe None = SAHAM_LIST penuh (shard worker kirim sebagian)
+        saham_list = SAHAM_LIST if universe is None else universe
+
+        # ticker mati / suspend (karantina) tidak di-scan sama sekali
+        universe = QUARANTINE.filter(saham_list)
+
+        skipped = len(saham_list) - len(universe)
+
+        # ticker yang jelas tidak likuid (tabel likuiditas daily)
+        # dibuang sebelum fetch intraday, gate per strategi
+        plans = {}
+
+        with stage("prune"):
+
+            for strategy in strategies:
+
+                liquid = await runtime.call(
+
+                    lambda gate=strategy.min_avg_volume: LIQUIDITY.prune(
+                        universe,
+                        min_daily_volume=intraday_volume(gate)
+                    )
+
+                )
+
+                plans[strategy.name] = set(liquid)
+
+        # fetch = gabungan universe semua strategi (urutan SAHAM_LIST)
+        tickers = [
+
+            ticker
+            for ticker in universe
+            if any(ticker in plan for plan in plans.values())
+
+        ]
+
+        report = current_report()
+
+        if report is not None:
+            report.tickers = len(tickers)
+
+        # ======================================================
+        # PREFETCH (BATCH DOWNLOAD, FRAME MASIH SEGAR DARI PRICE_CACHE)
+        # ======================================================
+
+        frames = {}
+
+        if prefetch and tickers:
+
+            with stage("fetch"):
+
+                frames = await runtime.call(
+
+                    get_price_data_batch,
+
+                    tickers
+
+                )
+
+        # ======================================================
+        # TASKS
+        # ======================================================
+
+        # antre thread pool dicatat sebagai stage "queue";
+        # ticker yang gagal prefetch -> fetch sendiri (retry)
+        async def run_ticker(ticker, df=None):
+
+            return await runtime.call(
+
+                self._process_ticker,
+
+                ticker,
+
+                df,
+
+                strategies,
+
+                plans,
+
+                states,
+
+                kode=ticker
+
+            )
+
+        outputs = await asyncio.gather(*[
+
+            run_ticker(ticker, frames.get(ticker))
+
+            for ticker in tickers
+
+        ])
+
+        # ======================================================
+        # SECOND PASS (HANYA YANG GAGAL FETCH)
+        # ======================================================
+
+        coverage = ScanCoverage(tickers)
+
+        for ticker, out in zip(tickers, outputs):
+
+            if out is None:
+                coverage.fail(ticker)
+
+        async def attempt(ticker):
+
+            out = await run_ticker(ticker)
+
+            return ticker, out, out is not None
+
+        async for ticker, out in coverage.recover(attempt):
+            outputs.append(out)
+
+        # ======================================================
+        # MERGE RESULTS PER STRATEGI
+        # ======================================================
+
+        scans = {}
+
+        for strategy in strategies:
+
+            plan = plans[strategy.name]
+
+            results = []
+
+            alerts = []
+
+            totals = defaultdict(int)
+
+            for out in outputs:
+
+                part = (out or {}).get(strategy.name)
+
+                if not part:
+                    continue
+
+                results.extend(part.get("results", []))
+
+                alerts.extend(part.get("alerts", []))
+
+                for key in strategy.totals:
+                    totals[key] += part.get(key, 0)
+
+            with stage("render"):
+
+                df = strategy.table(results)
+
+            strategy.log({
+
+                "scanned": len(plan),
+
+                "coverage": coverage.subset(
+                    [ticker for ticker in tickers if ticker in plan]
+                ),
+
+                "skipped": skipped,
+
+                "illiquid": len(universe) - len(plan),
+
+                "results": len(results),
+
+                "alerts": len(alerts),
+
+                **{key: totals[key] for key in strategy.totals}
+
+            })
+
+            scans[strategy.name] = (df, alerts, states[strategy.name])
+
+        if len(strategies) > 1:
+            coverage.log("COVERAGE FETCH")
+
+        FEATURE_STORE.log()
+
+        return scans
+
+
+PIPELINE = IntradayPipeline()
+
+# ======================================================
+# PUBLIC FUNCTION
+# ======================================================
+
+def scan_intraday(strategies=("day", "bsjp"), states=None, prefetch=True, universe=None):
+
+    """
+    Semua strategi dalam 1 ronde fetch.
+    Return {nama: (df, alerts, state)}.
+    """
+
+    # loop + thread pool jangka panjang (tidak dibuat per scan)
+    return get_runtime().run(
+        PIPELINE.run_async(strategies, states, prefetch, universe)
+    )
@@ -0,0 +1,335 @@
+import numpy as np
+
+
+# ======================================================
+# KERNEL 2-D (SEMUA SAHAM SEKALIGUS)
+# ======================================================
+#
+# Input : array (N, T) float64, 1 baris = 1 saham,
+#         bar rata kanan (UniversePanel.compact), kiri NaN
+# Output: array (N, T), [:, -1] = nilai bar terakhir tiap saham
+#
+# Loop cuma di sumbu waktu (T ~ 125), tiap langkah 1 operasi
+# vektor untuk N saham. Urutan operasi float sama persis dengan
+# pandas (ewm adjust=False / rolling mean / rolling std) -> hasil
+# identik dengan indikator per saham di app.core.indicators.
+#
+# Warm-up NaN-aware: NaN di kiri (saham history pendek) maupun
+# di tengah (bar kosong) diperlakukan sama seperti pandas.
+
+
+def _errstate():
+
+    return np.errstate(invalid="ignore", divide="ignore")
+
+
+# ======================================================
+# EWM (adjust=False, min_periods=0, ignore_na=False)
+# ======================================================
+
+def ewm_mean(values, com):
+
+    """
+    Setara Series.ewm(com=com, adjust=False).mean() per baris.
+    Baris boleh diawali NaN (sebelum bar pertama saham itu).
+    """
+
+    alpha = 1.0 / (1.0 + com)
+
+    old_wt_factor = 1.0 - alpha
+
+    new_wt = alpha
+
+    out = np.empty_like(values)
+
+    weighted = np.full(values.shape[0], np.nan)
+
+    # bobot nilai lama; bar NaN di tengah -> bobot terus meluruh
+    old_wt = np.ones(values.shape[0])
+
+    with _errstate():
+
+        for t in range(values.shape[1]):
+
+            cur = values[:, t]
+
+            started = weighted == weighted
+
+            observed = cur == cur
+
+            old_wt = np.where(started, old_wt * old_wt_factor, old_wt)
+
+            update = started & observed & (weighted != cur)
+
+            blended = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+
+            weighted = np.where(update, blended, weighted)
+
+            old_wt = np.where(started & observed, 1.0, old_wt)
+
+            weighted = np.where(~started & observed, cur, weighted)
+
+            out[:, t] = weighted
+
+    return out
+
+
+def ema(values, period):
+
+    # span -> com (sama dengan pandas)
+    return ewm_mean(values, (period - 1) / 2)
+
+
+def rsi(values, period=14):
+
+    """RSI Wilder, setara app.core.indicators.rsi per baris."""
+
+    delta = np.full_like(values, np.nan)
+
+    delta[:, 1:] = values[:, 1:] - values[:, :-1]
+
+    gain = np.where(delta < 0, 0.0, delta)
+
+    loss = -np.where(delta > 0, 0.0, delta)
+
+    com = 1 / (1 / period) - 1
+
+    avg_gain = ewm_mean(gain, com)
+
+    avg_loss = ewm_mean(loss, com)
+
+    with _errstate():
+
+        rs = avg_gain / avg_loss
+
+        return 100 - (100 / (1 + rs))
+
+
+def macd(values, fast=12, slow=26, signal=9):
+
+    """Setara app.core.indicators.macd -> (macd_line, signal_line, histogram)."""
+
+    macd_line = ema(values, fast) - ema(values, slow)
+
+    signal_line = ema(macd_line, signal)
+
+    return macd_line, signal_line, macd_line - signal_line
+
+
+# ======================================================
+# ROLLING MEAN (min_periods = window)
+# ======================================================
+
+def rolling_mean(values, window):
+
+    """
+    Setara Series.rolling(window).mean() per baris, termasuk
+    kompensasi Kahan tambah / buang milik pandas.
+    NaN dilewati (tidak dihitung sebagai observasi).
+    """
+
+    n, t_len = values.shape
+
+    out = np.full_like(values, np.nan)
+
+    sum_x = np.zeros(n)
+
+    comp_add = np.zeros(n)
+
+    comp_remove = np.zeros(n)
+
+    nobs = np.zeros(n, dtype=np.int64)
+
+    neg_ct = np.zeros(n, dtype=np.int64)
+
+    same_ct = np.zeros(n, dtype=np.int64)
+
+    prev = values[:, 0].copy() if t_len else np.zeros(n)
+
+    with _errstate():
+
+        for t in range(t_len):
+
+            # ================= BUANG BAR KELUAR WINDOW =================
+            if t >= window:
+
+                val = values[:, t - window]
+
+                ok = val == val
+
+                y = -val - comp_remove
+                s = sum_x + y
+                comp_remove = np.where(ok, s - sum_x - y, comp_remove)
+                sum_x = np.where(ok, s, sum_x)
+
+                nobs -= ok
+                neg_ct -= ok & np.signbit(val)
+
+            # ================= TAMBAH BAR BARU =================
+            val = values[:, t]
+
+            ok = val == val
+
+            y = val - comp_add
+            s = sum_x + y
+            comp_add = np.where(ok, s - sum_x - y, comp_add)
+            sum_x = np.where(ok, s, sum_x)
+
+            nobs += ok
+            neg_ct += ok & np.signbit(val)
+
+            same_ct = np.where(ok, np.where(val == prev, same_ct + 1, 1), same_ct)
+            prev = np.where(ok, val, prev)
+
+            # ================= MEAN =================
+            result = sum_x / nobs
+
+            result = np.where(same_ct >= nobs, prev, result)
+            result = np.where((neg_ct == 0) & (result < 0), 0.0, result)
+            result = np.where((neg_ct == nobs) & (result > 0), 0.0, result)
+
+            out[:, t] = np.where(nobs >= window, result, np.nan)
+
+    return out
+
+
+def sma(values, window):
+
+    return rolling_mean(values, window)
+
+
+# ======================================================
+# ROLLING STD (ddof=1, min_periods = window)
+# ======================================================
+
+def rolling_var(values, window, ddof=1):
+
+    """
+    Setara Series.rolling(window).var() per baris: Welford
+    + kompensasi Kahan, urutan buang lalu tambah seperti pandas.
+    """
+
+    n, t_len = values.shape
+
+    out = np.full_like(values, np.nan)
+
+    nobs = np.zeros(n)
+
+    mean_x = np.zeros(n)
+
+    ssqdm_x = np.zeros(n)
+
+    comp_add = np.zeros(n)
+
+    comp_remove = np.zeros(n)
+
+    same_ct = np.zeros(n, dtype=np.int64)
+
+    prev = values[:, 0].copy() if t_len else np.zeros(n)
+
+    with _errstate():
+
+        for t in range(t_len):
+
+            # ================= BUANG BAR KELUAR WINDOW =================
+            if t >= window:
+
+                val = values[:, t - window]
+
+                ok = val == val
+
+                nobs = np.where(ok, nobs - 1, nobs)
+
+                keep = ok & (nobs > 0)
+
+                prev_mean = mean_x - comp_remove
+                y = val - comp_remove
+                d = y - mean_x
+                new_comp = d + mean_x - y
+                new_mean = mean_x - d / nobs
+                new_ssq = ssqdm_x - (val - prev_mean) * (val - new_mean)
+
+                comp_remove = np.where(keep, new_comp, comp_remove)
+                mean_x = np.where(keep, new_mean, mean_x)
+                ssqdm_x = np.where(keep, new_ssq, ssqdm_x)
+
+                empty = ok & (nobs == 0)
+
+                mean_x = np.where(empty, 0.0, mean_x)
+                ssqdm_x = np.where(empty, 0.0, ssqdm_x)
+
+            # ================= TAMBAH BAR BARU =================
+            val = values[:, t]
+
+            ok = val == val
+
+            nobs = np.where(ok, nobs + 1, nobs)
+
+            same_ct = np.where(ok, np.where(val == prev, same_ct + 1, 1), same_ct)
+            prev = np.where(ok, val, prev)
+
+            prev_mean = mean_x - comp_add
+            y = val - comp_add
+            d = y - mean_x
+            new_comp = d + mean_x - y
+            new_mean = mean_x + d / nobs
+            new_ssq = ssqdm_x + (val - prev_mean) * (val - new_mean)
+
+            comp_add = np.where(ok, new_comp, comp_add)
+            mean_x = np.where(ok, new_mean, mean_x)
+            ssqdm_x = np.where(ok, new_ssq, ssqdm_x)
+
+            # ================= VARIANCE =================
+            result = ssqdm_x / (nobs - ddof)
+
+            result = np.where((nobs == 1) | (same_ct >= nobs), 0.0, result)
+
+            out[:, t] = np.where((nobs >= window) & (nobs > ddof), result, np.nan)
+
+    return out
+
+
+def rolling_std(values, window, ddof=1):
+
+    """Setara Series.rolling(window).std() per baris."""
+
+    var = rolling_var(values, window, ddof)
+
+    with _errstate():
+        out = np.sqrt(var)
+
+    # sama dengan zsqrt pandas: varians negatif (artefak float) -> 0
+    return np.where(var < 0, 0.0, out)
+
+
+# ======================================================
+# ROLLING MAX / MIN (min_periods = window)
+# ======================================================
+
+def _rolling_extreme(values, window, reduce):
+
+    out = np.full_like(values, np.nan)
+
+    if values.shape[1] < window:
+        return out
+
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=1)
+
+    # NaN di jendela -> observasi < window -> NaN (ikut pandas)
+    out[:, window - 1:] = reduce(windows, axis=2)
+
+    return out
+
+
+def rolling_max(values, window):
+
+    """Setara Series.rolling(window).max() per baris."""
+
+    return _rolling_extreme(values, window, np.max)
+
+
+def rolling_min(values, window):
+
+    """Setara Series.rolling(window).min() per baris."""
+
+    return _rolling_extreme(values, window, np.min)
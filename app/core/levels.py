@@ -0,0 +1,175 @@
+from collections import deque
+
+import numpy as np
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# window support / resistance yang dipakai screener & scanner
+LEVEL_WINDOWS = (5, 7, 10, 14, 15, 20, 30)
+
+_REDUCE = {
+    "max": np.fmax,
+    "min": np.fmin,
+}
+
+
+# ======================================================
+# BATCH (SEMUA WINDOW, 1 BUILD)
+# ======================================================
+
+def rolling_extrema(values, windows=LEVEL_WINDOWS, mode="max"):
+
+    """
+    {window: array} dengan out[w][i] = max / min values[i-w+1 .. i]
+    (sumbu terakhir; 1-D per saham atau (N, T) semua saham).
+
+    Semantik sama dengan series.iloc[:i + 1].tail(w).max():
+    - NaN dilewati, jendela isi NaN semua -> NaN
+    - awal series (i < w - 1) -> ekstrem dari bar yang ada
+
+    Tabel doubling: level k = ekstrem 2^k bar, dibangun sekali
+    (log2 window terbesar langkah vektor). Window w = gabungan
+    2 blok 2^k yang saling tumpang -> semua window dari 1 build.
+    """
+
+    reduce = _REDUCE[mode]
+
+    values = np.asarray(values, dtype=np.float64)
+
+    windows = sorted(set(windows))
+
+    tables = [values]
+
+    span = 1
+
+    while span * 2 <= windows[-1]:
+
+        tables.append(reduce(tables[-1], _shift(tables[-1], span)))
+
+        span *= 2
+
+    out = {}
+
+    for window in windows:
+
+        k = window.bit_length() - 1
+
+        table = tables[k]
+
+        out[window] = reduce(table, _shift(table, window - (1 << k)))
+
+    return out
+
+
+def _shift(values, lag):
+
+    """Geser ke kanan sejauh lag di sumbu waktu, sisi kiri NaN."""
+
+    if not lag:
+        return values
+
+    out = np.full_like(values, np.nan)
+
+    out[..., lag:] = values[..., :-lag]
+
+    return out
+
+
+def level_at(series_extrema, shift=0):
+
+    """Nilai bar terakhir (shift=1 -> tanpa bar hari ini, setara iloc[-w-1:-1])."""
+
+    if len(series_extrema) <= shift:
+        return np.nan
+
+    return series_extrema[len(series_extrema) - 1 - shift]
+
+
+# ======================================================
+# STREAMING (MONOTONIC DEQUE)
+# ======================================================
+
+class MonotonicExtrema:
+
+    """
+    Max / min berjalan beberapa window sekaligus untuk bar yang terus
+    bertambah (loop bot 15m).
+
+    - update(x) : amortized O(1) per window (1 deque monoton per window)
+    - revise(x) : bar terakhir berubah -> deque dibangun ulang dari
+                  buffer window terbesar (O(window), 1x per cycle)
+    - get(w)    : O(1), setara series.tail(w).max() / .min()
+    """
+
+    def __init__(self, windows=LEVEL_WINDOWS, mode="max"):
+
+        self.windows = tuple(sorted(set(windows)))
+
+        self.mode = mode
+
+        self._reset()
+
+    def _reset(self):
+
+        self._t = -1
+
+        self._buffer = deque(maxlen=self.windows[-1])
+
+        self._deques = {window: deque() for window in self.windows}
+
+    def _dominated(self, old, new):
+
+        # nilai lama tidak mungkin jadi ekstrem lagi
+        return old <= new if self.mode == "max" else old >= new
+
+    def _push(self, x):
+
+        self._t += 1
+
+        self._buffer.append(x)
+
+        for window, dq in self._deques.items():
+
+            # NaN tidak masuk deque, tapi tetap makan slot waktu
+            if x == x:
+
+                while dq and self._dominated(dq[-1][1], x):
+                    dq.pop()
+
+                dq.append((self._t, x))
+
+            while dq and dq[0][0] <= self._t - window:
+                dq.popleft()
+
+    def update(self, x):
+
+        self._push(float(x))
+
+    def revise(self, x):
+
+        if self._t < 0:
+            return self.update(x)
+
+        history = list(self._buffer)[:-1] + [float(x)]
+
+        t_end = self._t
+
+        self._reset()
+
+        self._t = t_end - len(history)
+
+        for value in history:
+            self._push(value)
+
+    @property
+    def value(self):
+        return {window: self.get(window) for window in self.windows}
+
+    def get(self, window):
+
+        dq = self._deques[window]
+
+        return dq[0][1] if dq else np.nan
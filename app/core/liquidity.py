@@ -0,0 +1,192 @@
+import os
+import json
+import threading
+
+from app.core.data_loader import load_daily_data_batch
+from app.utils.market_hours import now_jkt, is_market_open
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+INDEX_PATH = os.path.join("data", "liquidity.json")
+
+# jumlah sesi daily yang dirata-rata
+LOOKBACK = 20
+
+# jumlah bar 15m per sesi IDX (sesi 1 + sesi 2)
+BARS_PER_SESSION = 22
+
+# prune cuma kalau hari TERBAIK dalam LOOKBACK sesi
+# masih < SAFETY_MARGIN x gate -> hampir mustahil lolos hari ini
+SAFETY_MARGIN = 0.25
+
+
+def intraday_volume(per_bar):
+
+    """Gate volume rata-rata per bar 15m -> volume daily setara."""
+
+    return per_bar * BARS_PER_SESSION
+
+
+# ======================================================
+# STATS
+# ======================================================
+
+def liquidity_stats(df):
+
+    """
+    Statistik likuiditas dari frame daily kanonik.
+    Bar hari ini (saat market buka) belum lengkap -> tidak dihitung.
+    """
+
+    if df is None or df.empty:
+        return None
+
+    if is_market_open() and df.index[-1].date() == now_jkt().date():
+        df = df.iloc[:-1]
+
+    recent = df.tail(LOOKBACK)
+
+    if recent.empty:
+        return None
+
+    volume = recent["VOLUME"]
+
+    value = recent["CLOSE"] * volume
+
+    return {
+        "avg_volume": float(volume.mean()),
+        "avg_value": float(value.mean()),
+        "max_volume": float(volume.max()),
+        "max_value": float(value.max()),
+        "last_price": float(recent["CLOSE"].iloc[-1]),
+        "last_date": recent.index[-1].date().isoformat(),
+    }
+
+
+# ======================================================
+# LIQUIDITY INDEX
+# ======================================================
+
+class LiquidityIndex:
+
+    """
+    Tabel likuiditas per kode (data/liquidity.json).
+
+    - dibangun dari bar daily (store), 1x per hari per kode
+    - scanner prune universe SEBELUM fetch intraday
+    - kode tanpa data -> tidak di-prune (lebih aman)
+    """
+
+    def __init__(self, path=INDEX_PATH):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        self._rows = None
+
+    # ======================================================
+    # PERSIST
+    # ======================================================
+
+    def _load(self):
+
+        if self._rows is None:
+
+            try:
+                with open(self.path) as f:
+                    self._rows = json.load(f)
+            except (OSError, ValueError):
+                self._rows = {}
+
+        return self._rows
+
+    def _save(self):
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(self._rows, f)
+
+        os.replace(self.path + ".tmp", self.path)
+
+    # ======================================================
+    # REFRESH (1X PER HARI)
+    # ======================================================
+
+    def refresh(self, codes, force=False):
+
+        today = now_jkt().date().isoformat()
+
+        with self._lock:
+
+            rows = self._load()
+
+            stale = [
+                kode for kode in codes
+                if force or rows.get(kode, {}).get("built") != today
+            ]
+
+            if not stale:
+                return 0
+
+            # store dulu, network cuma untuk tail daily yang belum ada
+            frames = load_daily_data_batch(stale)
+
+            for kode in stale:
+
+                stats = liquidity_stats(frames.get(kode)) or {}
+
+                rows[kode] = {**stats, "built": today}
+
+            self._save()
+
+            return len(stale)
+
+    def get(self, kode):
+
+        with self._lock:
+            return self._load().get(kode)
+
+    # ======================================================
+    # PRUNE
+    # ======================================================
+
+    def prune(self, codes, min_daily_volume=0, min_daily_value=0):
+
+        """
+        Buang kode yang jelas tidak lolos gate likuiditas.
+        Gate dalam satuan daily (pakai intraday_volume untuk gate 15m).
+        """
+
+        self.refresh(codes)
+
+        with self._lock:
+
+            rows = self._load()
+
+            kept = []
+
+            for kode in codes:
+
+                row = rows.get(kode) or {}
+
+                if "max_volume" not in row:
+                    kept.append(kode)
+                    continue
+
+                if row["max_volume"] < min_daily_volume * SAFETY_MARGIN:
+                    continue
+
+                if row["max_value"] < min_daily_value * SAFETY_MARGIN:
+                    continue
+
+                kept.append(kode)
+
+        return kept
+
+
+LIQUIDITY = LiquidityIndex()
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.market_hours import TZ
+
+
+# ======================================================
+# SCHEMA
+# ======================================================
+
+# 1 format frame harga untuk seluruh app:
+# - kolom   : OPEN HIGH LOW CLOSE VOLUME (float64, urutan tetap)
+# - index   : DatetimeIndex tz-aware Asia/Jakarta, urut, unik
+OHLCV_COLUMNS = ["OPEN", "HIGH", "LOW", "CLOSE", "VOLUME"]
+
+TZ_NAME = "Asia/Jakarta"
+
+
+# ======================================================
+# CHECK
+# ======================================================
+
+def is_ohlcv(df):
+
+    """Cek murah: frame sudah format kanonik (tanpa copy)."""
+
+    if not isinstance(df, pd.DataFrame):
+        return False
+
+    if list(df.columns) != OHLCV_COLUMNS:
+        return False
+
+    if not all(dtype == np.float64 for dtype in df.dtypes):
+        return False
+
+    index = df.index
+
+    return (
+        isinstance(index, pd.DatetimeIndex)
+        and index.tz is not None
+        and str(index.tz) == TZ_NAME
+    )
+
+
+# ======================================================
+# NORMALIZE (INGEST)
+# ======================================================
+
+def normalize_ohlcv(df, dropna=True):
+
+    """
+    Frame mentah (yfinance / store / hasil adjust) -> format kanonik.
+
+    Dipanggil 1x saat ingest (sebelum masuk cache).
+    Return None kalau kolom OHLCV tidak lengkap / frame kosong.
+    """
+
+    if df is None or df.empty:
+        return None
+
+    # ================= COLUMN =================
+    if isinstance(df.columns, pd.MultiIndex):
+        names = [str(c[0]) for c in df.columns]
+    else:
+        names = [str(c) for c in df.columns]
+
+    names = [c.upper().strip() for c in names]
+
+    cols = {}
+
+    for i, name in enumerate(names):
+
+        if name in OHLCV_COLUMNS and name not in cols:
+            cols[name] = df.iloc[:, i]
+
+    if len(cols) < len(OHLCV_COLUMNS):
+        return None
+
+    # ================= FRAME (1 COPY) =================
+    out = pd.DataFrame(
+        {
+            col: pd.to_numeric(cols[col], errors="coerce").to_numpy(
+                dtype=np.float64,
+                na_value=np.nan
+            )
+            for col in OHLCV_COLUMNS
+        },
+        index=_jakarta_index(df.index)
+    )
+
+    # ================= INDEX =================
+    if not out.index.is_monotonic_increasing:
+        out = out.sort_index()
+
+    if out.index.has_duplicates:
+        out = out[~out.index.duplicated(keep="last")]
+
+    if dropna:
+        out = out.dropna()
+
+    if out.empty:
+        return None
+
+    return out
+
+
+def _jakarta_index(index):
+
+    index = pd.DatetimeIndex(index)
+
+    if index.tz is None:
+        return index.tz_localize(TZ)
+
+    return index.tz_convert(TZ)
+
+
+# ======================================================
+# ACCEPT (DOWNSTREAM)
+# ======================================================
+
+def as_ohlcv(df):
+
+    """
+    Untuk fungsi downstream:
+    - frame kanonik -> dikembalikan apa adanya (zero-copy)
+    - format lain   -> dinormalisasi (copy)
+
+    Frame hasil as_ohlcv boleh dipakai bersama, JANGAN di-mutate.
+    """
+
+    if is_ohlcv(df):
+        return df
+
+    return normalize_ohlcv(df)
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+
+from app.core.data_loader import load_daily_data_batch
+from app.core.ohlcv import OHLCV_COLUMNS, as_ohlcv
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+FIELD_INDEX = {field: i for i, field in enumerate(OHLCV_COLUMNS)}
+
+
+# ======================================================
+# UNIVERSE PANEL
+# ======================================================
+
+class UniversePanel:
+
+    """
+    OHLCV 1 universe dalam 1 array NumPy kontigu:
+
+        values[ticker, bar, field]   shape (N, T, 5), float64
+
+    - tickers : pd.Index kode (tanpa .JK), urutan baris
+    - dates   : DatetimeIndex gabungan semua bar (tz Jakarta), urutan kolom
+    - bar yang tidak ada (belum listing / suspend / libur) = NaN
+
+    Dipakai untuk hitung indikator / skor semua saham sekaligus
+    (1 operasi array per kolom, bukan loop per saham).
+    Array dibagi ke banyak pemakai -> JANGAN di-mutate.
+    """
+
+    def __init__(self, values, tickers, dates):
+
+        self.values = values
+
+        self.tickers = pd.Index(tickers, name="Kode")
+
+        self.dates = dates
+
+        self._row = {kode: i for i, kode in enumerate(self.tickers)}
+
+    # ======================================================
+    # BUILD
+    # ======================================================
+
+    @classmethod
+    def from_frames(cls, frames, bars=None):
+
+        """
+        frames: dict {kode: frame OHLCV} (output load_daily_data_batch).
+        bars  : simpan cuma N bar terakhir (None = semua).
+        """
+
+        frames = {
+            kode: df
+            for kode, df in (
+                (kode, as_ohlcv(df)) for kode, df in frames.items()
+            )
+            if df is not None and not df.empty
+        }
+
+        if not frames:
+            return cls.empty()
+
+        # kalender gabungan (int64 ns, sudah urut & unik)
+        stamps = np.unique(np.concatenate([
+            df.index.asi8 for df in frames.values()
+        ]))
+
+        if bars is not None:
+            stamps = stamps[-bars:]
+
+        tz = next(iter(frames.values())).index.tz
+
+        dates = pd.DatetimeIndex(stamps, tz="UTC").tz_convert(tz)
+
+        dates.name = "Date"
+
+        values = np.full(
+            (len(frames), len(dates), len(OHLCV_COLUMNS)),
+            np.nan
+        )
+
+        for i, df in enumerate(frames.values()):
+
+            pos = np.searchsorted(stamps, df.index.asi8)
+
+            # bar di luar jendela `bars` dibuang
+            keep = (pos < len(stamps))
+            keep[keep] = stamps[pos[keep]] == df.index.asi8[keep]
+
+            values[i, pos[keep]] = df.to_numpy()[keep]
+
+        return cls(values, list(frames), dates)
+
+    @classmethod
+    def from_loader(cls, codes, period="6mo", bars=None):
+
+        """Bangun dari bar store / cache (1 batch load universe)."""
+
+        frames = load_daily_data_batch(codes, period=period)
+
+        # urutan baris ikut urutan codes
+        ordered = {kode: frames[kode] for kode in codes if kode in frames}
+
+        return cls.from_frames(ordered, bars=bars)
+
+    @classmethod
+    def empty(cls):
+
+        return cls(
+            np.empty((0, 0, len(OHLCV_COLUMNS))),
+            [],
+            pd.DatetimeIndex([], tz="Asia/Jakarta", name="Date")
+        )
+
+    # ======================================================
+    # SHAPE
+    # ======================================================
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, kode):
+        return kode in self._row
+
+    def __repr__(self):
+
+        n, t, _ = self.values.shape
+
+        if not t:
+            return f"UniversePanel({n} saham, 0 bar)"
+
+        return (
+            f"UniversePanel({n} saham, {t} bar, "
+            f"{self.dates[0].date()} -> {self.dates[-1].date()})"
+        )
+
+    # ======================================================
+    # ACCESS (ALIGNED, TANPA COPY)
+    # ======================================================
+
+    def field(self, name):
+
+        """(N, T) view 1 kolom, bar sejajar kalender `dates`."""
+
+        return self.values[:, :, FIELD_INDEX[name]]
+
+    def row(self, kode):
+
+        return self._row[kode]
+
+    def frame(self, kode):
+
+        """1 saham -> frame OHLCV kanonik (bar NaN dibuang)."""
+
+        df = pd.DataFrame(
+            self.values[self._row[kode]],
+            index=self.dates,
+            columns=OHLCV_COLUMNS
+        )
+
+        return df[df["CLOSE"].notna()]
+
+    def select(self, codes):
+
+        rows = [self._row[kode] for kode in codes if kode in self._row]
+
+        return UniversePanel(
+            self.values[rows],
+            self.tickers[rows],
+            self.dates
+        )
+
+    def tail(self, bars):
+
+        return UniversePanel(
+            self.values[:, -bars:],
+            self.tickers,
+            self.dates[-bars:]
+        )
+
+    # ======================================================
+    # RAGGED (PER SAHAM, RATA KANAN)
+    # ======================================================
+
+    @property
+    def valid(self):
+
+        """(N, T) bool: saham punya bar di tanggal itu."""
+
+        return ~np.isnan(self.field("CLOSE"))
+
+    @property
+    def lengths(self):
+
+        """Jumlah bar valid per saham (setara len(df))."""
+
+        return self.valid.sum(axis=1)
+
+    @property
+    def last_index(self):
+
+        """Posisi bar valid terakhir per saham (-1 kalau kosong)."""
+
+        valid = self.valid
+
+        if not valid.shape[1]:
+            return np.full(len(self), -1)
+
+        last = valid.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+
+        return np.where(valid.any(axis=1), last, -1)
+
+    def last(self, name):
+
+        """Nilai bar terakhir per saham (setara df[name].iloc[-1])."""
+
+        idx = self.last_index
+
+        out = self.field(name)[np.arange(len(self)), np.maximum(idx, 0)]
+
+        return np.where(idx >= 0, out, np.nan)
+
+    def compact(self):
+
+        """
+        Array (N, T, 5) dengan bar valid tiap saham dirapatkan ke kanan:
+        [:, -1] = bar terakhir saham itu, [:, -k] = k bar ke belakang
+        (sama dengan df.iloc[-k]), sisi kiri diisi NaN.
+
+        Untuk kernel yang butuh semantik per-saham (suspend /
+        listing baru tidak punya bar di kalender gabungan).
+        """
+
+        valid = self.valid
+
+        # stable argsort bool: False (kosong) dulu, True urut waktu
+        order = np.argsort(valid, axis=1, kind="stable")
+
+        return np.take_along_axis(self.values, order[:, :, None], axis=1)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
@@ -0,0 +1,197 @@
+import time
+import threading
+
+from collections import OrderedDict
+from datetime import datetime
+
+from app.utils.market_hours import TZ, is_market_open, is_settling, next_session_boundary
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+MAX_ENTRIES = 2048
+
+# TTL intraday (detik)
+INTRADAY_TTL = {
+    "1m": 30,
+    "5m": 60,
+    "15m": 60,
+    "30m": 120,
+    "1h": 300,
+}
+
+# daily saat market buka: bar hari ini masih bergerak
+DAILY_TTL_MARKET_OPEN = 15 * 60
+
+
+# ======================================================
+# TTL PER INTERVAL
+# ======================================================
+
+def expires_at(interval, now=None):
+
+    """
+    Epoch kapan frame interval ini basi.
+
+    - intraday       -> TTL pendek (15m = 60 detik)
+    - daily / weekly -> sampai boundary sesi berikutnya
+      (saat market buka / grace setelah close dibatasi
+      DAILY_TTL_MARKET_OPEN, bar hari ini belum final)
+    """
+
+    now = now or datetime.now(TZ)
+
+    if interval in INTRADAY_TTL:
+        return now.timestamp() + INTRADAY_TTL[interval]
+
+    boundary = next_session_boundary(now).timestamp()
+
+    if is_market_open(now) or is_settling(now):
+        return min(boundary, now.timestamp() + DAILY_TTL_MARKET_OPEN)
+
+    return boundary
+
+
+# ======================================================
+# PRICE CACHE
+# ======================================================
+
+class PriceCache:
+
+    """
+    In-memory TTL + LRU cache (1 per proses)
+
+    - key   : (symbol, period, interval, adjusted)
+    - value : DataFrame harga (JANGAN di-mutate, dipakai bersama)
+    - entry lewat TTL dianggap miss
+    - entry > max_entries -> yang paling lama tidak dipakai dibuang
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+
+        self.max_entries = max_entries
+
+        self._data = OrderedDict()
+
+        self._lock = threading.Lock()
+
+        # 1 loader per key (request bersamaan nunggu hasil yang sama)
+        self._loading = {}
+
+        self.hits = 0
+
+        self.misses = 0
+
+        self.evictions = 0
+
+    # ======================================================
+    # GET / PUT
+    # ======================================================
+
+    def get(self, key):
+
+        with self._lock:
+
+            entry = self._data.get(key)
+
+            if entry is not None:
+
+                value, expiry = entry
+
+                if expiry is None or expiry > time.time():
+
+                    self._data.move_to_end(key)
+
+                    self.hits += 1
+
+                    return value
+
+                del self._data[key]
+
+            self.misses += 1
+
+            return None
+
+    def put(self, key, value, expiry=None):
+
+        if value is None:
+            return
+
+        with self._lock:
+
+            self._data[key] = (value, expiry)
+
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+
+                self._data.popitem(last=False)
+
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, interval=None):
+
+        value = self.get(key)
+
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+
+            # sudah di-load thread lain selagi nunggu
+            with self._lock:
+                entry = self._data.get(key)
+
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return entry[0]
+
+            value = loader()
+
+            self.put(
+                key,
+                value,
+                expires_at(interval) if interval else None
+            )
+
+        with self._lock:
+            self._loading.pop(key, None)
+
+        return value
+
+    # ======================================================
+    # MAINTENANCE
+    # ======================================================
+
+    def invalidate(self, symbol=None):
+
+        with self._lock:
+
+            if symbol is None:
+                self._data.clear()
+                return
+
+            for key in [k for k in self._data if k[0] == symbol]:
+                del self._data[key]
+
+    def stats(self):
+
+        with self._lock:
+
+            total = self.hits + self.misses
+
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total * 100, 1) if total else 0,
+            }
+
+
+PRICE_CACHE = PriceCache()
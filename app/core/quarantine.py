@@ -0,0 +1,308 @@
+import os
+import json
+import time
+import threading
+
+from collections import deque
+
+import pandas as pd
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+STORE_PATH = os.path.join("data", "quarantine.json")
+
+# gagal load N kali berturut-turut -> karantina
+FAIL_THRESHOLD = 3
+
+# gagal dalam jeda ini dihitung 1x (retry dalam 1 scan)
+FAIL_DEDUP_SECONDS = 60
+
+# volume 0 selama N sesi terakhir -> suspend / tidak likuid
+ZERO_VOLUME_SESSIONS = 5
+
+# lama karantina, dobel tiap kali masuk lagi (maks MAX_COOLDOWN)
+COOLDOWN_SECONDS = 24 * 3600
+
+MAX_COOLDOWN_SECONDS = 7 * 24 * 3600
+
+# mayoritas load terakhir gagal = network / Yahoo down,
+# bukan ticker-nya yang mati -> gagal tidak dihitung
+OUTAGE_WINDOW = 50
+
+OUTAGE_MIN_SAMPLES = 10
+
+OUTAGE_FAIL_RATIO = 0.5
+
+
+# ======================================================
+# ZERO VOLUME
+# ======================================================
+
+def zero_volume_sessions(df):
+
+    """
+    Jumlah sesi terakhir berturut-turut dengan volume 0.
+    Bisa untuk frame daily maupun intraday (dijumlah per tanggal).
+    """
+
+    if df is None or df.empty or "VOLUME" not in df.columns:
+        return 0
+
+    volume = df["VOLUME"]
+
+    if len(df.index) and not df.index.normalize().equals(df.index):
+        volume = volume.groupby(df.index.date).sum()
+
+    active = (volume.to_numpy() > 0)[::-1]
+
+    return int(active.argmax()) if active.any() else len(active)
+
+
+# ======================================================
+# QUARANTINE
+# ======================================================
+
+class Quarantine:
+
+    """
+    Negative cache persisten (data/quarantine.json) per symbol Yahoo.
+
+    - gagal load FAIL_THRESHOLD kali berturut-turut -> karantina
+    - volume 0 selama ZERO_VOLUME_SESSIONS sesi     -> karantina
+    - selama cooldown symbol di-skip (tanpa request / retry)
+    - cooldown habis -> dicoba lagi 1x:
+      sukses = bebas, gagal = karantina lagi (cooldown dobel)
+    """
+
+    def __init__(self, path=STORE_PATH):
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        self._data = None
+
+        self._mtime = None
+
+        self._recent = deque(maxlen=OUTAGE_WINDOW)
+
+    # ======================================================
+    # PERSIST
+    # ======================================================
+
+    def _entries(self):
+
+        # file diubah proses lain (bot / UI) -> baca ulang
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+
+        if self._data is None or mtime != self._mtime:
+
+            try:
+                with open(self.path) as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+
+            self._mtime = mtime
+
+        return self._data
+
+    def _save(self):
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        with open(self.path + ".tmp", "w") as f:
+            json.dump(self._data, f, indent=2)
+
+        os.replace(self.path + ".tmp", self.path)
+
+        self._mtime = os.path.getmtime(self.path)
+
+    # ======================================================
+    # CHECK
+    # ======================================================
+
+    def is_blocked(self, symbol):
+
+        with self._lock:
+
+            entry = self._entries().get(symbol)
+
+            return bool(entry) and entry.get("until", 0) > time.time()
+
+    def is_suspect(self, symbol):
+
+        """Sudah pernah gagal / sedang dikarantina (ticker mati / suspend)."""
+
+        with self._lock:
+
+            entry = self._entries().get(symbol)
+
+            return bool(entry) and (
+                entry.get("failures", 0) > 0 or entry.get("until", 0) > time.time()
+            )
+
+    def filter(self, codes):
+
+        """Buang kode (tanpa .JK) yang sedang dikarantina."""
+
+        now = time.time()
+
+        with self._lock:
+
+            entries = self._entries()
+
+            return [
+                kode for kode in codes
+                if entries.get(f"{kode}.JK", {}).get("until", 0) <= now
+            ]
+
+    # ======================================================
+    # RECORD
+    # ======================================================
+
+    def _block(self, entry, reason, now):
+
+        cooldown = min(
+            COOLDOWN_SECONDS * 2 ** entry.get("strikes", 0),
+            MAX_COOLDOWN_SECONDS
+        )
+
+        entry["reason"] = reason
+        entry["since"] = now
+        entry["until"] = now + cooldown
+        entry["strikes"] = entry.get("strikes", 0) + 1
+
+    def record_failure(self, symbol, reason="data kosong"):
+
+        if symbol.startswith("^"):
+            return
+
+        now = time.time()
+
+        with self._lock:
+
+            entries = self._entries()
+
+            entry = entries.setdefault(symbol, {"failures": 0})
+
+            if now - entry.get("last_failure", 0) < FAIL_DEDUP_SECONDS:
+                return
+
+            entry["failures"] = entry.get("failures", 0) + 1
+            entry["last_failure"] = now
+
+            if entry["failures"] >= FAIL_THRESHOLD and entry.get("until", 0) <= now:
+                self._block(entry, f"{reason} {entry['failures']}x", now)
+
+            self._save()
+
+    def record_success(self, symbol, df=None):
+
+        # index (^JKSE dll) tidak pernah dikarantina
+        if symbol.startswith("^"):
+            return
+
+        zero_sessions = zero_volume_sessions(df)
+
+        with self._lock:
+
+            entries = self._entries()
+
+            if zero_sessions >= ZERO_VOLUME_SESSIONS:
+
+                entry = entries.setdefault(symbol, {"failures": 0})
+
+                now = time.time()
+
+                if entry.get("until", 0) <= now:
+                    self._block(entry, f"volume 0 selama {zero_sessions} sesi", now)
+                    self._save()
+
+                return
+
+            if symbol in entries:
+                del entries[symbol]
+                self._save()
+
+    def outage(self):
+
+        """Sebagian besar load terakhir gagal -> kemungkinan network down."""
+
+        recent = list(self._recent)
+
+        if len(recent) < OUTAGE_MIN_SAMPLES:
+            return False
+
+        return recent.count(False) / len(recent) >= OUTAGE_FAIL_RATIO
+
+    def track(self, symbol, df):
+
+        """Catat hasil 1 load: frame kosong / None = gagal."""
+
+        ok = df is not None and not df.empty
+
+        self._recent.append(ok)
+
+        if ok:
+            self.record_success(symbol, df)
+
+        elif not self.outage():
+            self.record_failure(symbol)
+
+    def release(self, symbol=None):
+
+        with self._lock:
+
+            self._entries()
+
+            if symbol is None:
+                self._data = {}
+            else:
+                self._data.pop(symbol, None)
+
+            self._save()
+
+    # ======================================================
+    # REPORT
+    # ======================================================
+
+    def report(self):
+
+        """DataFrame symbol yang sedang dikarantina + alasannya."""
+
+        now = time.time()
+
+        with self._lock:
+
+            rows = [
+
+                {
+                    "Symbol": symbol,
+                    "Reason": entry.get("reason"),
+                    "Failures": entry.get("failures", 0),
+                    "Strikes": entry.get("strikes", 0),
+                    "Since": pd.Timestamp(entry["since"], unit="s", tz="Asia/Jakarta"),
+                    "Until": pd.Timestamp(entry["until"], unit="s", tz="Asia/Jakarta"),
+                }
+
+                for symbol, entry in self._entries().items()
+                if entry.get("until", 0) > now
+
+            ]
+
+        if not rows:
+            return pd.DataFrame(
+                columns=["Symbol", "Reason", "Failures", "Strikes", "Since", "Until"]
+            )
+
+        return pd.DataFrame(rows).sort_values("Until").reset_index(drop=True)
+
+
+QUARANTINE = Quarantine()
@@ -0,0 +1,212 @@
+import threading
+
+from collections import OrderedDict
+
+import pandas as pd
+
+from app.core.ohlcv import OHLCV_COLUMNS
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+MAX_ENTRIES = 2048
+
+# interval turunan yang bisa dibangun dari bar daily
+RESAMPLE_INTERVALS = ("1wk", "1mo")
+
+
+# ======================================================
+# PERIOD KEY (IDX)
+# ======================================================
+
+def period_start(index, interval):
+
+    """
+    Label bar turunan untuk tiap bar daily.
+
+    - 1wk -> Senin minggu itu (minggu bursa Senin - Jumat,
+             sama dengan label 1wk yfinance)
+    - 1mo -> tanggal 1 bulan itu
+
+    Index tz-aware tetap tz-aware (tanpa to_period).
+    """
+
+    day = index.normalize()
+
+    if interval == "1wk":
+        return day - pd.to_timedelta(index.dayofweek, unit="D")
+
+    if interval == "1mo":
+        return day - pd.to_timedelta(index.day - 1, unit="D")
+
+    raise ValueError(f"Interval resample '{interval}' tidak dikenal")
+
+
+# ======================================================
+# RESAMPLE
+# ======================================================
+
+def resample_ohlcv(daily, interval):
+
+    """
+    Frame daily kanonik -> frame 1wk / 1mo kanonik.
+    Minggu / bulan tanpa bar (libur) tidak muncul.
+    """
+
+    if daily is None or daily.empty:
+        return None
+
+    key = period_start(daily.index, interval)
+
+    key.name = daily.index.name or "Date"
+
+    g = daily.groupby(key, sort=True)
+
+    out = pd.DataFrame({
+        "OPEN": g["OPEN"].first(),
+        "HIGH": g["HIGH"].max(),
+        "LOW": g["LOW"].min(),
+        "CLOSE": g["CLOSE"].last(),
+        "VOLUME": g["VOLUME"].sum(),
+    })
+
+    return out[OHLCV_COLUMNS]
+
+
+# ======================================================
+# RESAMPLER (CACHE + INCREMENTAL)
+# ======================================================
+
+class Resampler:
+
+    """
+    Cache frame 1wk / 1mo per (symbol, interval, period).
+
+    Bar daily baru / bar hari ini berubah:
+    - semua periode sebelum periode bar terakhir lama dipakai ulang
+    - cuma periode terakhir (+ periode baru) yang di-resample ulang
+
+    History daily berubah (split / refresh / period geser)
+    -> build ulang penuh.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+
+        self.max_entries = max_entries
+
+        self._data = OrderedDict()
+
+        self._lock = threading.Lock()
+
+        self.full_builds = 0
+
+        self.incremental = 0
+
+    # ======================================================
+    # STATE
+    # ======================================================
+
+    @staticmethod
+    def _state(daily, frame):
+
+        return {
+            "daily": daily,
+            "frame": frame,
+            "first_ts": daily.index[0],
+            "first_close": float(daily["CLOSE"].iloc[0]),
+            "last_ts": daily.index[-1],
+            "rows": len(daily),
+        }
+
+    def _incremental(self, entry, daily, interval):
+
+        n = entry["rows"]
+
+        # prefix daily harus sama persis (tanpa bar sisip / hilang)
+        if (
+            len(daily) < n
+            or daily.index[0] != entry["first_ts"]
+            or float(daily["CLOSE"].iloc[0]) != entry["first_close"]
+            or daily.index[n - 1] != entry["last_ts"]
+        ):
+            return None
+
+        frame = entry["frame"]
+
+        # periode bar terakhir lama bisa masih berjalan -> hitung ulang
+        cut = period_start(daily.index[n - 1:n], interval)[0]
+
+        tail = resample_ohlcv(daily[daily.index >= cut], interval)
+
+        return pd.concat([frame[frame.index < cut], tail])
+
+    # ======================================================
+    # GET
+    # ======================================================
+
+    def get(self, symbol, daily, interval, period=None):
+
+        if daily is None or daily.empty:
+            return None
+
+        key = (symbol, interval, period)
+
+        with self._lock:
+            entry = self._data.get(key)
+
+        frame = None
+
+        if entry is not None:
+
+            # frame daily yang sama (dari price cache) -> hasil lama valid
+            if entry["daily"] is daily:
+                return entry["frame"]
+
+            frame = self._incremental(entry, daily, interval)
+
+        if frame is None:
+            frame = resample_ohlcv(daily, interval)
+            self.full_builds += 1
+        else:
+            self.incremental += 1
+
+        with self._lock:
+
+            self._data[key] = self._state(daily, frame)
+
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+        return frame
+
+    # ======================================================
+    # MAINTENANCE
+    # ======================================================
+
+    def invalidate(self, symbol=None):
+
+        with self._lock:
+
+            if symbol is None:
+                self._data.clear()
+                return
+
+            for key in [k for k in self._data if k[0] == symbol]:
+                del self._data[key]
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "entries": len(self._data),
+                "full_builds": self.full_builds,
+                "incremental": self.incremental,
+            }
+
+
+RESAMPLER = Resampler()
@@ -0,0 +1,271 @@
+import os
+import pickle
+import threading
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+MEMO_DIR = os.path.join("data", "result_memo")
+
+
+# ======================================================
+# SIGNATURE FRAME
+# ======================================================
+
+def frame_signature(df):
+
+    """
+    Sidik frame daily: timestamp bar terakhir + jumlah bar +
+    isi bar pertama & terakhir.
+
+    - bar baru                      -> timestamp berubah
+    - bar hari ini masih bergerak   -> isi bar terakhir berubah
+    - adjustment split / dividen    -> isi bar pertama berubah
+    - jendela period bergeser       -> jumlah / bar pertama berubah
+    """
+
+    if df is None or df.empty:
+        return None
+
+    values = df.to_numpy()
+
+    return (
+        int(df.index.asi8[-1]),
+        len(df),
+        values[0].tobytes() + values[-1].tobytes()
+    )
+
+
+# ======================================================
+# RESULT MEMO
+# ======================================================
+
+class ResultMemo:
+
+    """
+    Memo hasil compute per (screener_type, kode), disimpan di
+    data/result_memo/<screener_type>.pkl.
+
+    Key = (versi screener + rule table, signature frame). Hasil None
+    (tidak ada sinyal) ikut di-memo. Data tidak berubah
+    (setelah close, weekend, re-scan) -> StockResult lama
+    dipakai lagi tanpa compute.
+
+    Logic screener berubah -> naikkan `version` di screener;
+    rule table / override berubah -> memo batal otomatis.
+    """
+
+    def __init__(self, root=MEMO_DIR):
+
+        self.root = root
+
+        self._lock = threading.Lock()
+
+        self._tables = {}
+
+        self._dirty = set()
+
+        self.hits = 0
+
+        self.misses = 0
+
+    # ======================================================
+    # PERSIST
+    # ======================================================
+
+    def _path(self, screener_type):
+
+        return os.path.join(self.root, f"{screener_type}.pkl")
+
+    def _table(self, screener_type):
+
+        table = self._tables.get(screener_type)
+
+        if table is None:
+
+            try:
+                with open(self._path(screener_type), "rb") as f:
+                    table = pickle.load(f)
+            except Exception:
+                table = {}
+
+            self._tables[screener_type] = table
+
+        return table
+
+    def flush(self):
+
+        """Tulis tabel yang berubah ke disk (atomic)."""
+
+        with self._lock:
+
+            dirty = {
+                screener_type: dict(self._tables[screener_type])
+                for screener_type in self._dirty
+            }
+
+            self._dirty.clear()
+
+        if not dirty:
+            return
+
+        os.makedirs(self.root, exist_ok=True)
+
+        for screener_type, table in dirty.items():
+
+            path = self._path(screener_type)
+
+            try:
+
+                with open(path + ".tmp", "wb") as f:
+                    pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+                os.replace(path + ".tmp", path)
+
+            except Exception as e:
+                print(f"[MEMO] gagal simpan {screener_type}: {e}")
+
+    # ======================================================
+    # LOOKUP / STORE
+    # ======================================================
+
+    @staticmethod
+    def _key(screener, df):
+
+        signature = frame_signature(df)
+
+        if signature is None:
+            return None
+
+        return (getattr(screener, "memo_version", 0), signature)
+
+    def lookup(self, screener, kode, df):
+
+        """(hit, result). result None + hit True = tidak ada sinyal."""
+
+        key = self._key(screener, df)
+
+        with self._lock:
+
+            entry = self._table(screener.screener_type).get(kode)
+
+            if key is not None and entry is not None and entry[0] == key:
+
+                self.hits += 1
+
+                return True, entry[1]
+
+            self.misses += 1
+
+            return False, None
+
+    def store(self, screener, kode, df, result):
+
+        key = self._key(screener, df)
+
+        if key is None:
+            return
+
+        with self._lock:
+
+            self._table(screener.screener_type)[kode] = (key, result)
+
+            self._dirty.add(screener.screener_type)
+
+    def split(self, screener, frames):
+
+        """
+        frames {kode: df} -> (hits {kode: result}, misses {kode: df}).
+        Urutan misses ikut frames.
+        """
+
+        hits = {}
+
+        misses = {}
+
+        for kode, df in frames.items():
+
+            hit, result = self.lookup(screener, kode, df)
+
+            if hit:
+                hits[kode] = result
+            else:
+                misses[kode] = df
+
+        return hits, misses
+
+    def changed(self, screener, frames):
+
+        """Kode yang perlu compute ulang (tanpa ikut statistik hit / miss)."""
+
+        stale = []
+
+        with self._lock:
+
+            table = self._table(screener.screener_type)
+
+            for kode, df in frames.items():
+
+                entry = table.get(kode)
+
+                if entry is None or entry[0] != self._key(screener, df):
+                    stale.append(kode)
+
+        return stale
+
+    def store_many(self, screener, frames, results, skip=()):
+
+        """
+        Simpan hasil compute; kode tanpa StockResult = tidak ada sinyal.
+        skip: kode yang compute-nya error -> tidak disimpan (dicoba lagi).
+        """
+
+        by_kode = {r.kode: r for r in results if r is not None}
+
+        for kode, df in frames.items():
+
+            if kode in skip:
+                continue
+
+            self.store(screener, kode, df, by_kode.get(kode))
+
+    # ======================================================
+    # ADMIN
+    # ======================================================
+
+    def clear(self, screener_type=None):
+
+        with self._lock:
+
+            if screener_type:
+                types = [screener_type]
+            else:
+                saved = os.listdir(self.root) if os.path.isdir(self.root) else []
+                types = set(self._tables) | {
+                    name[:-4] for name in saved if name.endswith(".pkl")
+                }
+
+            for name in types:
+                self._tables[name] = {}
+                self._dirty.add(name)
+
+        self.flush()
+
+    def stats(self):
+
+        with self._lock:
+
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": sum(len(t) for t in self._tables.values()),
+            }
+
+
+# ======================================================
+# SINGLETON
+# ======================================================
+
+RESULT_MEMO = ResultMemo()
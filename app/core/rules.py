@@ -0,0 +1,487 @@
+import os
+import ast
+import json
+import copy
+import hashlib
+import operator
+import threading
+
+from collections import ChainMap
+
+import numpy as np
+
+from app.config.scoring_rules import SCORING_RULES
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# override threshold / poin tanpa ubah kode (opsional)
+OVERRIDE_PATH = os.path.join("data", "scoring_rules.json")
+
+
+class RuleError(ValueError):
+    pass
+
+
+# ======================================================
+# EXPRESSION (AST WHITELIST -> CLOSURE)
+# ======================================================
+#
+# Ekspresi rule = subset Python:
+#   angka, nama variabel, + - * /, perbandingan (boleh berantai),
+#   and / or / not, abs() min() max()
+#
+# Tidak pakai eval(): AST dicek lalu dikompilasi jadi closure.
+# Operasi NumPy -> hasil sama untuk skalar (compute per saham)
+# maupun array (N,) (analyze_panel semua saham sekaligus).
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+
+_FUNCTIONS = {
+    "abs": np.abs,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+
+def _all(values):
+
+    out = values[0]
+
+    for value in values[1:]:
+        out = np.logical_and(out, value)
+
+    return out
+
+
+def _any(values):
+
+    out = values[0]
+
+    for value in values[1:]:
+        out = np.logical_or(out, value)
+
+    return out
+
+
+def _compile_node(node, source):
+
+    if isinstance(node, ast.Constant):
+
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise RuleError(f"Konstanta tidak didukung di '{source}'")
+
+        value = node.value
+
+        return lambda ns: value
+
+    if isinstance(node, ast.Name):
+
+        name = node.id
+
+        def lookup(ns):
+
+            try:
+                return ns[name]
+            except KeyError:
+                raise RuleError(f"Variabel '{name}' tidak dikenal di '{source}'") from None
+
+        return lookup
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+
+        op = _BINARY[type(node.op)]
+
+        left = _compile_node(node.left, source)
+
+        right = _compile_node(node.right, source)
+
+        return lambda ns: op(left(ns), right(ns))
+
+    if isinstance(node, ast.UnaryOp):
+
+        operand = _compile_node(node.operand, source)
+
+        if isinstance(node.op, ast.Not):
+            return lambda ns: np.logical_not(operand(ns))
+
+        if isinstance(node.op, ast.USub):
+            return lambda ns: -operand(ns)
+
+        if isinstance(node.op, ast.UAdd):
+            return operand
+
+    if isinstance(node, ast.BoolOp):
+
+        parts = [_compile_node(value, source) for value in node.values]
+
+        combine = _all if isinstance(node.op, ast.And) else _any
+
+        return lambda ns: combine([part(ns) for part in parts])
+
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+
+        operands = [_compile_node(node.left, source)] + [
+            _compile_node(comparator, source) for comparator in node.comparators
+        ]
+
+        ops = [_COMPARE[type(op)] for op in node.ops]
+
+        # a <= b <= c -> (a <= b) and (b <= c)
+        def compare(ns):
+
+            values = [operand(ns) for operand in operands]
+
+            return _all([
+                op(values[i], values[i + 1]) for i, op in enumerate(ops)
+            ])
+
+        return compare
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and not node.keywords
+    ):
+
+        fn = _FUNCTIONS[node.func.id]
+
+        args = [_compile_node(arg, source) for arg in node.args]
+
+        if node.func.id == "abs":
+
+            if len(args) != 1:
+                raise RuleError(f"abs() butuh 1 argumen di '{source}'")
+
+            return lambda ns: fn(args[0](ns))
+
+        if len(args) < 2:
+            raise RuleError(f"{node.func.id}() butuh >= 2 argumen di '{source}'")
+
+        def reduce(ns):
+
+            out = args[0](ns)
+
+            for arg in args[1:]:
+                out = fn(out, arg(ns))
+
+            return out
+
+        return reduce
+
+    raise RuleError(
+        f"Sintaks '{ast.dump(node)[:40]}' tidak diizinkan di '{source}'"
+    )
+
+
+def compile_expression(source):
+
+    """String ekspresi rule -> fungsi(namespace) -> bool / array bool."""
+
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise RuleError(f"Ekspresi rule tidak valid '{source}': {e.msg}") from None
+
+    return _compile_node(tree.body, source)
+
+
+def _select(conditions, choices, default):
+
+    """if / elif / else: kondisi pertama yang benar menang."""
+
+    if all(np.ndim(c) == 0 for c in conditions):
+
+        for condition, choice in zip(conditions, choices):
+
+            if condition:
+                return choice
+
+        return default
+
+    shape = np.broadcast_shapes(*(np.shape(c) for c in conditions))
+
+    return np.select(
+        [np.broadcast_to(c, shape) for c in conditions],
+        choices,
+        default
+    )
+
+
+# ======================================================
+# RULE SET (1 SCREENER)
+# ======================================================
+
+class RuleSet:
+
+    """
+    Rule table 1 screener yang sudah dikompilasi:
+
+    - params  : threshold bernama, bisa dipakai di ekspresi
+    - filters : sebelum skor; {"require": expr} harus benar,
+                {"reject": expr} gagal kalau benar
+    - base    : skor awal
+    - groups  : 1 grup = 1 rantai if/elif (label breakdown),
+                poin rule pertama yang cocok, else "default"
+    - clip    : [min, max] skor (opsional)
+    - accept  : filter setelah skor (boleh pakai `score`)
+    """
+
+    def __init__(self, name, spec):
+
+        self.name = name
+
+        self.spec = spec
+
+        self.params = dict(spec.get("params", {}))
+
+        self.base = spec.get("base", 0)
+
+        self.clip = spec.get("clip")
+
+        self.filters = [self._compile_filter(f) for f in spec.get("filters", [])]
+
+        self.accept = [self._compile_filter(f) for f in spec.get("accept", [])]
+
+        self.groups = []
+
+        for group in spec.get("groups", []):
+
+            rules = group.get("rules", [])
+
+            self.groups.append((
+                group["label"],
+                [compile_expression(rule["when"]) for rule in rules],
+                [rule["points"] for rule in rules],
+                group.get("default", 0),
+            ))
+
+        self.fingerprint = hashlib.sha1(
+            json.dumps(spec, sort_keys=True).encode()
+        ).hexdigest()[:12]
+
+    @staticmethod
+    def _compile_filter(spec):
+
+        reason = spec.get("reason", spec.get("require", spec.get("reject")))
+
+        if "require" in spec:
+            return reason, compile_expression(spec["require"]), True
+
+        if "reject" in spec:
+            return reason, compile_expression(spec["reject"]), False
+
+        raise RuleError(f"Filter '{reason}' butuh 'require' atau 'reject'")
+
+    @property
+    def labels(self):
+        return [label for label, *_ in self.groups]
+
+    # ======================================================
+    # EVALUATE
+    # ======================================================
+
+    def namespace(self, features, **extra):
+
+        """Variabel ekspresi: fitur > extra (atribut screener) > params."""
+
+        return ChainMap(features, extra, self.params)
+
+    @staticmethod
+    def _failed(filters, ns):
+
+        out = []
+
+        for reason, expr, required in filters:
+
+            value = expr(ns)
+
+            out.append((reason, np.logical_not(value) if required else value))
+
+        return out
+
+    def reasons(self, ns):
+
+        """Skalar: alasan filter yang gagal ([] = lolos)."""
+
+        return [reason for reason, failed in self._failed(self.filters, ns) if failed]
+
+    def passes(self, ns):
+
+        """Array: mask saham yang lolos semua filter."""
+
+        failed = [mask for _, mask in self._failed(self.filters, ns)]
+
+        return np.logical_not(_any(failed)) if failed else True
+
+    def failures(self, ns):
+
+        """Array: [(alasan, mask gagal)] per filter, urutan sama dengan reasons()."""
+
+        return self._failed(self.filters, ns)
+
+    def score(self, ns):
+
+        """(skor, breakdown {label: poin}), skalar atau array."""
+
+        breakdown = {}
+
+        score = self.base
+
+        for label, conditions, points, default in self.groups:
+
+            value = _select([c(ns) for c in conditions], points, default)
+
+            breakdown[label] = value
+
+            score = score + value
+
+        if self.clip is not None:
+            score = np.clip(score, *self.clip)
+
+        return score, breakdown
+
+    def accepts(self, ns, score):
+
+        """Filter akhir (setelah skor), skalar atau array."""
+
+        if not self.accept:
+            return True
+
+        ns = ns.new_child({"score": score})
+
+        failed = [mask for _, mask in self._failed(self.accept, ns)]
+
+        return np.logical_not(_any(failed))
+
+
+# ======================================================
+# RULE BOOK (DEFAULT + OVERRIDE JSON)
+# ======================================================
+
+def _merge(base, override):
+
+    """
+    Override per screener:
+    - params  : digabung per key
+    - groups  : diganti per label (label baru ditambahkan)
+    - lainnya : diganti utuh
+    """
+
+    merged = copy.deepcopy(base)
+
+    for key, value in override.items():
+
+        if key == "params":
+            merged.setdefault("params", {}).update(value)
+
+        elif key == "groups":
+
+            groups = {g["label"]: g for g in merged.get("groups", [])}
+
+            for group in value:
+                groups[group["label"]] = group
+
+            merged["groups"] = list(groups.values())
+
+        else:
+            merged[key] = value
+
+    return merged
+
+
+class RuleBook:
+
+    """
+    Semua rule table (app.config.scoring_rules) + override JSON.
+    File override berubah -> dikompilasi ulang otomatis.
+    """
+
+    def __init__(self, defaults=SCORING_RULES, path=OVERRIDE_PATH):
+
+        self.defaults = defaults
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        self._compiled = None
+
+        self._mtime = None
+
+    def _load(self):
+
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+
+        if self._compiled is not None and mtime == self._mtime:
+            return self._compiled
+
+        overrides = {}
+
+        if mtime is not None:
+
+            try:
+                with open(self.path) as f:
+                    overrides = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[RULES] override {self.path} diabaikan: {e}")
+
+        compiled = {}
+
+        for name in set(self.defaults) | set(overrides):
+
+            spec = _merge(self.defaults.get(name, {}), overrides.get(name, {}))
+
+            try:
+                compiled[name] = RuleSet(name, spec)
+            except RuleError as e:
+
+                # override rusak -> pakai default, jangan matikan scan
+                print(f"[RULES] {name}: {e}, pakai default")
+
+                if name in self.defaults:
+                    compiled[name] = RuleSet(name, self.defaults[name])
+
+        self._compiled, self._mtime = compiled, mtime
+
+        return compiled
+
+    def get(self, name):
+
+        with self._lock:
+            return self._load()[name]
+
+    def fingerprint(self, name):
+
+        with self._lock:
+
+            rules = self._load().get(name)
+
+            return rules.fingerprint if rules is not None else None
+
+
+# ======================================================
+# SINGLETON
+# ======================================================
+
+RULES = RuleBook()
@@ -0,0 +1,270 @@
+import time
+import asyncio
+import threading
+import contextvars
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.core.scan_report import current_report
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# thread pool compute (scoring pandas, tanpa I/O), dibagi semua scan
+MAX_WORKERS = 11
+
+# spawn: aman untuk proses yang punya banyak thread (Streamlit / bot)
+PROCESS_START_METHOD = "spawn"
+
+
+# ======================================================
+# CONTEXT CALLER -> LOOP RUNTIME
+# ======================================================
+
+def _bind_context(coro):
+
+    """
+    Task di loop runtime dapat contextvars thread loop, bukan caller.
+    Salin punya caller (scan report aktif, mis. dari Streamlit) ke task.
+    """
+
+    ctx = contextvars.copy_context()
+
+    async def bound():
+
+        for var, value in ctx.items():
+            var.set(value)
+
+        return await coro
+
+    return bound()
+
+
+# ======================================================
+# ENGINE RUNTIME
+# ======================================================
+
+class EngineRuntime:
+
+    """
+    Resource jangka panjang untuk semua scan dalam 1 proses:
+
+    - 1 event loop di thread sendiri (tidak ada asyncio.run per klik)
+    - 1 thread pool compute
+    - process pool (dibuat saat pertama dipakai, per jumlah worker)
+
+    Dipakai lewat get_runtime() (singleton), atau sebagai
+    context manager untuk runtime sementara:
+
+        with EngineRuntime() as runtime:
+            runtime.run(coro)
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+
+        self._loop = None
+
+        self._thread = None
+
+        self._executor = None
+
+        self._process_pools = {}
+
+        self.closed = False
+
+    # ======================================================
+    # EVENT LOOP THREAD
+    # ======================================================
+
+    @property
+    def loop(self):
+
+        with self._lock:
+
+            self._check_open()
+
+            if self._loop is None:
+
+                self._loop = asyncio.new_event_loop()
+
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="engine-runtime-loop",
+                    daemon=True
+                )
+
+                self._thread.start()
+
+            return self._loop
+
+    def submit(self, coro):
+
+        """Jadwalkan coroutine di loop runtime -> concurrent Future."""
+
+        return asyncio.run_coroutine_threadsafe(_bind_context(coro), self.loop)
+
+    def run(self, coro):
+
+        """Versi blocking dari submit (pengganti asyncio.run)."""
+
+        loop = self.loop
+
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("runtime.run() tidak boleh dipanggil dari loop runtime")
+
+        return asyncio.run_coroutine_threadsafe(_bind_context(coro), loop).result()
+
+    async def call(self, fn, *args, kode=None):
+
+        """
+        fn(*args) di thread pool runtime (pengganti run_in_executor):
+        contextvars ikut (scan report aktif), waktu antre dicatat
+        sebagai stage "queue".
+        """
+
+        ctx = contextvars.copy_context()
+
+        queued = time.perf_counter()
+
+        def task():
+
+            report = current_report()
+
+            if report is not None:
+                report.add("queue", time.perf_counter() - queued, kode)
+
+            return fn(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            ctx.run,
+            task
+        )
+
+    # ======================================================
+    # POOLS
+    # ======================================================
+
+    @property
+    def executor(self):
+
+        with self._lock:
+
+            self._check_open()
+
+            if self._executor is None:
+
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="engine-compute"
+                )
+
+            return self._executor
+
+    def process_pool(self, workers):
+
+        with self._lock:
+
+            self._check_open()
+
+            pool = self._process_pools.get(workers)
+
+            if pool is None:
+
+                pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context(PROCESS_START_METHOD)
+                )
+
+                self._process_pools[workers] = pool
+
+            return pool
+
+    # ======================================================
+    # LIFECYCLE
+    # ======================================================
+
+    def _check_open(self):
+
+        if self.closed:
+            raise RuntimeError("EngineRuntime sudah di-shutdown")
+
+    def shutdown(self, wait=True):
+
+        with self._lock:
+
+            if self.closed:
+                return
+
+            self.closed = True
+
+            loop, thread = self._loop, self._thread
+
+            executor, pools = self._executor, list(self._process_pools.values())
+
+            self._process_pools.clear()
+
+        if loop is not None:
+
+            loop.call_soon_threadsafe(loop.stop)
+
+            if wait and thread is not threading.current_thread():
+                thread.join()
+
+            if not loop.is_running():
+                loop.close()
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+        for pool in pools:
+            pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+# ======================================================
+# SINGLETON
+# ======================================================
+
+_RUNTIME = None
+
+_RUNTIME_LOCK = threading.Lock()
+
+
+def get_runtime():
+
+    """Runtime bersama 1 proses (dibuat saat pertama dipakai)."""
+
+    global _RUNTIME
+
+    with _RUNTIME_LOCK:
+
+        if _RUNTIME is None or _RUNTIME.closed:
+            _RUNTIME = EngineRuntime()
+
+        return _RUNTIME
+
+
+def shutdown_runtime(wait=True):
+
+    global _RUNTIME
+
+    with _RUNTIME_LOCK:
+
+        runtime, _RUNTIME = _RUNTIME, None
+
+    if runtime is not None:
+        runtime.shutdown(wait=wait)
@@ -0,0 +1,358 @@
+import time
+import logging
+import threading
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# report scan ditulis ke log bot (juga dari Streamlit)
+LOG_PATH = "bot.log"
+
+SLOWEST_TICKERS = 5
+
+# urutan tampil + stage yang termasuk di dalam stage lain
+# (tidak dijumlah 2x untuk total per ticker)
+STAGES = ("queue", "fetch", "normalize", "compute", "indicators", "scoring", "render")
+
+SUB_STAGES = {"normalize", "indicators", "scoring"}
+
+logger = logging.getLogger("scan_report")
+
+
+def _ensure_handler():
+
+    # bot.py sudah set root logger ke bot.log; proses lain (Streamlit) belum
+    if logger.handlers or logging.getLogger().handlers:
+        return
+
+    handler = logging.FileHandler(LOG_PATH)
+
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s | %(levelname)s | %(message)s")
+    )
+
+    logger.addHandler(handler)
+
+    logger.setLevel(logging.INFO)
+
+
+# ======================================================
+# REPORT
+# ======================================================
+
+class ScanReport:
+
+    """
+    Timing per ticker per stage untuk 1 scan:
+
+    - queue      : nunggu slot fetch / thread pool
+    - fetch      : load data (store / network)
+    - normalize  : frame mentah -> OHLCV kanonik (bagian dari fetch)
+    - compute    : screener compute / analyze_panel
+    - indicators : hitung indikator (bagian dari compute, kalau dicatat)
+    - scoring    : skor + filter (bagian dari compute, kalau dicatat)
+    - render     : tabel hasil / alert / UI
+
+    + bytes network, retry, gagal, ticker paling lambat.
+    """
+
+    def __init__(self, name):
+
+        self.name = name
+
+        self.started = time.time()
+
+        self.elapsed = None
+
+        self._lock = threading.Lock()
+
+        self._timings = defaultdict(list)
+
+        self.bytes = 0
+
+        self.counters = defaultdict(int)
+
+        self.tickers = 0
+
+        # ScanCoverage (app.core.coverage), diisi scan yang mencatat
+        self.coverage = None
+
+    # ======================================================
+    # RECORD
+    # ======================================================
+
+    def add(self, stage, seconds, kode=None):
+
+        with self._lock:
+            self._timings[stage].append((kode, seconds))
+
+    def add_bytes(self, n):
+
+        with self._lock:
+            self.bytes += n
+
+    def count(self, name, n=1):
+
+        with self._lock:
+            self.counters[name] += n
+
+    def finish(self, tickers=None):
+
+        self.elapsed = time.time() - self.started
+
+        if tickers is not None:
+            self.tickers = tickers
+
+        return self
+
+    # ======================================================
+    # SUMMARY
+    # ======================================================
+
+    def summary(self):
+
+        """DataFrame 1 baris per stage (ms)."""
+
+        rows = []
+
+        with self._lock:
+            timings = {name: list(v) for name, v in self._timings.items()}
+
+        ordered = [name for name in STAGES if name in timings]
+        ordered += sorted(name for name in timings if name not in STAGES)
+
+        for name in ordered:
+
+            seconds = np.array([s for _, s in timings[name]]) * 1000
+
+            rows.append({
+                "Stage": name,
+                "Count": len(seconds),
+                "Total (s)": round(seconds.sum() / 1000, 2),
+                "p50 (ms)": round(float(np.percentile(seconds, 50)), 1),
+                "p95 (ms)": round(float(np.percentile(seconds, 95)), 1),
+                "Max (ms)": round(float(seconds.max()), 1),
+            })
+
+        return pd.DataFrame(
+            rows,
+            columns=["Stage", "Count", "Total (s)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+        )
+
+    def slowest(self, n=SLOWEST_TICKERS):
+
+        """[(kode, total detik, stage terlama)] untuk n ticker terlama."""
+
+        per_ticker = defaultdict(dict)
+
+        with self._lock:
+
+            for name, items in self._timings.items():
+
+                if name in SUB_STAGES:
+                    continue
+
+                for kode, seconds in items:
+
+                    if kode is None:
+                        continue
+
+                    per_ticker[kode][name] = per_ticker[kode].get(name, 0) + seconds
+
+        ranked = sorted(
+            per_ticker.items(),
+            key=lambda item: sum(item[1].values()),
+            reverse=True
+        )
+
+        return [
+            (kode, sum(stages.values()), max(stages, key=stages.get))
+            for kode, stages in ranked[:n]
+        ]
+
+    # ======================================================
+    # OUTPUT
+    # ======================================================
+
+    def lines(self):
+
+        elapsed = self.elapsed if self.elapsed is not None else time.time() - self.started
+
+        out = [
+            f"[SCAN REPORT] {self.name} | {self.tickers} ticker | "
+            f"{elapsed:.1f}s | {self.bytes / 1e6:.1f} MB | "
+            f"retry {self.counters['retries']} | "
+            f"gagal {self.counters['failures']}"
+        ]
+
+        if self.coverage is not None:
+            out[0] += f" | coverage {self.coverage}"
+
+        # FeatureStore (app.core.features): indikator dihitung vs dipakai ulang
+        computed = self.counters.get("features_computed", 0)
+
+        reused = self.counters.get("features_reused", 0)
+
+        streamed = self.counters.get("features_streamed", 0)
+
+        if computed or reused or streamed:
+            out[0] += f" | fitur hitung {computed} reuse {reused} stream {streamed}"
+
+        for row in self.summary().itertuples(index=False):
+
+            out.append(
+                f"  {row[0]:<10} n={row[1]:<5} total {row[2]:>7.2f}s | "
+                f"p50 {row[3]:>8.1f}ms | p95 {row[4]:>8.1f}ms | max {row[5]:>8.1f}ms"
+            )
+
+        slow = self.slowest()
+
+        if slow:
+            out.append(
+                "  slowest: " + ", ".join(
+                    f"{kode} {seconds:.2f}s ({name})"
+                    for kode, seconds, name in slow
+                )
+            )
+
+        return out
+
+    def log(self):
+
+        _ensure_handler()
+
+        for line in self.lines():
+
+            print(line)
+
+            logger.info(line)
+
+
+# ======================================================
+# ACTIVE REPORT (CONTEXTVAR)
+# ======================================================
+
+_CURRENT = ContextVar("scan_report", default=None)
+
+# report terakhir per nama scan (untuk UI)
+LAST_REPORTS = {}
+
+
+def current_report():
+
+    return _CURRENT.get()
+
+
+@contextmanager
+def scan_report(name, log=True):
+
+    """
+    Aktifkan report untuk 1 scan. Task asyncio & pemanggilan
+    runtime.call() di dalamnya ikut mencatat ke report ini.
+
+    Kalau sudah ada report aktif (mis. UI yang masih render tabel
+    sesudah scan), scan di dalamnya mencatat ke report luar itu;
+    report luar yang log 1x di akhir.
+    """
+
+    outer = _CURRENT.get()
+
+    if outer is not None:
+        yield outer
+        return
+
+    report = ScanReport(name)
+
+    token = _CURRENT.set(report)
+
+    try:
+        yield report
+
+    finally:
+
+        try:
+            _CURRENT.reset(token)
+        except ValueError:
+            # async generator ditutup dari context lain
+            pass
+
+        report.finish()
+
+        LAST_REPORTS[name] = report
+
+        if log:
+            report.log()
+
+
+def last_report(name):
+
+    return LAST_REPORTS.get(name)
+
+
+# ======================================================
+# HELPERS (NO-OP KALAU TIDAK ADA REPORT AKTIF)
+# ======================================================
+
+@contextmanager
+def stage(name, kode=None):
+
+    report = _CURRENT.get()
+
+    if report is None:
+        yield
+        return
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        report.add(name, time.perf_counter() - start, kode)
+
+
+def stage_timer(kode=None):
+
+    """
+    lap = stage_timer(kode); ...; lap("fetch"); ...; lap("scoring")
+    -> tiap lap() mencatat waktu sejak lap sebelumnya.
+    """
+
+    report = _CURRENT.get()
+
+    last = [time.perf_counter()]
+
+    def lap(name):
+
+        now = time.perf_counter()
+
+        if report is not None:
+            report.add(name, now - last[0], kode)
+
+        last[0] = now
+
+    return lap
+
+
+def add_bytes(n):
+
+    report = _CURRENT.get()
+
+    if report is not None:
+        report.add_bytes(n)
+
+
+def count(name, n=1):
+
+    report = _CURRENT.get()
+
+    if report is not None:
+        report.count(name, n)
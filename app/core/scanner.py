@@ -1,43 +1,31 @@
 import logging
-import asyncio
 
 from datetime import datetime
 
-import pandas as pd
-
-from concurrent.futures import ThreadPoolExecutor
-
-from app.services.data import get_price_data
+from app.core.features import FEATURE_STORE
+# SAHAM_LIST / rank_table tetap bisa diimport dari sini (sharding)
+from app.core.intraday import (
+    PIPELINE,
+    SAHAM_LIST,
+    TOP_RESULTS,
+    IntradayStrategy,
+    fetch_frame,
+    rank_table,
+    register_strategy
+)
+from app.core.runtime import get_runtime
+from app.core.scan_report import count, stage_timer
 from app.services.logic import detect_day_trade, detect_market_mover
 from app.services.telegram_bot import send_message
 
 from zoneinfo import ZoneInfo
 
-# ======================================================
-# HOT LIST PRIORITY
-# ======================================================
-
-try:
-
-    from app.config.hot_saham_list import HOT_SAHAM_LIST as SAHAM_LIST
-
-    print("🔥 USING HOT_SAHAM_LIST")
-
-except:
-
-    from app.config.saham_list import SAHAM_LIST
-
-    print("📦 USING FULL SAHAM_LIST")
-
 # ======================================================
 # CONFIG
 # ======================================================
 
-MAX_WORKERS = 9
-
-executor = ThreadPoolExecutor(
-    max_workers=MAX_WORKERS
-)
+# rata-rata volume per bar 15m minimal
+MIN_AVG_VOLUME = 300_000
 
 # ======================================================
 # PROCESS SINGLE TICKER
@@ -45,7 +33,8 @@ executor = ThreadPoolExecutor(
 
 def process_ticker_sync(
     ticker,
-    state
+    state,
+    df=None
 ):
 
     results = []
@@ -58,38 +47,19 @@ def process_ticker_sync(
 
     movers = 0
 
+    lap = stage_timer(ticker)
+
     try:
 
         # ======================================================
-        # RETRY FETCH DATA
+        # FETCH DATA (KALAU TIDAK DARI PIPELINE / PREFETCH)
         # ======================================================
 
-        MAX_RETRY = 2
-
-        RETRY_DELAY = 0.7
-
-        df = None
-
-        for attempt in range(MAX_RETRY):
-
-            try:
-
-                df = get_price_data(ticker)
-
-                if df is not None and not df.empty:
-
-                    break
-
-            except Exception as e:
-
-                logging.warning(
-
-                    f"[RETRY {attempt+1}/{MAX_RETRY}] "
-                    f"{ticker}: {e}"
+        if df is None or df.empty:
 
-                )
+            df = fetch_frame(ticker)
 
-            time.sleep(RETRY_DELAY)
+        lap("fetch")
 
         # ======================================================
         # FAILED FETCH
@@ -97,21 +67,20 @@ def process_ticker_sync(
 
         if df is None or df.empty:
 
+            count("failures")
+
+            # bukan "tidak ada sinyal" -> di-queue ulang (second pass)
             return {
 
                 "results": [],
 
                 "alerts": [],
 
-                "movers": 0
+                "movers": 0,
 
-            }
+                "failed": True
 
-
-        df.columns = [
-            str(c).upper()
-            for c in df.columns
-        ]
+            }
 
         # ================= BASIC DATA =================
 
@@ -123,7 +92,10 @@ def process_ticker_sync(
 
         vol = df["VOLUME"]
 
-        avg_vol = vol.rolling(20).mean().iloc[-1]
+        # indikator dipakai bersama dengan detect_day_trade (1x hitung)
+        features = FEATURE_STORE.frame(df, ticker, "15m")
+
+        avg_vol = features.last("vol_ma20")
 
         vol_ratio = (
             vol.iloc[-1] / avg_vol
@@ -132,7 +104,7 @@ def process_ticker_sync(
 
         # 🔥 filter liquidity
 
-        if avg_vol < 300_000:
+        if avg_vol < MIN_AVG_VOLUME:
 
             return {
                 "results": [],
@@ -163,7 +135,9 @@ def process_ticker_sync(
 
         # ================= MAIN LOGIC =================
 
-        data = detect_day_trade(df)
+        data = detect_day_trade(df, features)
+
+        lap("indicators")
 
         if not data:
 
@@ -189,9 +163,9 @@ def process_ticker_sync(
 
             low_series = df["LOW"]
 
-            ma20 = close_series.rolling(20).mean().iloc[-1]
+            ma20 = features.last("ma20")
 
-            ma50 = close_series.rolling(50).mean().iloc[-1]
+            ma50 = features.last("ma50")
 
             close_now = close_series.iloc[-1]
 
@@ -200,9 +174,9 @@ def process_ticker_sync(
                 / ma20
             ) if ma20 else 0
 
-            high_5d = high_series.tail(5).max()
+            high_5d = features.high(5)
 
-            low_5d = low_series.tail(5).min()
+            low_5d = features.low(5)
 
             range_pct = (
                 (high_5d - low_5d)
@@ -321,6 +295,8 @@ def process_ticker_sync(
                 f"{vol_ratio:.2f}"
             )
 
+        lap("scoring")
+
         # ================= ALERT TYPE =================
 
         alert_type = None
@@ -418,6 +394,8 @@ def process_ticker_sync(
 
             alerted[key] = True
 
+        lap("render")
+
         # ================= SAVE STATUS =================
 
         last_status[ticker] = status
@@ -467,37 +445,22 @@ def process_ticker_sync(
         }
 
 # ======================================================
-# ASYNC WRAPPER
+# STRATEGY (PIPELINE INTRADAY BERSAMA)
 # ======================================================
 
-async def process_ticker(
-    ticker,
-    state
-):
-
-    loop = asyncio.get_running_loop()
-
-    return await loop.run_in_executor(
-
-        executor,
+class DayTradeStrategy(IntradayStrategy):
 
-        process_ticker_sync,
+    name = "day"
 
-        ticker,
+    label = "SCAN"
 
-        state
+    min_avg_volume = MIN_AVG_VOLUME
 
-    )
-
-# ======================================================
-# MAIN ASYNC SCAN
-# ======================================================
+    totals = ("movers",)
 
-async def scan_day_async(state=None):
+    def new_state(self):
 
-    if state is None:
-
-        state = {
+        return {
 
             "alerted": {},
 
@@ -505,91 +468,51 @@ async def scan_day_async(state=None):
 
         }
 
-    scanned = len(SAHAM_LIST)
-
-    # ======================================================
-    # TASKS
-    # ======================================================
-
-    tasks = [
-
-        process_ticker(
-            ticker,
-            state
-        )
-
-        for ticker in SAHAM_LIST
-
-    ]
-
-    outputs = await asyncio.gather(*tasks)
+    def process(self, ticker, df, state):
 
-    # ======================================================
-    # MERGE RESULTS
-    # ======================================================
+        return process_ticker_sync(ticker, state, df)
 
-    results = []
-
-    alerts = []
-
-    movers = 0
+    def log(self, summary):
 
-    for out in outputs:
+        super().log(summary)
 
-        results.extend(
-            out.get("results", [])
-        )
+        logging.info(
 
-        alerts.extend(
-            out.get("alerts", [])
-        )
+            f"Scan {summary['scanned']} saham | "
+            f"Coverage {summary['coverage']} | "
+            f"Karantina {summary['skipped']} | "
+            f"Illiquid {summary['illiquid']} | "
+            f"Movers {summary['movers']} | "
+            f"Alert {summary['alerts']}"
 
-        movers += out.get(
-            "movers",
-            0
         )
 
-    # ======================================================
-    # DATAFRAME
-    # ======================================================
-
-    df = pd.DataFrame(results)
-
-    if not df.empty:
-
-        df = df.sort_values(
-            by=["Score"],
-            ascending=False
-        ).reset_index(drop=True)
 
-        df.index = df.index + 1
+DAY_TRADE = register_strategy(DayTradeStrategy())
 
-        df = df.head(15)
-
-    print(f"\nSCAN: {scanned}")
-
-    print(f"MOVERS: {movers}")
-
-    print(f"RESULT: {len(results)}")
-
-    print(f"ALERT: {len(alerts)}\n")
-
-    logging.info(
+# ======================================================
+# MAIN ASYNC SCAN
+# ======================================================
 
-        f"Scan {scanned} saham | "
-        f"Movers {movers} | "
-        f"Alert {len(alerts)}"
+async def scan_day_async(state=None, prefetch=True, universe=None):
 
+    # fetch, second pass & report lewat pipeline bersama (app.core.intraday)
+    scans = await PIPELINE.run_async(
+        [DAY_TRADE],
+        {DAY_TRADE.name: state},
+        prefetch,
+        universe
     )
 
-    return df, alerts, state
+    return scans[DAY_TRADE.name]
 
 # ======================================================
 # PUBLIC FUNCTION
 # ======================================================
 
-def scan_day(state=None):
+def scan_day(state=None, prefetch=True, universe=None):
 
-    return asyncio.run(
-        scan_day_async(state)
-    )
\ No newline at end of file
+    # loop + thread pool jangka panjang (tidak dibuat per scan)
+    return get_runtime().run(
+        scan_day_async(state, prefetch, universe)
+    )
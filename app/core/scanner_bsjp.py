@@ -1,42 +1,28 @@
 import logging
-import asyncio
 
 from datetime import datetime
 
-import pandas as pd
-
-from concurrent.futures import ThreadPoolExecutor
-
-from app.services.data import get_price_data
+from app.core.ohlcv import as_ohlcv
+from app.core.features import FEATURE_STORE
+from app.core.intraday import (
+    PIPELINE,
+    SAHAM_LIST,
+    IntradayStrategy,
+    fetch_frame,
+    register_strategy
+)
+from app.core.runtime import get_runtime
+from app.core.scan_report import count, stage_timer
 from app.services.telegram_bot import send_message
 
 from zoneinfo import ZoneInfo
 
-# ======================================================
-# HOT LIST PRIORITY
-# ======================================================
-
-try:
-
-    from app.config.hot_saham_list import HOT_SAHAM_LIST as SAHAM_LIST
-
-    print("🔥 USING HOT_SAHAM_LIST")
-
-except:
-
-    from app.config.saham_list import SAHAM_LIST
-
-    print("📦 USING FULL SAHAM_LIST")
-
 # ==========================================================
 # CONFIG
 # ==========================================================
 
-MAX_WORKERS = 9
-
-executor = ThreadPoolExecutor(
-    max_workers=MAX_WORKERS
-)
+# rata-rata volume per bar 15m minimal
+MIN_AVG_VOLUME = 200_000
 
 # ==========================================================
 # PROCESS SINGLE TICKER
@@ -44,7 +30,8 @@ executor = ThreadPoolExecutor(
 
 def process_bsjp_ticker_sync(
     ticker,
-    state
+    state,
+    df=None
 ):
 
     results = []
@@ -56,38 +43,19 @@ def process_bsjp_ticker_sync(
         {}
     )
 
+    lap = stage_timer(ticker)
+
     try:
 
         # ==========================================================
-        # RETRY FETCH DATA
+        # FETCH DATA (KALAU TIDAK DARI PIPELINE / PREFETCH)
         # ==========================================================
 
-        MAX_RETRY = 2
-
-        RETRY_DELAY = 0.7
-
-        df = None
-
-        for attempt in range(MAX_RETRY):
-
-            try:
-
-                df = get_price_data(ticker)
-
-                if df is not None and not df.empty:
-
-                    break
-
-            except Exception as e:
-
-                logging.warning(
-
-                    f"[RETRY {attempt+1}/{MAX_RETRY}] "
-                    f"{ticker}: {e}"
+        if df is None or df.empty:
 
-                )
+            df = fetch_frame(ticker)
 
-            time.sleep(RETRY_DELAY)
+        lap("fetch")
 
         # ==========================================================
         # FAILED FETCH
@@ -95,21 +63,18 @@ def process_bsjp_ticker_sync(
 
         if df is None or df.empty:
 
+            count("failures")
+
+            # bukan "tidak ada sinyal" -> di-queue ulang (second pass)
             return {
 
                 "results": [],
 
-                "alerts": []
-
-            }
-
-        df.columns = [
-
-            str(c).upper()
+                "alerts": [],
 
-            for c in df.columns
+                "failed": True
 
-        ]
+            }
 
         # ==========================================================
         # 🔥 AMBIL DATA HARI INI SAJA
@@ -160,17 +125,9 @@ def process_bsjp_ticker_sync(
 
         day_vol = df_today["VOLUME"].sum()
 
-        avg_vol = (
-
-            df["VOLUME"]
-
-            .rolling(20)
+        features = FEATURE_STORE.frame(df, ticker, "15m")
 
-            .mean()
-
-            .iloc[-1]
-
-        )
+        avg_vol = features.last("vol_ma20")
 
         vol_ratio = (
 
@@ -180,7 +137,7 @@ def process_bsjp_ticker_sync(
 
         )
 
-        if avg_vol < 200_000:
+        if avg_vol < MIN_AVG_VOLUME:
 
             return {
 
@@ -192,29 +149,9 @@ def process_bsjp_ticker_sync(
 
         # ================= MA =================
 
-        ma5 = (
-
-            df["CLOSE"]
-
-            .rolling(5)
-
-            .mean()
-
-            .iloc[-1]
-
-        )
-
-        ma20 = (
-
-            df["CLOSE"]
-
-            .rolling(20)
+        ma5 = features.last("ma5")
 
-            .mean()
-
-            .iloc[-1]
-
-        )
+        ma20 = features.last("ma20")
 
         # ==========================================================
         # 🔥 FILTER
@@ -247,6 +184,8 @@ def process_bsjp_ticker_sync(
 
             }
 
+        lap("indicators")
+
         # ==========================================================
         # 🔥 SCORING
         # ==========================================================
@@ -336,6 +275,8 @@ def process_bsjp_ticker_sync(
 
         )
 
+        lap("scoring")
+
         # ================= SAVE =================
         if score >= 50:
             results.append({
@@ -411,6 +352,8 @@ def process_bsjp_ticker_sync(
 
             alerted[key] = True
 
+        lap("render")
+
         return {
 
             "results": results,
@@ -434,112 +377,49 @@ def process_bsjp_ticker_sync(
         }
 
 # ==========================================================
-# ASYNC WRAPPER
+# STRATEGY (PIPELINE INTRADAY BERSAMA)
 # ==========================================================
 
-async def process_bsjp_ticker(
-    ticker,
-    state
-):
+class BsjpStrategy(IntradayStrategy):
 
-    loop = asyncio.get_running_loop()
+    name = "bsjp"
 
-    return await loop.run_in_executor(
+    label = "BSJP SCAN"
 
-        executor,
+    min_avg_volume = MIN_AVG_VOLUME
 
-        process_bsjp_ticker_sync,
+    def process(self, ticker, df, state):
 
-        ticker,
+        return process_bsjp_ticker_sync(ticker, state, df)
 
-        state
 
-    )
+BSJP = register_strategy(BsjpStrategy())
 
 # ==========================================================
 # MAIN ASYNC SCAN
 # ==========================================================
 
-async def scan_bsjp_async(state=None):
-
-    if state is None:
-
-        state = {
-
-            "alerted": {}
-
-        }
-
-    scanned = len(SAHAM_LIST)
-
-    results = []
-
-    alerts = []
-
-    # ==========================================================
-    # TASKS
-    # ==========================================================
-
-    tasks = [
-
-        process_bsjp_ticker(
-            ticker,
-            state
-        )
-
-        for ticker in SAHAM_LIST
+async def scan_bsjp_async(state=None, prefetch=True, universe=None):
 
-    ]
-
-    outputs = await asyncio.gather(
-        *tasks
+    # fetch, second pass & report lewat pipeline bersama (app.core.intraday)
+    scans = await PIPELINE.run_async(
+        [BSJP],
+        {BSJP.name: state},
+        prefetch,
+        universe
     )
 
-    # ==========================================================
-    # MERGE RESULTS
-    # ==========================================================
-
-    for out in outputs:
-
-        results.extend(
-            out.get("results", [])
-        )
-
-        alerts.extend(
-            out.get("alerts", [])
-        )
-
-    # ================= OUTPUT =================
-
-    df = pd.DataFrame(results)
-
-    if not df.empty:
-
-        df = df.sort_values(
-            by=["Score"],
-            ascending=False
-        ).reset_index(drop=True)
-
-        df.index = df.index + 1
-
-        df = df.head(15)
-
-    print(f"\nBSJP SCAN: {scanned}")
-
-    print(f"RESULT: {len(results)}")
-
-    print(f"ALERT: {len(alerts)}\n")
-
-    return df, alerts, state
+    return scans[BSJP.name]
 
 # ==========================================================
 # PUBLIC FUNCTION
 # ==========================================================
 
-def scan_bsjp(state=None):
+def scan_bsjp(state=None, prefetch=True, universe=None):
 
-    return asyncio.run(
-        scan_bsjp_async(state)
+    # loop + thread pool jangka panjang (tidak dibuat per scan)
+    return get_runtime().run(
+        scan_bsjp_async(state, prefetch, universe)
     )
 
 # ==========================================================
@@ -558,33 +438,25 @@ def calculate_bsjp_score(df):
         # VALIDATION
         # ======================================================
 
+        # frame kanonik dari loader -> tanpa copy
+        df = as_ohlcv(df)
+
         if df is None or len(df) < 30:
             return 0
 
-        # ======================================================
-        # NORMALIZE COLUMN
-        # ======================================================
-
-        df = df.copy()
-
-        df.columns = [
-            str(c).strip().lower()
-            for c in df.columns
-        ]
-
         # ======================================================
         # DATA
         # ======================================================
 
-        close = df["close"]
+        close = df["CLOSE"]
 
-        open_price = df["open"]
+        open_price = df["OPEN"]
 
-        high = df["high"]
+        high = df["HIGH"]
 
-        low = df["low"]
+        low = df["LOW"]
 
-        volume = df["volume"]
+        volume = df["VOLUME"]
 
         # ======================================================
         # LAST VALUE
@@ -604,9 +476,9 @@ def calculate_bsjp_score(df):
         # MOVING AVERAGE
         # ======================================================
 
-        ma5 = close.rolling(5).mean()
+        features = FEATURE_STORE.frame(df)
 
-        ma20 = close.rolling(20).mean()
+        ma5, ma20 = features.get("ma5", "ma20")
 
         ma5_last = float(ma5.iloc[-1])
 
@@ -616,7 +488,7 @@ def calculate_bsjp_score(df):
         # VOLUME
         # ======================================================
 
-        vol_ma20 = volume.rolling(20).mean()
+        vol_ma20 = features["vol_ma20"]
 
         vol_ma20_last = float(
             vol_ma20.iloc[-1]
@@ -631,7 +503,7 @@ def calculate_bsjp_score(df):
         # RESISTANCE
         # ======================================================
 
-        resistance = high.tail(20).max()
+        resistance = features.high(20)
 
         breakout_distance = (
             (resistance - last_close)
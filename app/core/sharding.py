@@ -0,0 +1,663 @@
+import os
+import sys
+import time
+import uuid
+import queue
+import socket
+import argparse
+import ipaddress
+import multiprocessing
+
+from multiprocessing.managers import BaseManager
+
+import pandas as pd
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# alamat broker; worker beda host -> coordinator bind "0.0.0.0"
+# (WAJIB set SHARD_AUTHKEY: broker pakai pickle, key = akses eksekusi kode)
+BROKER_HOST = os.getenv("SHARD_HOST", "127.0.0.1")
+
+BROKER_PORT = int(os.getenv("SHARD_PORT", "50550"))
+
+# key bawaan cuma boleh untuk broker loopback (1 host)
+DEFAULT_AUTHKEY = b"cruzer-screener"
+
+BROKER_AUTHKEY = os.getenv("SHARD_AUTHKEY", "").encode() or DEFAULT_AUTHKEY
+
+# jumlah saham per shard (1 shard = 1 task di queue)
+SHARD_SIZE = 100
+
+# shard gagal (worker error / mati / kelamaan) dikirim ulang maks N kali
+MAX_SHARD_ATTEMPTS = 2
+
+# shard yang sudah diambil worker tapi belum kembali dalam N detik
+# dianggap hilang (worker host lain mati / hang) -> dikirim ulang
+SHARD_TIMEOUT = 120
+
+# batas tunggu 1 job (semua shard) dalam detik
+JOB_TIMEOUT = 15 * 60
+
+# interval cek worker mati / shard kelamaan selama menunggu hasil
+POLL_INTERVAL = 1.0
+
+# worker lokal pakai spawn (aman untuk proses dengan banyak thread)
+WORKER_START_METHOD = "spawn"
+
+
+# ======================================================
+# BROKER (QUEUE LOKAL VIA MULTIPROCESSING MANAGER)
+# ======================================================
+
+_TASKS = queue.Queue()
+
+_RESULTS = queue.Queue()
+
+
+def _tasks():
+    return _TASKS
+
+
+def _results():
+    return _RESULTS
+
+
+class ShardBroker(BaseManager):
+
+    """
+    Server queue TCP tanpa service luar:
+    - tasks   : shard yang menunggu dikerjakan
+    - results : hasil parsial dari worker
+
+    Coordinator start() broker, worker (proses / host lain) connect().
+    """
+
+
+ShardBroker.register("tasks", callable=_tasks)
+
+ShardBroker.register("results", callable=_results)
+
+
+def _address(host=None, port=None):
+
+    return (host or BROKER_HOST, port or BROKER_PORT)
+
+
+def _is_loopback(host):
+
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# ======================================================
+# SHARD
+# ======================================================
+
+def split_shards(codes, shard_size=SHARD_SIZE):
+
+    codes = list(dict.fromkeys(codes))
+
+    return [
+        codes[i:i + shard_size]
+        for i in range(0, len(codes), shard_size)
+    ]
+
+
+def _execute(task, engine):
+
+    """1 shard -> hasil parsial (jalan di worker)."""
+
+    kind = task["kind"]
+
+    if kind == "engine":
+
+        return engine.run(
+            task["codes"],
+            task["screener_type"],
+            task["prefetch"]
+        )
+
+    if kind == "day":
+
+        from app.core.scanner import scan_day
+
+        return scan_day(task["state"], task["prefetch"], task["codes"])
+
+    if kind == "bsjp":
+
+        from app.core.scanner_bsjp import scan_bsjp
+
+        return scan_bsjp(task["state"], task["prefetch"], task["codes"])
+
+    raise ValueError(f"Jenis shard '{kind}' tidak dikenal")
+
+
+# ======================================================
+# WORKER
+# ======================================================
+
+def run_worker(host=None, port=None, authkey=BROKER_AUTHKEY, name=None, execute=_execute):
+
+    """
+    Loop worker: ambil shard dari broker, scan, kirim hasil.
+    Berhenti kalau dapat None (stop) atau broker mati.
+
+    Tiap shard yang diambil dilapor dulu ("claim") supaya coordinator
+    tahu shard mana yang hilang kalau worker ini mati.
+    execute(task, engine) -> payload (default _execute).
+    """
+
+    # import berat di sini: proses broker (spawn) cuma butuh queue
+    from app.core.engine import ScreenerEngine
+    from app.core.runtime import shutdown_runtime
+
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+
+    broker = ShardBroker(address=_address(host, port), authkey=authkey)
+
+    broker.connect()
+
+    tasks, results = broker.tasks(), broker.results()
+
+    engine = ScreenerEngine()
+
+    print(f"🧩 WORKER {name} siap")
+
+    try:
+
+        while True:
+
+            try:
+                task = tasks.get()
+            except (EOFError, OSError):
+                # coordinator berhenti
+                break
+
+            if task is None:
+                break
+
+            started = time.time()
+
+            try:
+
+                results.put({
+                    "job": task["job"],
+                    "shard": task["shard"],
+                    "worker": name,
+                    "claim": True,
+                })
+
+            except (EOFError, OSError):
+                break
+
+            try:
+
+                payload = execute(task, engine)
+
+                ok = True
+
+            except Exception as e:
+
+                print(f"[SHARD FAILED] {task['shard']}: {e}")
+
+                payload, ok = repr(e), False
+
+            try:
+
+                results.put({
+                    "job": task["job"],
+                    "shard": task["shard"],
+                    "worker": name,
+                    "ok": ok,
+                    "payload": payload,
+                    "seconds": time.time() - started,
+                })
+
+            except (EOFError, OSError):
+                break
+
+    finally:
+        shutdown_runtime()
+
+    print(f"🧩 WORKER {name} berhenti")
+
+
+# ======================================================
+# COORDINATOR
+# ======================================================
+
+class ShardCoordinator:
+
+    """
+    Bagi universe jadi shard, kirim lewat broker ke N worker,
+    gabung + ranking ulang hasil parsial.
+
+        with ShardCoordinator(local_workers=4) as coordinator:
+            results = coordinator.run(SAHAM_LIST, "swing_trade_week")
+            df, alerts, state = coordinator.scan_day(state)
+
+    local_workers = 0 -> worker dijalankan terpisah
+    (python -m app.core.sharding worker --host ... --port ...).
+
+    Shard yang hilang (worker lokal mati, atau tidak kembali dalam
+    SHARD_TIMEOUT) dikirim ulang; worker lokal yang mati diganti.
+    """
+
+    def __init__(
+        self,
+        host=None,
+        port=None,
+        authkey=BROKER_AUTHKEY,
+        local_workers=0,
+        shard_size=SHARD_SIZE,
+        execute=_execute
+    ):
+
+        self.address = _address(host, port)
+
+        self.authkey = authkey
+
+        self.local_workers = local_workers
+
+        self.shard_size = shard_size
+
+        self.execute = execute
+
+        self._broker = None
+
+        # nama worker lokal -> Process
+        self._workers = {}
+
+    # ======================================================
+    # LIFECYCLE
+    # ======================================================
+
+    def start(self):
+
+        if self._broker is not None:
+            return self
+
+        # BaseManager = pickle: key publik + port terbuka = remote code execution
+        if not _is_loopback(self.address[0]) and self.authkey == DEFAULT_AUTHKEY:
+
+            raise RuntimeError(
+                f"Broker {self.address[0]} bukan loopback: "
+                f"set SHARD_AUTHKEY (rahasia) dulu"
+            )
+
+        ctx = multiprocessing.get_context(WORKER_START_METHOD)
+
+        self._ctx = ctx
+
+        self._broker = ShardBroker(
+            address=self.address,
+            authkey=self.authkey,
+            ctx=ctx
+        )
+
+        self._broker.start()
+
+        self._tasks = self._broker.tasks()
+
+        self._results = self._broker.results()
+
+        for i in range(self.local_workers):
+            self._spawn(f"local-{i + 1}")
+
+        print(
+            f"🧩 BROKER {self.address[0]}:{self.address[1]} | "
+            f"worker lokal {self.local_workers}"
+        )
+
+        return self
+
+    def close(self):
+
+        if self._broker is None:
+            return
+
+        self._drain()
+
+        for _ in self._workers:
+            self._tasks.put(None)
+
+        for worker in self._workers.values():
+
+            worker.join(timeout=30)
+
+            if worker.is_alive():
+                worker.terminate()
+
+        self._workers = {}
+
+        self._broker.shutdown()
+
+        self._broker = None
+
+    def _spawn(self, name):
+
+        # worker lokal connect ke host lokal walau broker bind 0.0.0.0
+        host = "127.0.0.1" if self.address[0] == "0.0.0.0" else self.address[0]
+
+        worker = self._ctx.Process(
+            target=run_worker,
+            args=(host, self.address[1], self.authkey, name, self.execute)
+        )
+
+        worker.start()
+
+        self._workers[name] = worker
+
+    def _reap(self):
+
+        """Nama worker lokal yang mati (langsung diganti proses baru)."""
+
+        dead = [name for name, worker in self._workers.items() if not worker.is_alive()]
+
+        for name in dead:
+
+            print(
+                f"[WORKER MATI] {name} "
+                f"(exit {self._workers[name].exitcode}), diganti"
+            )
+
+            self._spawn(name)
+
+        return set(dead)
+
+    def _drain(self):
+
+        """Buang task job lama (timeout) yang belum diambil worker."""
+
+        dropped = 0
+
+        while True:
+
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+
+            if task is None:
+                self._tasks.put(None)
+                break
+
+            dropped += 1
+
+        return dropped
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ======================================================
+    # DISPATCH
+    # ======================================================
+
+    def _dispatch(self, kind, codes, **params):
+
+        """Kirim semua shard 1 job, tunggu hasil -> list payload urut shard."""
+
+        self.start()
+
+        job = uuid.uuid4().hex
+
+        shards = split_shards(codes, self.shard_size)
+
+        tasks = {
+
+            i: {"job": job, "shard": i, "kind": kind, "codes": shard, **params}
+            for i, shard in enumerate(shards)
+
+        }
+
+        # sisa job sebelumnya (timeout) jangan ikut antre di depan
+        stale = self._drain()
+
+        if stale:
+            print(f"🧩 SHARD: buang {stale} task job lama")
+
+        for task in tasks.values():
+            self._tasks.put(task)
+
+        payloads = {}
+
+        attempts = {i: 1 for i in tasks}
+
+        # shard -> (worker, waktu diambil)
+        claims = {}
+
+        workers = set()
+
+        started = time.time()
+
+        deadline = started + JOB_TIMEOUT
+
+        def retry(shard, reason):
+
+            claims.pop(shard, None)
+
+            if attempts[shard] < MAX_SHARD_ATTEMPTS:
+
+                attempts[shard] += 1
+
+                self._tasks.put(tasks[shard])
+
+            else:
+                print(f"[SHARD FAILED] {kind} shard {shard}: {reason}")
+                payloads[shard] = None
+
+        while len(payloads) < len(tasks) and time.time() < deadline:
+
+            try:
+
+                out = self._results.get(
+                    timeout=min(POLL_INTERVAL, max(deadline - time.time(), 0.1))
+                )
+
+            except queue.Empty:
+
+                out = None
+
+            # ================= SHARD HILANG =================
+            if out is None:
+
+                dead = self._reap()
+
+                now = time.time()
+
+                for shard, (worker, claimed) in list(claims.items()):
+
+                    if shard in payloads:
+                        continue
+
+                    if worker in dead:
+                        retry(shard, f"worker {worker} mati")
+
+                    elif now - claimed > SHARD_TIMEOUT:
+                        retry(shard, f"tidak kembali dalam {SHARD_TIMEOUT}s ({worker})")
+
+                continue
+
+            # hasil job lama (timeout sebelumnya) dibuang
+            if out["job"] != job or out["shard"] in payloads:
+                continue
+
+            shard = out["shard"]
+
+            if out.get("claim"):
+                claims[shard] = (out["worker"], time.time())
+                continue
+
+            if out["ok"]:
+
+                payloads[shard] = out["payload"]
+
+                claims.pop(shard, None)
+
+                workers.add(out["worker"])
+
+                continue
+
+            retry(shard, out["payload"])
+
+        missing = [i for i in tasks if i not in payloads]
+
+        if missing:
+
+            print(f"[SHARD TIMEOUT] {kind}: shard {missing} tidak kembali")
+
+            # jangan sampai dikerjakan / menghambat job berikutnya
+            self._drain()
+
+        print(
+            f"🧩 SHARD {kind}: {len(tasks)} shard | "
+            f"{len(workers)} worker | "
+            f"{time.time() - started:.1f}s"
+        )
+
+        return [payloads.get(i) for i in tasks]
+
+    # ======================================================
+    # ENGINE (DAILY SCREENER)
+    # ======================================================
+
+    def run(self, saham_list, screener_type, prefetch=True):
+
+        """Setara ScreenerEngine.run, universe dibagi ke worker."""
+
+        results = [
+
+            r
+            for part in self._dispatch(
+                "engine",
+                saham_list,
+                screener_type=screener_type,
+                prefetch=prefetch
+            )
+            if part
+            for r in part
+
+        ]
+
+        results.sort(key=lambda x: x.score, reverse=True)
+
+        return results
+
+    # ======================================================
+    # INTRADAY SCANNER
+    # ======================================================
+
+    def _scan(self, kind, saham_list, state, prefetch):
+
+        from app.core.scanner import rank_table
+
+        parts = [
+
+            part
+            for part in self._dispatch(
+                kind,
+                saham_list,
+                state=state,
+                prefetch=prefetch
+            )
+            if part is not None
+
+        ]
+
+        tables = [df for df, _, _ in parts if not df.empty]
+
+        df = rank_table(pd.concat(tables) if tables else [])
+
+        alerts = [alert for _, part_alerts, _ in parts for alert in part_alerts]
+
+        # shard saling lepas -> state alert cukup digabung
+        merged = dict(state or {})
+
+        for _, _, part_state in parts:
+
+            for key, value in part_state.items():
+
+                if isinstance(value, dict):
+                    merged[key] = {**merged.get(key, {}), **value}
+                else:
+                    merged[key] = value
+
+        return df, alerts, merged
+
+    def scan_day(self, state=None, prefetch=True, universe=None):
+
+        from app.core.scanner import SAHAM_LIST
+
+        return self._scan(
+            "day",
+            SAHAM_LIST if universe is None else universe,
+            state,
+            prefetch
+        )
+
+    def scan_bsjp(self, state=None, prefetch=True, universe=None):
+
+        from app.core.scanner_bsjp import SAHAM_LIST
+
+        return self._scan(
+            "bsjp",
+            SAHAM_LIST if universe is None else universe,
+            state,
+            prefetch
+        )
+
+
+# ======================================================
+# CLI (WORKER DI HOST LAIN)
+# ======================================================
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        description="Shard worker cruzer-screener"
+    )
+
+    parser.add_argument("role", choices=["worker"])
+    parser.add_argument("--host", default=BROKER_HOST)
+    parser.add_argument("--port", type=int, default=BROKER_PORT)
+    parser.add_argument("--workers", type=int, default=1)
+
+    args = parser.parse_args(argv)
+
+    if args.workers == 1:
+        run_worker(args.host, args.port)
+        return
+
+    ctx = multiprocessing.get_context(WORKER_START_METHOD)
+
+    procs = [
+
+        ctx.Process(
+            target=run_worker,
+            args=(args.host, args.port, BROKER_AUTHKEY, f"{socket.gethostname()}-{i + 1}")
+        )
+
+        for i in range(args.workers)
+
+    ]
+
+    for proc in procs:
+        proc.start()
+
+    for proc in procs:
+        proc.join()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
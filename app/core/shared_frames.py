@@ -0,0 +1,152 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from app.core.ohlcv import OHLCV_COLUMNS, TZ_NAME, as_ohlcv
+
+
+# ======================================================
+# SHARED FRAMES (PARENT -> WORKER PROCESS TANPA PICKLE)
+# ======================================================
+
+class SharedFrames:
+
+    """
+    Semua frame OHLCV 1 universe dalam 1 blok shared memory:
+
+        [ values (rows x 5) float64 | index (rows) int64 ns ]
+
+    Parent: pack() 1x, kirim `spec` (kecil, picklable) ke worker.
+    Worker: attach(spec) -> frame per kode = view ke blok (tanpa copy).
+    Parent wajib close() setelah semua worker selesai (unlink blok).
+    """
+
+    def __init__(self, shm, spec):
+
+        self.shm = shm
+
+        self.spec = spec
+
+    # ======================================================
+    # PARENT
+    # ======================================================
+
+    @classmethod
+    def pack(cls, frames):
+
+        frames = {
+            kode: df
+            for kode, df in (
+                (kode, as_ohlcv(df)) for kode, df in frames.items()
+            )
+            if df is not None and not df.empty
+        }
+
+        rows = sum(len(df) for df in frames.values())
+
+        width = len(OHLCV_COLUMNS)
+
+        shm = shared_memory.SharedMemory(
+            create=True,
+            size=max(rows * (width + 1) * 8, 1)
+        )
+
+        values, stamps = _views(shm.buf, rows)
+
+        offsets = {}
+
+        pos = 0
+
+        for kode, df in frames.items():
+
+            end = pos + len(df)
+
+            values[pos:end] = df.to_numpy()
+            stamps[pos:end] = df.index.asi8
+
+            offsets[kode] = (pos, end)
+
+            pos = end
+
+        # view harus dilepas sebelum blok bisa di-close
+        del values, stamps
+
+        return cls(shm, {"name": shm.name, "rows": rows, "offsets": offsets})
+
+    def close(self):
+
+        self.shm.close()
+
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ======================================================
+# WORKER
+# ======================================================
+
+def _views(buf, rows):
+
+    width = len(OHLCV_COLUMNS)
+
+    values = np.ndarray((rows, width), dtype=np.float64, buffer=buf)
+
+    stamps = np.ndarray(
+        (rows,),
+        dtype=np.int64,
+        buffer=buf,
+        offset=rows * width * 8
+    )
+
+    return values, stamps
+
+
+def attach(spec, codes):
+
+    """
+    Generator (kode, frame kanonik) untuk `codes`, frame = view read-only
+    ke shared memory. Frame tidak boleh dipakai setelah generator selesai.
+    """
+
+    shm = shared_memory.SharedMemory(name=spec["name"])
+
+    try:
+
+        values, stamps = _views(shm.buf, spec["rows"])
+
+        values.flags.writeable = False
+
+        for kode in codes:
+
+            start, end = spec["offsets"][kode]
+
+            index = pd.DatetimeIndex(
+                stamps[start:end].view("M8[ns]"),
+                name="Date"
+            ).tz_localize("UTC").tz_convert(TZ_NAME)
+
+            yield kode, pd.DataFrame(
+                values[start:end],
+                index=index,
+                columns=OHLCV_COLUMNS,
+                copy=False
+            )
+
+        del values, stamps
+
+    finally:
+
+        try:
+            shm.close()
+        except BufferError:
+            # masih ada view yang dipegang -> dilepas saat GC
+            pass
@@ -0,0 +1,508 @@
+import os
+import json
+import time
+import asyncio
+import threading
+
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # windows -> bucket cuma dibagi dalam 1 proses
+    fcntl = None
+
+
+# ======================================================
+# CONFIG
+# ======================================================
+
+# token bucket (dibagi semua proses: UI + bot)
+RATE_PER_SEC = 20.0
+
+BURST = 40
+
+STATE_PATH = os.path.join("data", "throttle.state")
+
+# 429 / diblok -> semua proses berhenti sebentar
+THROTTLED_PAUSE = 5.0
+
+# AIMD (per proses)
+START_CONCURRENCY = 8
+
+MIN_CONCURRENCY = 2
+
+MAX_CONCURRENCY = 64
+
+DECREASE_FACTOR = 0.5
+
+# turun maksimal 1x per N detik (1 ledakan 429 = 1x turun)
+DECREASE_COOLDOWN = 2.0
+
+# latency di atas ini dianggap mulai padat
+LATENCY_TARGET = 3.0
+
+# jendela statistik throughput (detik)
+STATS_WINDOW = 60
+
+# respon 200 kosong baru dianggap soft block kalau menyebar:
+# >= EMPTY_SPREAD symbol berbeda kosong dalam EMPTY_WINDOW detik
+# (1 ticker mati / suspend tidak menurunkan limit semua request)
+EMPTY_WINDOW = 30
+
+EMPTY_SPREAD = 5
+
+RATE_LIMIT_MARKERS = ("RateLimit", "Too Many Requests", "429")
+
+
+def is_rate_limited(text):
+
+    """Pesan error / exception dari yfinance / HTTP = kena limit Yahoo?"""
+
+    text = str(text)
+
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+
+# ======================================================
+# TOKEN BUCKET (SHARED)
+# ======================================================
+
+class TokenBucket:
+
+    """
+    Token bucket yang state-nya disimpan di file (flock),
+    jadi Streamlit + bot berbagi 1 kuota request ke Yahoo.
+    Tanpa fcntl -> state di memori (per proses).
+    """
+
+    def __init__(self, rate=RATE_PER_SEC, burst=BURST, path=STATE_PATH):
+
+        self.rate = rate
+
+        self.burst = burst
+
+        self.path = path
+
+        self._lock = threading.Lock()
+
+        self._fd = None
+
+        self._state = {"tokens": burst, "ts": time.time(), "pause_until": 0}
+
+    # ======================================================
+    # STATE (FILE / MEMORY)
+    # ======================================================
+
+    def _open(self):
+
+        if fcntl is None:
+            return None
+
+        if self._fd is None:
+
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                return None
+
+        return self._fd
+
+    def _update(self, fn):
+
+        """Jalankan fn(state) secara atomik (antar thread & antar proses)."""
+
+        with self._lock:
+
+            fd = self._open()
+
+            if fd is None:
+                return fn(self._state)
+
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+            try:
+
+                raw = os.pread(fd, 4096, 0)
+
+                try:
+                    state = json.loads(raw) if raw else dict(self._state)
+                except ValueError:
+                    state = dict(self._state)
+
+                result = fn(state)
+
+                data = json.dumps(state).encode()
+
+                os.ftruncate(fd, 0)
+                os.pwrite(fd, data, 0)
+
+                return result
+
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    # ======================================================
+    # TAKE / PAUSE
+    # ======================================================
+
+    def _take(self, state, cost=1):
+
+        now = time.time()
+
+        if state.get("pause_until", 0) > now:
+            return state["pause_until"] - now
+
+        elapsed = max(now - state.get("ts", now), 0)
+
+        state["tokens"] = min(self.burst, state.get("tokens", 0) + elapsed * self.rate)
+
+        state["ts"] = now
+
+        # cost > burst tidak akan pernah muat -> cukup bucket penuh,
+        # sisanya jadi utang (token minus) yang ditunggu pemanggil berikutnya
+        need = min(cost, self.burst)
+
+        if state["tokens"] >= need:
+            state["tokens"] -= cost
+            return 0
+
+        return (need - state["tokens"]) / self.rate
+
+    def take(self, cost=1):
+
+        """Return 0 kalau dapat cost token (1x update), atau detik yang harus ditunggu."""
+
+        return self._update(lambda state: self._take(state, cost))
+
+    def pause(self, seconds=THROTTLED_PAUSE):
+
+        def fn(state):
+            state["pause_until"] = max(state.get("pause_until", 0), time.time() + seconds)
+
+        self._update(fn)
+
+    def peek(self):
+
+        def fn(state):
+            return {
+                "tokens": round(state.get("tokens", 0), 1),
+                "paused_for": round(max(state.get("pause_until", 0) - time.time(), 0), 1),
+            }
+
+        return self._update(fn)
+
+    def acquire(self, cost=1):
+
+        while True:
+
+            wait = self.take(cost)
+
+            if wait <= 0:
+                return
+
+            time.sleep(wait)
+
+    async def acquire_async(self, cost=1):
+
+        while True:
+
+            # flock + file I/O -> thread, event loop tidak ikut menunggu lock
+            wait = await asyncio.to_thread(self.take, cost)
+
+            if wait <= 0:
+                return
+
+            await asyncio.sleep(wait)
+
+
+# ======================================================
+# AIMD CONCURRENCY
+# ======================================================
+
+class ConcurrencyController:
+
+    """
+    Additive increase / multiplicative decrease:
+    - sukses & latency sehat -> limit naik ~1 per 1 putaran (limit request)
+    - 429 / respon kosong menyebar / lambat -> limit dikali DECREASE_FACTOR
+
+    Latency dibandingkan per request: slot batch (cost = jumlah ticker)
+    dinilai dari latency / cost, bukan wall time 1 chunk.
+    """
+
+    def __init__(
+        self,
+        start=START_CONCURRENCY,
+        minimum=MIN_CONCURRENCY,
+        maximum=MAX_CONCURRENCY
+    ):
+
+        self.limit = float(start)
+
+        self.minimum = minimum
+
+        self.maximum = maximum
+
+        self.in_flight = 0
+
+        self._cond = threading.Condition()
+
+        self._last_decrease = 0.0
+
+    def _free(self):
+
+        return self.in_flight < int(self.limit)
+
+    def try_acquire(self):
+
+        with self._cond:
+
+            if not self._free():
+                return False
+
+            self.in_flight += 1
+
+            return True
+
+    def acquire(self):
+
+        with self._cond:
+
+            while not self._free():
+                self._cond.wait(0.5)
+
+            self.in_flight += 1
+
+    async def acquire_async(self):
+
+        # event loop tidak boleh di-block -> polling ringan
+        while not self.try_acquire():
+            await asyncio.sleep(0.05)
+
+    def release(self, latency, ok, backoff, cost=1):
+
+        """backoff True = 429 / soft block (turunkan limit)."""
+
+        with self._cond:
+
+            self.in_flight -= 1
+
+            now = time.time()
+
+            if backoff or (ok and latency / max(cost, 1) > LATENCY_TARGET):
+
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+
+                    self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+
+                    self._last_decrease = now
+
+            elif ok:
+
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+            self._cond.notify_all()
+
+
+# ======================================================
+# THROTTLE (BUCKET + AIMD + STATS)
+# ======================================================
+
+class Slot:
+
+    """Hasil 1 request, diisi caller di dalam blok slot()."""
+
+    def __init__(self, cost=1, symbol=None):
+
+        self.cost = cost
+
+        self.symbol = symbol
+
+        self.ok = True
+
+        self.throttled = False
+
+        self.empty = False
+
+    def failed(self, throttled=False, empty=False):
+
+        """
+        throttled : kena limit -> semua proses pause + limit turun
+        empty     : respon 200 tapi kosong -> limit turun kalau kosongnya
+                    menyebar ke banyak symbol (lihat EMPTY_SPREAD)
+        """
+
+        self.ok = False
+
+        self.throttled = throttled
+
+        self.empty = empty
+
+
+class Throttle:
+
+    """
+    1 pintu untuk semua request ke Yahoo (1 per proses):
+
+        with THROTTLE.slot() as slot:
+            df = yf.download(...)
+            if df.empty:
+                slot.failed(throttled=...)
+    """
+
+    def __init__(self):
+
+        self.bucket = TokenBucket()
+
+        self.controller = ConcurrencyController()
+
+        self._lock = threading.Lock()
+
+        self._done = deque()
+
+        # (epoch, symbol) respon kosong terakhir
+        self._empty = deque()
+
+        self.ok = 0
+
+        self.errors = 0
+
+        self.throttled = 0
+
+        self._latency_total = 0.0
+
+    # ======================================================
+    # RECORD
+    # ======================================================
+
+    def _empty_spread(self, slot, now):
+
+        """Catat respon kosong; True kalau sudah menyebar (soft block)."""
+
+        with self._lock:
+
+            # symbol tidak diketahui -> dihitung sendiri-sendiri
+            self._empty.append((now, slot.symbol or id(slot)))
+
+            while self._empty and self._empty[0][0] < now - EMPTY_WINDOW:
+                self._empty.popleft()
+
+            return len({symbol for _, symbol in self._empty}) >= EMPTY_SPREAD
+
+    def _record(self, slot, latency):
+
+        now = time.time()
+
+        soft_block = slot.empty and self._empty_spread(slot, now)
+
+        self.controller.release(
+            latency,
+            slot.ok,
+            slot.throttled or soft_block,
+            slot.cost
+        )
+
+        if slot.throttled:
+            self.bucket.pause()
+
+        with self._lock:
+
+            self._done.append(now)
+
+            while self._done and self._done[0] < now - STATS_WINDOW:
+                self._done.popleft()
+
+            self._latency_total += latency
+
+            if slot.throttled:
+                self.throttled += 1
+            elif slot.ok:
+                self.ok += 1
+            else:
+                self.errors += 1
+
+    # ======================================================
+    # SLOT (SYNC / ASYNC)
+    # ======================================================
+
+    @contextmanager
+    def slot(self, cost=1, symbol=None):
+
+        """
+        cost   = jumlah request HTTP (yf.download multi ticker = 1 per ticker)
+        symbol = ticker request 1 symbol (sebaran respon kosong)
+        """
+
+        self.controller.acquire()
+
+        try:
+            self.bucket.acquire(cost)
+        except BaseException:
+            self.controller.release(0, ok=False, backoff=False)
+            raise
+
+        slot = Slot(cost, symbol)
+
+        start = time.time()
+
+        try:
+            yield slot
+        except Exception as e:
+            slot.failed(throttled=is_rate_limited(repr(e)))
+            raise
+        finally:
+            self._record(slot, time.time() - start)
+
+    @asynccontextmanager
+    async def slot_async(self, cost=1, symbol=None):
+
+        await self.controller.acquire_async()
+
+        try:
+            await self.bucket.acquire_async(cost)
+        except BaseException:
+            self.controller.release(0, ok=False, backoff=False)
+            raise
+
+        slot = Slot(cost, symbol)
+
+        start = time.time()
+
+        try:
+            yield slot
+        except Exception as e:
+            slot.failed(throttled=is_rate_limited(repr(e)))
+            raise
+        finally:
+            self._record(slot, time.time() - start)
+
+    # ======================================================
+    # STATS
+    # ======================================================
+
+    def stats(self):
+
+        bucket = self.bucket.peek()
+
+        with self._lock:
+
+            total = self.ok + self.errors + self.throttled
+
+            return {
+                "limit": int(self.controller.limit),
+                "in_flight": self.controller.in_flight,
+                "rate": self.bucket.rate,
+                "tokens": bucket["tokens"],
+                "paused_for": bucket["paused_for"],
+                "throughput": round(len(self._done) / STATS_WINDOW, 2),
+                "ok": self.ok,
+                "errors": self.errors,
+                "throttled": self.throttled,
+                "avg_latency": round(self._latency_total / total, 2) if total else 0,
+            }
+
+
+THROTTLE = Throttle()
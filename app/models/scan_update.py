@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from app.models.stock_result import StockResult
+
+
+@dataclass
+class ScanUpdate:
+    # ================= TICKER =================
+    kode: str
+
+    # None = tidak lolos filter / gagal fetch
+    result: Optional[StockResult]
+
+    # ================= PROGRESS =================
+    done: int
+    total: int
+
+    # gagal fetch (beda dengan tidak ada sinyal),
+    # berkurang lagi kalau pulih di second pass
+    failed: int
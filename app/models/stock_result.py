@@ -27,6 +27,10 @@ class StockResult:
 
     score_breakdown: Dict[str, int]
 
+    # poin per grup rule table, untuk screener yang score_breakdown-nya
+    # berisi metrik tampilan (swing_trade_week)
+    score_points: Dict[str, int] = field(default_factory=dict)
+
     # ================= RSI =================
     rsi_value: Optional[float] = None
     rsi_status: Optional[str] = None
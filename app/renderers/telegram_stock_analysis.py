@@ -9,20 +9,15 @@ def render_stock_analysis_message(
 
     from app.utils.sector_utils import get_sector_badge
     from app.config.saham_profile import SAHAM_PROFILE
+    from app.core.ohlcv import as_ohlcv
 
     # ==========================================================
     # CLEAN DF
     # ==========================================================
 
-    df_price.columns = [
-        c[0] if isinstance(c, tuple) else c
-        for c in df_price.columns
-    ]
-
-    df_price.columns = [
-        str(c).upper()
-        for c in df_price.columns
-    ]
+    # frame kanonik -> zero-copy, frame lain dinormalisasi
+    # (tidak me-rename kolom frame milik caller)
+    df_price = as_ohlcv(df_price)
 
     # ==========================================================
     # HELPERS
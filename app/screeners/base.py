@@ -1,9 +1,83 @@
 from abc import ABC, abstractmethod
 from app.models.stock_result import StockResult
+from app.core.data_loader import load_daily_data, load_daily_data_async
+from app.core.rules import RULES
 
 class BaseScreener(ABC):
     screener_type: str
 
+    # gate likuiditas daily (0 = tanpa gate)
+    # dipakai engine untuk prune universe SEBELUM fetch
+    min_daily_volume = 0
+    min_daily_value = 0
+
+    # versi logic compute, bagian dari key RESULT_MEMO
+    # naikkan tiap kali rumus skor / filter berubah
+    version = 1
+
+    @property
+    def memo_version(self):
+        """
+        Versi logic + sidik rule table (app.config.scoring_rules
+        + override JSON): tuning threshold ikut membatalkan memo.
+        """
+        return (self.version, RULES.fingerprint(self.screener_type))
+
+    # ======================================================
+    # FETCH STAGE (I/O)
+    # ======================================================
+
+    @property
+    def loader_key(self):
+        """
+        Screener dengan key sama memakai frame hasil load yang sama
+        (run_many fetch 1x per key). Override load -> key beda.
+        """
+        return (type(self).load, type(self).load_async)
+
+    def load(self, kode: str):
+        return load_daily_data(kode)
+
+    async def load_async(self, kode: str, session):
+        return await load_daily_data_async(kode, session=session)
+
+    # ======================================================
+    # COMPUTE STAGE (CPU, TANPA I/O)
+    # ======================================================
+
     @abstractmethod
-    def analyze(self, kode: str) -> StockResult | None:
-        pass
\ No newline at end of file
+    def compute(self, kode: str, df) -> StockResult | None:
+        """
+        df: frame daily kanonik (OHLCV), bisa None kalau load gagal.
+        """
+        pass
+
+    def analyze(self, kode: str, df=None) -> StockResult | None:
+        """
+        df opsional: frame daily hasil prefetch.
+        Kalau None, screener load sendiri via load().
+        """
+        if df is None:
+            df = self.load(kode)
+
+        return self.compute(kode, df)
+
+    # ======================================================
+    # PANEL STAGE (OPSIONAL, SEMUA SAHAM SEKALIGUS)
+    # ======================================================
+
+    def analyze_panel(self, panel):
+        """
+        Versi vektor dari compute untuk 1 UniversePanel.
+
+        Return DataFrame (index Kode, 1 baris per saham yang dinilai):
+        - score  : skor total
+        - result : StockResult, None kalau tidak lolos filter
+
+        Belum diimplementasi -> engine pakai compute per saham.
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_panel(self) -> bool:
+        return type(self).analyze_panel is not BaseScreener.analyze_panel
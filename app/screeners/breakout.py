@@ -1,7 +1,13 @@
+import numpy as np
+import pandas as pd
+
 from app.screeners.base import BaseScreener
 from app.models.stock_result import StockResult
-from app.core.data_loader import load_daily_data
-from app.core.indicators import ema, rsi
+from app.core import kernels
+from app.core.features import FEATURE_STORE
+from app.core.panel import FIELD_INDEX
+from app.core.rules import RULES
+from app.core.scan_report import stage_timer
 from app.utils.helpers import round_down, round_up
 
 
@@ -12,21 +18,21 @@ class BreakoutScreener(BaseScreener):
     """
     screener_type = "breakout"
 
-    def analyze(self, kode: str):
-        df = load_daily_data(kode)
-
+    def compute(self, kode: str, df):
         if df is None or len(df) < 25:
             return None
 
-        close = df["Close"]
-        high = df["High"]
-        low = df["Low"]
-        volume = df["Volume"]
+        lap = stage_timer(kode)
 
-        # === INDICATORS ===
-        ema20 = ema(close, 20)
-        rsi14 = rsi(close, 14)
-        vol_ma20 = volume.rolling(20).mean()
+        close = df["CLOSE"]
+        high = df["HIGH"]
+        low = df["LOW"]
+        volume = df["VOLUME"]
+
+        # === INDICATORS (FEATURE STORE) ===
+        features = FEATURE_STORE.frame(df, kode)
+
+        ema20, rsi14, vol_ma20 = features.get("ema20", "rsi14", "vol_ma20")
 
         # === LAST VALUES ===
         last_close = float(close.iloc[-1])
@@ -42,67 +48,169 @@ class BreakoutScreener(BaseScreener):
         vol_ma_last = float(vol_ma20.iloc[-1])
 
         # === RESISTANCE (10 HARI, TANPA HARI INI) ===
-        resistance = float(high.iloc[-11:-1].max())
+        resistance = float(features.high(10, shift=1))
 
-        score = 0
-        score_breakdown = {}
+        lap("indicators")
 
         # ======================================================
-        # 🔥 1️⃣ BREAKOUT / NEAR BREAKOUT (40)
-        # + EMA DISTANCE PROTECTION
+        # SCORE (RULE TABLE app/config/scoring_rules.py)
         # ======================================================
-        ema_distance = (last_close - ema20_last) / ema20_last * 100
+        rules = RULES.get(self.screener_type)
 
-        if last_close >= resistance * 0.998 and ema_distance <= 4:
-            score += 40
-            score_breakdown["Breakout"] = 40
-        elif last_close >= resistance * 0.985 and ema_distance <= 3:
-            score += 25
-            score_breakdown["Breakout"] = 25
-        else:
-            score_breakdown["Breakout"] = 0
+        ns = rules.namespace(
+            self._features(
+                last_close, ema20_last, ema20_prev, rsi_last,
+                vol_last, vol_prev, vol_ma_last, resistance
+            )
+        )
 
-        # ======================================================
-        # 🔹 TREND (20)
-        # ======================================================
-        if ema20_last >= ema20_prev:
-            score += 20
-            score_breakdown["Trend"] = 20
-        else:
-            score_breakdown["Trend"] = 0
+        score, score_breakdown = rules.score(ns)
 
-        # ======================================================
-        # 🔥 2️⃣ VOLUME (25) — HARUS NAIK & ADA ACCELERATION
-        # ======================================================
-        if vol_last > vol_ma_last and vol_last > vol_prev:
-            score += 25
-            score_breakdown["Volume"] = 25
-        elif vol_last > vol_ma_last * 0.8:
-            score += 15
-            score_breakdown["Volume"] = 15
-        else:
-            score_breakdown["Volume"] = 0
+        score_breakdown = {k: int(v) for k, v in score_breakdown.items()}
 
-        # ======================================================
-        # 🔹 RSI (15)
-        # ======================================================
-        if rsi_last >= 55:
-            score += 15
-            score_breakdown["RSI"] = 15
-        elif rsi_last >= 50:
-            score += 8
-            score_breakdown["RSI"] = 8
-        else:
-            score_breakdown["RSI"] = 0
+        lap("scoring")
 
         # ======================================================
         # 🔒 FINAL FILTER (MODE A — KETAT)
         # ======================================================
-        if rsi_last >= 70:
+        if not rules.accepts(ns, score):
             return None
 
-        if score < 60:
-            return None
+        return self._build_result(
+            kode,
+            score,
+            score_breakdown,
+            last_close,
+            last_low,
+            resistance
+        )
+
+    # ======================================================
+    # PANEL (SEMUA SAHAM SEKALIGUS, HASIL SAMA DENGAN COMPUTE)
+    # ======================================================
+
+    def analyze_panel(self, panel):
+
+        rules = RULES.get(self.screener_type)
+
+        columns = rules.labels + ["score", "result"]
+
+        eligible = panel.lengths >= 25
+
+        if not eligible.any():
+            return pd.DataFrame(columns=columns, index=panel.tickers[:0])
+
+        lap = stage_timer()
+
+        # bar per saham rata kanan: [:, -1] = df.iloc[-1]
+        bars = panel.compact()[eligible]
+
+        close = bars[:, :, FIELD_INDEX["CLOSE"]]
+        high = bars[:, :, FIELD_INDEX["HIGH"]]
+        low = bars[:, :, FIELD_INDEX["LOW"]]
+        volume = bars[:, :, FIELD_INDEX["VOLUME"]]
+
+        # === INDICATORS ===
+        ema20 = kernels.ema(close, 20)
+        rsi14 = kernels.rsi(close, 14)
+        vol_ma20 = kernels.rolling_mean(volume, 20)
+
+        # === LAST VALUES ===
+        last_close = close[:, -1]
+        last_low = low[:, -1]
+
+        ema20_last = ema20[:, -1]
+        ema20_prev = ema20[:, -2]
+
+        rsi_last = rsi14[:, -1]
+
+        vol_last = volume[:, -1]
+        vol_prev = volume[:, -2]
+        vol_ma_last = vol_ma20[:, -1]
+
+        # === RESISTANCE (10 HARI, TANPA HARI INI) ===
+        resistance = high[:, -11:-1].max(axis=1)
+
+        lap("indicators")
+
+        # === SCORE (RULE TABLE YANG SAMA DENGAN COMPUTE) ===
+        ns = rules.namespace(
+            self._features(
+                last_close, ema20_last, ema20_prev, rsi_last,
+                vol_last, vol_prev, vol_ma_last, resistance
+            )
+        )
+
+        score, breakdown = rules.score(ns)
+
+        passed = rules.accepts(ns, score)
+
+        table = pd.DataFrame(
+            {**breakdown, "score": score},
+            index=panel.tickers[eligible]
+        )
+
+        results = [None] * len(table)
+
+        # StockResult cuma untuk yang lolos (sedikit)
+        for i in np.flatnonzero(passed):
+
+            results[i] = self._build_result(
+                table.index[i],
+                int(score[i]),
+                {label: int(points[i]) for label, points in breakdown.items()},
+                float(last_close[i]),
+                float(last_low[i]),
+                float(resistance[i])
+            )
+
+        table["result"] = results
+
+        lap("scoring")
+
+        return table
+
+    # ======================================================
+    # FEATURES (VARIABEL RULE, SKALAR ATAU ARRAY)
+    # ======================================================
+
+    @staticmethod
+    def _features(
+        last_close,
+        ema20_last,
+        ema20_prev,
+        rsi_last,
+        vol_last,
+        vol_prev,
+        vol_ma_last,
+        resistance
+    ):
+
+        return {
+            "last_close": last_close,
+            "ema20_last": ema20_last,
+            "ema20_prev": ema20_prev,
+            "ema_distance": (last_close - ema20_last) / ema20_last * 100,
+            "rsi_last": rsi_last,
+            "vol_last": vol_last,
+            "vol_prev": vol_prev,
+            "vol_ma_last": vol_ma_last,
+            "resistance": resistance,
+        }
+
+    # ======================================================
+    # RESULT (DIPAKAI COMPUTE & ANALYZE_PANEL)
+    # ======================================================
+
+    def _build_result(
+        self,
+        kode,
+        score,
+        score_breakdown,
+        last_close,
+        last_low,
+        resistance
+    ):
 
         # ======================================================
         # 🔥 3️⃣ IDX TICK ROUNDING (VALID PRICE)
@@ -1,8 +1,15 @@
+import numpy as np
+import pandas as pd
+
 from app.screeners.base import BaseScreener
 from app.models.stock_result import StockResult
 
-from app.core.data_loader import load_daily_data
-from app.core.indicators import ema, macd
+from app.core import kernels
+from app.core.ohlcv import as_ohlcv
+from app.core.features import FEATURE_STORE
+from app.core.panel import FIELD_INDEX
+from app.core.rules import RULES
+from app.core.scan_report import stage_timer
 
 from app.utils.helpers import round_down, round_up
 
@@ -22,14 +29,14 @@ class SwingTradeDayScreener(BaseScreener):
 
     screener_type = "ara_hunter"
 
-    def analyze(self, kode: str):
+    min_daily_volume = 1_000_000
+
+    def compute(self, kode: str, df):
 
         # ======================================================
-        # LOAD DATA
+        # VALIDATION
         # ======================================================
 
-        df = load_daily_data(kode)
-
         if df is None or len(df) < 30:
             return None
 
@@ -37,338 +44,241 @@ class SwingTradeDayScreener(BaseScreener):
         # PRICE DATA
         # ======================================================
 
-        close = df["Close"]
-
-        open_price = df["Open"]
+        close = df["CLOSE"]
 
-        high = df["High"]
+        open_price = df["OPEN"]
 
-        low = df["Low"]
+        high = df["HIGH"]
 
-        volume = df["Volume"]
+        low = df["LOW"]
 
-        # ======================================================
-        # LAST VALUES
-        # ======================================================
-
-        last_close = float(close.iloc[-1])
-
-        prev_close = float(close.iloc[-2])
-
-        last_open = float(open_price.iloc[-1])
-
-        last_high = float(high.iloc[-1])
-
-        last_low = float(low.iloc[-1])
-
-        vol_last = float(volume.iloc[-1])
+        volume = df["VOLUME"]
 
-        vol_prev = float(volume.iloc[-2])
+        features = FEATURE_STORE.frame(df, kode)
 
         # ======================================================
-        # MA5
+        # MA5 / EMA20 / MACD / VOLUME MA20
         # ======================================================
 
-        ma5 = close.rolling(5).mean()
+        ma5 = features["ma5"]
 
-        ma5_last = float(ma5.iloc[-1])
-
-        ma5_prev = float(ma5.iloc[-2])
-
-        # ======================================================
-        # EMA20
-        # ======================================================
-
-        ema20 = ema(close, 20)
-
-        ema20_last = float(ema20.iloc[-1])
-
-        ema20_prev = float(ema20.iloc[-2])
-
-        # ======================================================
-        # MACD
-        # ======================================================
-
-        macd_line, signal_line, hist = macd(close)
-
-        macd_last = float(macd_line.iloc[-1])
-
-        signal_last = float(signal_line.iloc[-1])
+        ema20 = features["ema20"]
 
-        macd_prev = float(macd_line.iloc[-2])
+        macd_line, signal_line, hist = features["macd"]
 
-        signal_prev = float(signal_line.iloc[-2])
+        vol_ma20 = features["vol_ma20"]
 
         # ======================================================
-        # VOLUME MA20
-        # ======================================================
-
-        vol_ma20 = volume.rolling(20).mean()
-
-        vol_ma_last = float(vol_ma20.iloc[-1])
-
-        # ======================================================
-        # BASIC CALCULATION
-        # ======================================================
-
-        return_pct = (
-            (last_close - prev_close)
-            / prev_close
-        ) * 100
-
-        gap_pct = (
-            (last_open - prev_close)
-            / prev_close
-        ) * 100
-
-        body_pct = (
-            abs(last_close - last_open)
-            / max(last_open, 1)
-        ) * 100
-
-        close_near_high = (
-            (last_high - last_close)
-            / max(last_high, 1)
-        ) * 100
-
-        vol_ratio = vol_last / max(vol_ma_last, 1)
-
-        distance_from_ma5 = (
-            (last_close - ma5_last)
-            / ma5_last
-        ) * 100
-
-        # ======================================================
-        # FILTER UTAMA (JANGAN TERLALU KETAT)
-        # ======================================================
-
-        conditions = [
-
-            # volume minimal
-            vol_last >= 1_000_000,
-
-            # ada momentum
-            return_pct >= 1,
-
-            # breakout MA5
-            last_close > ma5_last,
-
-            # candle hijau
-            last_close > last_open,
-
-            # naik dari yesterday
-            last_close > prev_close,
-
-            # sebelumnya masih dekat MA5
-            prev_close <= ma5_prev * 1.02,
-
-            # gap tidak terlalu tinggi
-            last_open <= (prev_close * 1.05),
-        ]
-
-        if not all(conditions):
-            return None
-
-        # ======================================================
-        # SCORING SYSTEM
-        # ======================================================
-
-        score = 50
-
-        score_breakdown = {}
-
-        # ======================================================
-        # 🟢 VOLUME EXPLOSION
+        # LAST VALUES
         # ======================================================
 
-        if vol_ratio >= 10:
-
-            score += 25
-            score_breakdown["Volume"] = 25
+        values = {
 
-        elif vol_ratio >= 5:
+            "last_close": float(close.iloc[-1]),
 
-            score += 20
-            score_breakdown["Volume"] = 20
+            "prev_close": float(close.iloc[-2]),
 
-        elif vol_ratio >= 3:
-
-            score += 15
-            score_breakdown["Volume"] = 15
-
-        elif vol_ratio >= 2:
+            "last_open": float(open_price.iloc[-1]),
 
-            score += 10
-            score_breakdown["Volume"] = 10
+            "last_high": float(high.iloc[-1]),
 
-        else:
+            "last_low": float(low.iloc[-1]),
 
-            score_breakdown["Volume"] = 0
+            "vol_last": float(volume.iloc[-1]),
 
-        # ======================================================
-        # 🟢 BODY EXPANSION
-        # ======================================================
+            "vol_prev": float(volume.iloc[-2]),
 
-        if body_pct >= 20:
+            "ma5_last": float(ma5.iloc[-1]),
 
-            score += 20
-            score_breakdown["Body"] = 20
+            "ma5_prev": float(ma5.iloc[-2]),
 
-        elif body_pct >= 10:
+            "ema20_last": float(ema20.iloc[-1]),
 
-            score += 15
-            score_breakdown["Body"] = 15
+            "ema20_prev": float(ema20.iloc[-2]),
 
-        elif body_pct >= 5:
+            "macd_last": float(macd_line.iloc[-1]),
 
-            score += 10
-            score_breakdown["Body"] = 10
+            "macd_prev": float(macd_line.iloc[-2]),
 
-        elif body_pct >= 2:
+            "signal_last": float(signal_line.iloc[-1]),
 
-            score += 5
-            score_breakdown["Body"] = 5
+            "signal_prev": float(signal_line.iloc[-2]),
 
-        else:
+            "vol_ma_last": float(vol_ma20.iloc[-1]),
 
-            score_breakdown["Body"] = 0
+        }
 
         # ======================================================
-        # 🟢 CLOSE NEAR HIGH
+        # FILTER + SCORE (RULE TABLE app/config/scoring_rules.py)
         # ======================================================
 
-        if close_near_high <= 0.3:
+        rules = RULES.get(self.screener_type)
 
-            score += 20
-            score_breakdown["Close Near High"] = 20
+        ns = rules.namespace(
+            self._features(values),
+            min_daily_volume=self.min_daily_volume
+        )
 
-        elif close_near_high <= 1:
+        # filter utama (jangan terlalu ketat)
+        if rules.reasons(ns):
+            return None
 
-            score += 15
-            score_breakdown["Close Near High"] = 15
+        score, score_breakdown = rules.score(ns)
 
-        elif close_near_high <= 2:
+        score_breakdown = {k: int(v) for k, v in score_breakdown.items()}
 
-            score += 8
-            score_breakdown["Close Near High"] = 8
+        return self._build_result(kode, score, score_breakdown, values)
 
-        else:
+    # ======================================================
+    # PANEL (SEMUA SAHAM SEKALIGUS, HASIL SAMA DENGAN COMPUTE)
+    # ======================================================
 
-            score_breakdown["Close Near High"] = 0
+    def analyze_panel(self, panel):
 
-        # ======================================================
-        # 🟢 MOMENTUM
-        # ======================================================
+        rules = RULES.get(self.screener_type)
 
-        if return_pct >= 25:
+        columns = rules.labels + ["score", "result"]
 
-            score += 15
-            score_breakdown["Momentum"] = 15
+        eligible = panel.lengths >= 30
 
-        elif return_pct >= 15:
+        if not eligible.any():
+            return pd.DataFrame(columns=columns, index=panel.tickers[:0])
 
-            score += 12
-            score_breakdown["Momentum"] = 12
+        lap = stage_timer()
 
-        elif return_pct >= 10:
+        # bar per saham rata kanan: [:, -1] = df.iloc[-1]
+        bars = panel.compact()[eligible]
 
-            score += 10
-            score_breakdown["Momentum"] = 10
+        close = bars[:, :, FIELD_INDEX["CLOSE"]]
+        open_price = bars[:, :, FIELD_INDEX["OPEN"]]
+        high = bars[:, :, FIELD_INDEX["HIGH"]]
+        low = bars[:, :, FIELD_INDEX["LOW"]]
+        volume = bars[:, :, FIELD_INDEX["VOLUME"]]
 
-        elif return_pct >= 5:
+        # === INDICATORS ===
+        ma5 = kernels.rolling_mean(close, 5)
+        ema20 = kernels.ema(close, 20)
+        macd_line, signal_line, _ = kernels.macd(close)
+        vol_ma20 = kernels.rolling_mean(volume, 20)
 
-            score += 7
-            score_breakdown["Momentum"] = 7
+        # === LAST VALUES ===
+        values = {
+            "last_close": close[:, -1],
+            "prev_close": close[:, -2],
+            "last_open": open_price[:, -1],
+            "last_high": high[:, -1],
+            "last_low": low[:, -1],
+            "vol_last": volume[:, -1],
+            "vol_prev": volume[:, -2],
+            "ma5_last": ma5[:, -1],
+            "ma5_prev": ma5[:, -2],
+            "ema20_last": ema20[:, -1],
+            "ema20_prev": ema20[:, -2],
+            "macd_last": macd_line[:, -1],
+            "macd_prev": macd_line[:, -2],
+            "signal_last": signal_line[:, -1],
+            "signal_prev": signal_line[:, -2],
+            "vol_ma_last": vol_ma20[:, -1],
+        }
 
-        else:
+        lap("indicators")
 
-            score_breakdown["Momentum"] = 0
+        # === FILTER + SCORE (RULE TABLE YANG SAMA DENGAN COMPUTE) ===
+        ns = rules.namespace(
+            self._features(values),
+            min_daily_volume=self.min_daily_volume
+        )
 
-        # ======================================================
-        # 🟢 GAP SAFE
-        # ======================================================
+        score, breakdown = rules.score(ns)
 
-        if 0 <= gap_pct <= 2:
+        table = pd.DataFrame(
+            {**breakdown, "score": score},
+            index=panel.tickers[eligible]
+        )
 
-            score += 10
-            score_breakdown["Gap Safe"] = 10
+        passed = np.broadcast_to(rules.passes(ns), len(table))
 
-        elif gap_pct <= 5:
+        results = [None] * len(table)
 
-            score += 5
-            score_breakdown["Gap Safe"] = 5
+        # StockResult cuma untuk yang lolos (sedikit)
+        for i in np.flatnonzero(passed):
 
-        else:
+            results[i] = self._build_result(
+                table.index[i],
+                score[i],
+                {label: int(points[i]) for label, points in breakdown.items()},
+                {name: float(value[i]) for name, value in values.items()}
+            )
 
-            score_breakdown["Gap Safe"] = 0
+        table["result"] = results
 
-        # ======================================================
-        # 🟢 EMA20 BONUS
-        # ======================================================
+        lap("scoring")
 
-        if (
-            last_close >= ema20_last
-            and ema20_last >= ema20_prev
-        ):
+        return table
 
-            score += 5
-            score_breakdown["EMA20"] = 5
+    # ======================================================
+    # FEATURES (VARIABEL RULE, SKALAR ATAU ARRAY)
+    # ======================================================
 
-        else:
+    @staticmethod
+    def _features(values):
 
-            score_breakdown["EMA20"] = 0
+        last_close = values["last_close"]
 
-        # ======================================================
-        # 🟢 MACD BONUS
-        # ======================================================
+        prev_close = values["prev_close"]
 
-        if (
-            macd_prev <= signal_prev
-            and macd_last > signal_last
-        ):
+        last_open = values["last_open"]
 
-            score += 5
-            score_breakdown["MACD"] = 5
+        last_high = values["last_high"]
 
-        elif macd_last > signal_last:
+        ma5_last = values["ma5_last"]
 
-            score += 3
-            score_breakdown["MACD"] = 3
+        return {
 
-        else:
+            **values,
 
-            score_breakdown["MACD"] = 0
+            "return_pct": (
+                (last_close - prev_close)
+                / prev_close
+            ) * 100,
 
-        # ======================================================
-        # 🔴 OVEREXTENDED PENALTY
-        # ======================================================
+            "gap_pct": (
+                (last_open - prev_close)
+                / prev_close
+            ) * 100,
 
-        if distance_from_ma5 >= 30:
+            "body_pct": (
+                np.abs(last_close - last_open)
+                / np.maximum(last_open, 1)
+            ) * 100,
 
-            score -= 15
-            score_breakdown["Overextended"] = -15
+            "close_near_high": (
+                (last_high - last_close)
+                / np.maximum(last_high, 1)
+            ) * 100,
 
-        elif distance_from_ma5 >= 20:
+            "vol_ratio": values["vol_last"] / np.maximum(values["vol_ma_last"], 1),
 
-            score -= 8
-            score_breakdown["Overextended"] = -8
+            "distance_from_ma5": (
+                (last_close - ma5_last)
+                / ma5_last
+            ) * 100,
 
-        else:
+        }
 
-            score_breakdown["Overextended"] = 0
+    # ======================================================
+    # RESULT (DIPAKAI COMPUTE & ANALYZE_PANEL)
+    # ======================================================
 
-        # ======================================================
-        # 🔴 CLIMAX PENALTY
-        # ======================================================
+    def _build_result(self, kode, score, score_breakdown, values):
 
-        if return_pct >= 35:
+        last_close = values["last_close"]
 
-            score -= 10
-            score_breakdown["Climax"] = -10
+        last_open = values["last_open"]
 
-        else:
+        last_low = values["last_low"]
 
-            score_breakdown["Climax"] = 0
+        ma5_last = values["ma5_last"]
 
         # ======================================================
         # PRICE ROUNDING
@@ -481,33 +391,25 @@ def calculate_fast_trade_score(df):
         # VALIDATION
         # ======================================================
 
+        # frame kanonik dari loader -> tanpa copy
+        df = as_ohlcv(df)
+
         if df is None or len(df) < 30:
             return 0
 
-        # ======================================================
-        # NORMALIZE COLUMN
-        # ======================================================
-
-        df = df.copy()
-
-        df.columns = [
-            str(c).strip().lower()
-            for c in df.columns
-        ]
-
         # ======================================================
         # DATA
         # ======================================================
 
-        close = df["close"]
+        close = df["CLOSE"]
 
-        open_price = df["open"]
+        open_price = df["OPEN"]
 
-        high = df["high"]
+        high = df["HIGH"]
 
-        low = df["low"]
+        low = df["LOW"]
 
-        volume = df["volume"]
+        volume = df["VOLUME"]
 
         # ======================================================
         # LAST VALUE
@@ -527,9 +429,9 @@ def calculate_fast_trade_score(df):
         # MOVING AVERAGE
         # ======================================================
 
-        ma5 = close.rolling(5).mean()
+        features = FEATURE_STORE.frame(df)
 
-        ma20 = close.rolling(20).mean()
+        ma5, ma20 = features.get("ma5", "ma20")
 
         ma5_last = float(ma5.iloc[-1])
 
@@ -539,7 +441,7 @@ def calculate_fast_trade_score(df):
         # VOLUME
         # ======================================================
 
-        vol_ma20 = volume.rolling(20).mean()
+        vol_ma20 = features["vol_ma20"]
 
         vol_ma_last = float(
             vol_ma20.iloc[-1]
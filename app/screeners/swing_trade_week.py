@@ -1,9 +1,15 @@
+import numpy as np
 import pandas as pd
 
 from app.screeners.base import BaseScreener
 from app.models.stock_result import StockResult
 
-from app.core.data_loader import load_daily_data
+from app.core import kernels
+from app.core.features import FEATURE_STORE
+from app.core.ohlcv import as_ohlcv
+from app.core.panel import FIELD_INDEX
+from app.core.rules import RULES
+from app.core.scan_report import stage_timer
 from app.utils.helpers import round_down, round_up
 
 
@@ -50,14 +56,18 @@ class SwingTradeWeekScreener(BaseScreener):
 
     screener_type = "swing_trade_week"
 
-    def analyze(self, kode: str):
+    min_daily_volume = 500_000
+    min_daily_value = 3_000_000_000
+
+    # 3: poin rule table di score_points (score_breakdown = metrik tampilan)
+    version = 3
+
+    def compute(self, kode: str, df):
 
         # ======================================================
-        # LOAD DATA
+        # VALIDATION
         # ======================================================
 
-        df = load_daily_data(kode)
-
         if df is None or len(df) < 100:
             return None
 
@@ -65,487 +75,402 @@ class SwingTradeWeekScreener(BaseScreener):
         # DATA
         # ======================================================
 
-        close = df["Close"]
+        close = df["CLOSE"]
 
-        open_price = df["Open"]
+        open_price = df["OPEN"]
 
-        high = df["High"]
+        high = df["HIGH"]
 
-        low = df["Low"]
+        low = df["LOW"]
 
-        volume = df["Volume"]
+        volume = df["VOLUME"]
 
         idx = get_last_valid_idx(volume)
 
         # ======================================================
-        # LAST VALUE
+        # MOVING AVERAGE / VOLUME MA20
         # ======================================================
 
-        last_close = float(close.iloc[idx])
-
-        prev_close = float(close.iloc[idx - 1])
-
-        last_open = float(open_price.iloc[idx])
+        features = FEATURE_STORE.frame(df, kode)
 
-        last_high = float(high.iloc[idx])
+        ma5, ma20, ma50, ma100 = features.get("ma5", "ma20", "ma50", "ma100")
 
-        last_low = float(low.iloc[idx])
-
-        vol_last = float(volume.iloc[idx])
+        vol_ma20 = features["vol_ma20"]
 
         # ======================================================
-        # MOVING AVERAGE
+        # LAST VALUE (BAR TERAKHIR YANG ADA TRANSAKSI)
         # ======================================================
 
-        ma5 = close.rolling(5).mean()
+        values = {
 
-        ma20 = close.rolling(20).mean()
+            "last_close": float(close.iloc[idx]),
 
-        ma50 = close.rolling(50).mean()
+            "prev_close": float(close.iloc[idx - 1]),
 
-        ma100 = close.rolling(100).mean()
+            "last_open": float(open_price.iloc[idx]),
 
-        ma5_last = float(ma5.iloc[idx])
+            "last_high": float(high.iloc[idx]),
 
-        ma20_last = float(ma20.iloc[idx])
+            "last_low": float(low.iloc[idx]),
 
-        ma50_last = float(ma50.iloc[idx])
+            "vol_last": float(volume.iloc[idx]),
 
-        ma100_last = float(ma100.iloc[idx])
+            "ma5_last": float(ma5.iloc[idx]),
 
-        # ======================================================
-        # VOLUME
-        # ======================================================
+            "ma20_last": float(ma20.iloc[idx]),
 
-        vol_ma20 = volume.rolling(20).mean()
+            "ma50_last": float(ma50.iloc[idx]),
 
-        vol_ma20_last = float(vol_ma20.iloc[idx])
+            "ma100_last": float(ma100.iloc[idx]),
 
-        vol_ratio = (
-            vol_last / max(vol_ma20_last, 1)
-        )
+            "ma20_prev4": float(ma20.iloc[idx - 4]),
 
-        # ======================================================
-        # LIQUIDITY
-        # ======================================================
+            "ma50_prev4": float(ma50.iloc[idx - 4]),
 
-        traded_value = (
-            last_close * vol_last
-        )
+            "vol_ma20_last": float(vol_ma20.iloc[idx]),
 
-        # ======================================================
-        # PRICE ACTION
-        # ======================================================
+            # level = bar terakhir frame (bukan idx), sama seperti sebelumnya
+            "recent_high_5": float(features.high(5)),
 
-        return_pct = (
-            (last_close - prev_close)
-            / max(prev_close, 1)
-        ) * 100
+            "recent_high_10": float(features.high(10)),
 
-        distance_ma20 = (
-            (last_close - ma20_last)
-            / max(ma20_last, 1)
-        ) * 100
+            "recent_low_10": float(features.low(10)),
 
-        distance_ma50 = (
-            (last_close - ma50_last)
-            / max(ma50_last, 1)
-        ) * 100
+            "high_14": float(features.high(14)),
 
-        distance_ma100 = (
-            (last_close - ma100_last)
-            / max(ma100_last, 1)
-        ) * 100
+            "low_14": float(features.low(14)),
 
-        # ======================================================
-        # PULLBACK ANALYSIS
-        # ======================================================
+            "close_std_20": float(close.tail(20).std()),
 
-        recent_high_5 = float(
-            high.tail(5).max()
-        )
+            "close_mean_20": float(close.tail(20).mean()),
 
-        recent_high_10 = float(
-            high.tail(10).max()
-        )
+        }
 
-        pullback_pct = (
-            (last_close - recent_high_5)
-            / max(recent_high_5, 1)
-        ) * 100
+        # ======================================================
+        # FILTER + SCORE (RULE TABLE app/config/scoring_rules.py)
+        # ======================================================
 
-        recent_low_10 = float(
-            low.tail(10).min()
-        )
+        rules = RULES.get(self.screener_type)
 
-        rebound_zone = (
-            (last_close - recent_low_10)
-            / max(recent_low_10, 1)
-        ) * 100
+        metrics = self._features(values)
 
-        near_ma20 = (
-            abs(distance_ma20) <= 3
+        ns = rules.namespace(
+            metrics,
+            min_daily_volume=self.min_daily_volume,
+            min_daily_value=self.min_daily_value
         )
 
         # ======================================================
-        # CANDLE ANALYSIS
+        # REJECT
         # ======================================================
 
-        body_pct = (
-            abs(last_close - last_open)
-            / max(last_open, 1)
-        ) * 100
+        failed = rules.reasons(ns)
 
-        upper_wick = (
-            (last_high - max(last_open, last_close))
-            / max(last_close, 1)
-        ) * 100
+        if failed:
 
-        lower_wick = (
-            (min(last_open, last_close) - last_low)
-            / max(last_low, 1)
-        ) * 100
+            print(
+                f"❌ {kode} -> {', '.join(failed)}"
+            )
 
-        close_near_high = (
-            (last_high - last_close)
-            / max(last_close, 1)
-        ) * 100
+            return None
 
         # ======================================================
-        # VOLATILITY
+        # SCORE (BASE 40 + BONUS - PENALTY, NORMALIZE 0..99)
         # ======================================================
 
-        atr_pct = (
-            (high.tail(14).max() - low.tail(14).min())
-            / max(last_close, 1)
-        ) * 100
-
-        # ======================================================
-        # TREND STABILITY
-        # ======================================================
+        score, score_points = rules.score(ns)
 
-        trend_stability = (
-            close.tail(20).std()
-            / max(close.tail(20).mean(), 1)
-        ) * 100
+        score_points = {k: int(v) for k, v in score_points.items()}
 
-        # ======================================================
-        # TREND ANALYSIS
-        # ======================================================
+        return self._build_result(kode, score, score_points, metrics)
 
-        bullish_alignment = (
+    # ======================================================
+    # PANEL (SEMUA SAHAM SEKALIGUS, HASIL SAMA DENGAN COMPUTE)
+    # ======================================================
 
-            ma20_last > ma50_last and
-            ma50_last > ma100_last
+    def analyze_panel(self, panel):
 
-        )
+        rules = RULES.get(self.screener_type)
 
-        ma20_uptrend = (
-            ma20.iloc[idx] > ma20.iloc[idx - 4]
-        )
+        columns = rules.labels + ["score", "result"]
 
-        ma50_uptrend = (
-            ma50.iloc[idx] > ma50.iloc[idx - 4]
-        )
+        eligible = panel.lengths >= 100
 
-        # ======================================================
-        # FILTER
-        # ======================================================
+        if not eligible.any():
+            return pd.DataFrame(columns=columns, index=panel.tickers[:0])
 
-        failed = []
+        lap = stage_timer()
 
-        # ======================================================
-        # BASIC FILTER
-        # ======================================================
+        # bar per saham rata kanan: [:, -1] = df.iloc[-1]
+        bars = panel.compact()[eligible]
 
-        # minimum volume
-        if vol_last < 500_000:
-            failed.append("Low Volume")
+        close = bars[:, :, FIELD_INDEX["CLOSE"]]
+        open_price = bars[:, :, FIELD_INDEX["OPEN"]]
+        high = bars[:, :, FIELD_INDEX["HIGH"]]
+        low = bars[:, :, FIELD_INDEX["LOW"]]
+        volume = bars[:, :, FIELD_INDEX["VOLUME"]]
 
-        # minimum liquidity
-        if traded_value < 3_000_000_000:
-            failed.append("Low Liquidity")
+        # === BAR TERAKHIR YANG ADA TRANSAKSI (get_last_valid_idx) ===
+        traded = volume[:, :-6:-1] > 0
 
-        # trend besar bullish
-        if not bullish_alignment:
-            failed.append("Weak Alignment")
+        idx = np.where(traded.any(axis=1), -1 - traded.argmax(axis=1), -1)
 
-        # MA50 wajib naik
-        if not ma50_uptrend:
-            failed.append("MA50 Downtrend")
+        rows = np.arange(len(bars))
 
-        # boleh sedikit di bawah MA20
-        if distance_ma20 < -4:
-            failed.append("Too Weak Below MA20")
+        col = bars.shape[1] + idx
 
-        # ======================================================
-        # HEALTHY PULLBACK FILTER
-        # ======================================================
+        def at(values, back=0):
+            return values[rows, col - back]
 
-        if distance_ma20 >= 12:
-            failed.append("Too Extended")
+        # === INDICATORS ===
+        ma20 = kernels.rolling_mean(close, 20)
+        ma50 = kernels.rolling_mean(close, 50)
 
-        if pullback_pct <= -18:
-            failed.append("Too Deep Pullback")
+        tail20 = close[:, -20:]
 
-        # ======================================================
-        # REBOUND FILTER
-        # ======================================================
+        # Series.std / mean (nanops pandas): 2 pass, ddof=1
+        mean20 = tail20.sum(axis=1) / 20
 
-        if rebound_zone >= 35:
-            failed.append("Too Far From Support")
+        std20 = np.sqrt(((mean20[:, None] - tail20) ** 2).sum(axis=1) / 19)
 
-        # ======================================================
-        # REJECT
-        # ======================================================
+        values = {
+            "last_close": at(close),
+            "prev_close": at(close, 1),
+            "last_open": at(open_price),
+            "last_high": at(high),
+            "last_low": at(low),
+            "vol_last": at(volume),
+            "ma5_last": at(kernels.rolling_mean(close, 5)),
+            "ma20_last": at(ma20),
+            "ma50_last": at(ma50),
+            "ma100_last": at(kernels.rolling_mean(close, 100)),
+            "ma20_prev4": at(ma20, 4),
+            "ma50_prev4": at(ma50, 4),
+            "vol_ma20_last": at(kernels.rolling_mean(volume, 20)),
+            "recent_high_5": np.fmax.reduce(high[:, -5:], axis=1),
+            "recent_high_10": np.fmax.reduce(high[:, -10:], axis=1),
+            "recent_low_10": np.fmin.reduce(low[:, -10:], axis=1),
+            "high_14": np.fmax.reduce(high[:, -14:], axis=1),
+            "low_14": np.fmin.reduce(low[:, -14:], axis=1),
+            "close_std_20": std20,
+            "close_mean_20": mean20,
+        }
 
-        if failed:
+        lap("indicators")
 
-            print(
-                f"❌ {kode} -> {', '.join(failed)}"
-            )
+        # === FILTER + SCORE (RULE TABLE YANG SAMA DENGAN COMPUTE) ===
+        metrics = self._features(values)
 
-            return None
+        ns = rules.namespace(
+            metrics,
+            min_daily_volume=self.min_daily_volume,
+            min_daily_value=self.min_daily_value
+        )
 
-        # ======================================================
-        # SCORE
-        # ======================================================
+        score, points = rules.score(ns)
 
-        score = 40
+        table = pd.DataFrame(
+            {**points, "score": score},
+            index=panel.tickers[eligible]
+        )
 
-        # ======================================================
-        # TREND SCORE
-        # ======================================================
+        failures = [
+            (reason, np.broadcast_to(mask, len(table)))
+            for reason, mask in rules.failures(ns)
+        ]
 
-        if bullish_alignment:
-            score += 10
+        results = [None] * len(table)
 
-        if ma20_uptrend:
-            score += 6
-        else:
-            score -= 4
+        # urutan saham sama dengan compute (log reject / debug ikut urut)
+        for i, kode in enumerate(table.index):
 
-        if ma50_uptrend:
-            score += 6
+            failed = [reason for reason, mask in failures if mask[i]]
 
-        if last_close > ma20_last:
-            score += 4
+            if failed:
 
-        # ======================================================
-        # PULLBACK SCORE
-        # ======================================================
+                print(
+                    f"❌ {kode} -> {', '.join(failed)}"
+                )
 
-        if near_ma20:
-            score += 8
+                continue
 
-        if -12 <= pullback_pct <= -2:
-            score += 10
+            results[i] = self._build_result(
+                kode,
+                score[i],
+                {label: int(value[i]) for label, value in points.items()},
+                {name: value[i] for name, value in metrics.items()}
+            )
 
-        elif -18 <= pullback_pct <= -12:
-            score += 4
+        table["result"] = results
 
-        # ======================================================
-        # REBOUND SCORE
-        # ======================================================
+        lap("scoring")
 
-        if lower_wick >= 4:
-            score += 8
+        return table
 
-        elif lower_wick >= 2:
-            score += 4
+    # ======================================================
+    # FEATURES (VARIABEL RULE, SKALAR ATAU ARRAY)
+    # ======================================================
 
-        # ======================================================
-        # VOLUME SCORE
-        # ======================================================
+    @staticmethod
+    def _features(values):
 
-        if vol_ratio >= 5:
-            score += 10
+        last_close = values["last_close"]
 
-        elif vol_ratio >= 3:
-            score += 7
+        prev_close = values["prev_close"]
 
-        elif vol_ratio >= 2:
-            score += 5
+        last_open = values["last_open"]
 
-        elif vol_ratio >= 1.2:
-            score += 2
+        last_high = values["last_high"]
 
-        # ======================================================
-        # LIQUIDITY SCORE
-        # ======================================================
+        last_low = values["last_low"]
 
-        if traded_value >= 100_000_000_000:
-            score += 6
+        vol_last = values["vol_last"]
 
-        elif traded_value >= 50_000_000_000:
-            score += 4
+        ma20_last = values["ma20_last"]
 
-        elif traded_value >= 20_000_000_000:
-            score += 2
+        ma50_last = values["ma50_last"]
 
-        # ======================================================
-        # VOLATILITY SCORE
-        # ======================================================
+        ma100_last = values["ma100_last"]
 
-        # volatility sehat
-        if 10 <= atr_pct <= 20:
-            score += 5
+        recent_high_5 = values["recent_high_5"]
 
-        elif 8 <= atr_pct < 10:
-            score += 3
+        recent_high_10 = values["recent_high_10"]
 
-        # terlalu liar jangan terlalu dibonusin
-        elif atr_pct > 20:
-            score += 2
+        recent_low_10 = values["recent_low_10"]
 
-        # ======================================================
-        # MOMENTUM BONUS
-        # ======================================================
+        return {
 
-        if 1 <= return_pct <= 5:
-            score += 5
+            **values,
 
-        elif 0 <= return_pct < 1:
-            score += 2
+            # ================= VOLUME / LIQUIDITY =================
+            "vol_ratio": vol_last / np.maximum(values["vol_ma20_last"], 1),
 
-        # ======================================================
-        # HEALTHY CANDLE BONUS
-        # ======================================================
+            "traded_value": last_close * vol_last,
 
-        if body_pct >= 2:
-            score += 3
+            # ================= PRICE ACTION =================
+            "return_pct": (
+                (last_close - prev_close)
+                / np.maximum(prev_close, 1)
+            ) * 100,
 
-        if close_near_high <= 1:
-            score += 3
+            "distance_ma20": (
+                (last_close - ma20_last)
+                / np.maximum(ma20_last, 1)
+            ) * 100,
 
-        # ======================================================
-        # PENALTY
-        # ======================================================
+            "distance_ma50": (
+                (last_close - ma50_last)
+                / np.maximum(ma50_last, 1)
+            ) * 100,
 
-        # ======================================================
-        # TOO EXTENDED
-        # ======================================================
+            "distance_ma100": (
+                (last_close - ma100_last)
+                / np.maximum(ma100_last, 1)
+            ) * 100,
 
-        if distance_ma20 >= 12:
-            score -= 15
+            # ================= PULLBACK =================
+            "pullback_pct": (
+                (last_close - recent_high_5)
+                / np.maximum(recent_high_5, 1)
+            ) * 100,
 
-        elif distance_ma20 >= 10:
-            score -= 10
+            "rebound_zone": (
+                (last_close - recent_low_10)
+                / np.maximum(recent_low_10, 1)
+            ) * 100,
 
-        elif distance_ma20 >= 8:
-            score -= 5
+            # ================= CANDLE =================
+            "body_pct": (
+                np.abs(last_close - last_open)
+                / np.maximum(last_open, 1)
+            ) * 100,
 
-        # ======================================================
-        # WEAK VOLUME
-        # ======================================================
+            "upper_wick": (
+                (last_high - np.maximum(last_open, last_close))
+                / np.maximum(last_close, 1)
+            ) * 100,
 
-        if vol_ratio < 0.8:
-            score -= 8
+            "lower_wick": (
+                (np.minimum(last_open, last_close) - last_low)
+                / np.maximum(last_low, 1)
+            ) * 100,
 
-        elif vol_ratio < 1:
-            score -= 5
+            "close_near_high": (
+                (last_high - last_close)
+                / np.maximum(last_close, 1)
+            ) * 100,
 
-        # ======================================================
-        # UPPER WICK
-        # ======================================================
+            # ================= VOLATILITY =================
+            "atr_pct": (
+                (values["high_14"] - values["low_14"])
+                / np.maximum(last_close, 1)
+            ) * 100,
 
-        if upper_wick >= 7:
-            score -= 12
+            "trend_stability": (
+                values["close_std_20"]
+                / np.maximum(values["close_mean_20"], 1)
+            ) * 100,
 
-        elif upper_wick >= 5:
-            score -= 8
+            # ================= TREND =================
+            "bullish_alignment": (
+                (ma20_last > ma50_last) &
+                (ma50_last > ma100_last)
+            ),
 
-        elif upper_wick >= 3:
-            score -= 4
+            "ma20_uptrend": ma20_last > values["ma20_prev4"],
 
-        # ======================================================
-        # SMALL BODY
-        # ======================================================
+            "ma50_uptrend": ma50_last > values["ma50_prev4"],
 
-        if body_pct < 0.3:
-            score -= 8
+            "distance_high_10": (
+                (recent_high_10 - last_close)
+                / np.maximum(last_close, 1)
+            ) * 100,
 
-        elif body_pct < 0.5:
-            score -= 5
+        }
 
-        # ======================================================
-        # LOW LIQUIDITY
-        # ======================================================
+    # ======================================================
+    # RESULT (DIPAKAI COMPUTE & ANALYZE_PANEL)
+    # ======================================================
 
-        if traded_value < 3_000_000_000:
-            score -= 15
+    def _build_result(self, kode, score, score_points, metrics):
 
-        elif traded_value < 5_000_000_000:
-            score -= 10
+        score = int(score)
 
-        elif traded_value < 10_000_000_000:
-            score -= 5
+        last_close = float(metrics["last_close"])
 
-        # ======================================================
-        # LOW VOLATILITY
-        # ======================================================
+        ma5_last = float(metrics["ma5_last"])
 
-        if atr_pct < 4:
-            score -= 18
+        ma20_last = float(metrics["ma20_last"])
 
-        elif atr_pct < 5:
-            score -= 15
+        recent_high_10 = float(metrics["recent_high_10"])
 
-        elif atr_pct < 8:
-            score -= 8
+        recent_low_10 = float(metrics["recent_low_10"])
 
-        # ======================================================
-        # TREND STABILITY
-        # ======================================================
+        vol_last = float(metrics["vol_last"])
 
-        if trend_stability >= 25:
-            score -= 20
+        traded_value = float(metrics["traded_value"])
 
-        elif trend_stability >= 20:
-            score -= 12
+        vol_ratio = float(metrics["vol_ratio"])
 
-        elif trend_stability >= 15:
-            score -= 6
+        atr_pct = float(metrics["atr_pct"])
 
-        # ======================================================
-        # TOO CLOSE TO RESISTANCE
-        # ======================================================
+        return_pct = float(metrics["return_pct"])
 
-        distance_high_10 = (
-            (recent_high_10 - last_close)
-            / max(last_close, 1)
-        ) * 100
+        pullback_pct = float(metrics["pullback_pct"])
 
-        if distance_high_10 <= 1:
-            score -= 10
+        distance_ma20 = float(metrics["distance_ma20"])
 
-        elif distance_high_10 <= 2:
-            score -= 5
+        distance_ma50 = float(metrics["distance_ma50"])
 
-        # ======================================================
-        # WEAK REBOUND STRUCTURE
-        # ======================================================
+        distance_ma100 = float(metrics["distance_ma100"])
 
-        if lower_wick < 1 and return_pct <= 0:
-            score -= 5
+        lower_wick = float(metrics["lower_wick"])
 
-        # ======================================================
-        # SIDEWAYS / DEAD STOCK
-        # ======================================================
+        upper_wick = float(metrics["upper_wick"])
 
-        if abs(return_pct) < 0.3 and atr_pct < 6:
-            score -= 8
+        close_near_high = float(metrics["close_near_high"])
 
-        # ======================================================
-        # NORMALIZE
-        # ======================================================
-
-        score = int(
-            max(
-                0,
-                min(score, 99)
-            )
-        )
+        body_pct = float(metrics["body_pct"])
 
         # ======================================================
         # STATUS
@@ -803,7 +728,9 @@ class SwingTradeWeekScreener(BaseScreener):
                 "Body %": round(body_pct, 2),
 
                 "RR": rr
-            }
+            },
+
+            score_points=score_points
         )
 
 # ======================================================
@@ -814,23 +741,19 @@ def calculate_swing_trade_score(df):
 
     try:
 
+        # frame kanonik dari loader -> tanpa copy
+        df = as_ohlcv(df)
+
         if df is None or len(df) < 100:
             return 0
 
-        df = df.copy()
-
-        df.columns = [
-            str(c).strip().lower()
-            for c in df.columns
-        ]
-
-        close = df["close"]
+        close = df["CLOSE"]
 
-        high = df["high"]
+        high = df["HIGH"]
 
-        low = df["low"]
+        low = df["LOW"]
 
-        volume = df["volume"]
+        volume = df["VOLUME"]
 
         idx = get_last_valid_idx(volume)
 
@@ -842,11 +765,9 @@ def calculate_swing_trade_score(df):
         # MOVING AVERAGE
         # ======================================================
 
-        ma20 = close.rolling(20).mean()
-
-        ma50 = close.rolling(50).mean()
+        features = FEATURE_STORE.frame(df)
 
-        ma100 = close.rolling(100).mean()
+        ma20, ma50, ma100 = features.get("ma20", "ma50", "ma100")
 
         ma20_last = float(ma20.iloc[idx])
 
@@ -858,7 +779,7 @@ def calculate_swing_trade_score(df):
         # VOLUME
         # ======================================================
 
-        vol_ma20 = volume.rolling(20).mean()
+        vol_ma20 = features["vol_ma20"]
 
         vol_ratio = (
             volume.iloc[idx]
@@ -879,7 +800,7 @@ def calculate_swing_trade_score(df):
         ) * 100
 
         recent_high_5 = float(
-            high.tail(5).max()
+            features.high(5)
         )
 
         pullback_pct = (
@@ -892,7 +813,7 @@ def calculate_swing_trade_score(df):
         # ======================================================
 
         atr_pct = (
-            (high.tail(14).max() - low.tail(14).min())
+            (features.high(14) - features.low(14))
             / max(last_close, 1)
         ) * 100
 
@@ -1,5 +1,9 @@
-import yfinance as yf
-import pandas as pd
+from app.core.bar_store import BAR_STORE
+from app.core.fetcher import adjust_prices
+from app.core.ohlcv import normalize_ohlcv
+from app.core.price_cache import PRICE_CACHE, expires_at
+from app.core.quarantine import QUARANTINE
+from app.core.scan_report import stage
 
 
 # ================= NORMALIZE TICKER =================
@@ -27,30 +31,101 @@ def get_price_data(ticker):
 
     symbol = normalize_ticker(ticker)
 
+    # ticker mati / suspend -> skip tanpa request
+    if QUARANTINE.is_blocked(symbol):
+        return None
+
+    # frame dipakai bersama (cache) -> jangan di-mutate
+    return PRICE_CACHE.get_or_load(
+        (symbol, "10d", "15m", True),
+        lambda: _load_price_df(symbol),
+        interval="15m"
+    )
+
+
+def _load_price_df(symbol):
+
+    # store dulu, network cuma buat bar 15m yang belum ada
     try:
-        df = yf.download(
-            symbol,
-            period="10d",
-            interval="15m",
-            progress=False,
-            threads=False
-        )
+        df = BAR_STORE.load(symbol, "10d", "15m")
     except Exception as e:
         print("YF ERROR:", symbol, e)
-        return None
+        df = None
 
     if df is None or df.empty:
         print("EMPTY DATA:", symbol)
+        QUARANTINE.track(symbol, None)
         return None
 
-    # ================= FIX MULTIINDEX =================
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [col[0] for col in df.columns]
+    df = _format_price_df(adjust_prices(df))
+
+    QUARANTINE.track(symbol, df)
+
+    return df
+
+
+# ================= FORMAT COLUMN =================
+def _format_price_df(df):
+
+    # format kanonik (OPEN..VOLUME float64, index tz Jakarta)
+    # bar 15m yang belum lengkap tetap dipertahankan
+    with stage("normalize"):
+        return normalize_ohlcv(df, dropna=False)
+
+
+# ================= BATCH (PREFETCH) =================
+def get_price_data_batch(tickers, period="10d", interval="15m"):
+
+    """
+    Prefetch banyak ticker sekaligus.
+    Return dict {ticker: df} dengan format sama seperti get_price_data.
+    """
+
+    frames = {}
+
+    symbols = {}
+
+    # ================= CACHE =================
+    for t in tickers:
+
+        symbol = normalize_ticker(t)
+
+        if QUARANTINE.is_blocked(symbol):
+            continue
+
+        df = PRICE_CACHE.get((symbol, period, interval, True))
+
+        if df is not None:
+            frames[t] = df
+        else:
+            symbols[symbol] = t
+
+    if not symbols:
+        return frames
+
+    # ================= STORE / NETWORK =================
+    raw_frames = BAR_STORE.load_many(
+        list(symbols),
+        period,
+        interval
+    )
+
+    expiry = expires_at(interval)
+
+    for symbol in symbols:
+
+        df = raw_frames.get(symbol)
+
+        if df is not None and not df.empty:
+            df = _format_price_df(adjust_prices(df))
+
+        QUARANTINE.track(symbol, df)
+
+        if df is None or df.empty:
+            continue
 
-    df.columns = [str(c).upper().strip() for c in df.columns]
+        frames[symbols[symbol]] = df
 
-    # ================= CLEAN COLUMN =================
-    if "ADJ CLOSE" in df.columns:
-        df = df.rename(columns={"ADJ CLOSE": "CLOSE"})
+        PRICE_CACHE.put((symbol, period, interval, True), df, expiry)
 
-    return df
\ No newline at end of file
+    return frames
\ No newline at end of file
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.core.features import FEATURE_STORE
+
 
 # ================= PRICE ROUNDING =================
 def round_price(price):
@@ -49,7 +51,7 @@ def detect_market_mover(df):
 
 
 # ================= EARLY BREAKOUT DETECTOR =================
-def detect_early_breakout(df):
+def detect_early_breakout(df, features=None):
 
     """
     Detect compression near resistance before breakout
@@ -58,6 +60,9 @@ def detect_early_breakout(df):
     if df is None or len(df) < 20:
         return False
 
+    if features is None:
+        features = FEATURE_STORE.frame(df, interval="15m")
+
     close = df["CLOSE"]
     high = df["HIGH"]
     low = df["LOW"]
@@ -65,7 +70,7 @@ def detect_early_breakout(df):
 
     price = close.iloc[-1]
 
-    resistance = high.tail(15).max()
+    resistance = features.high(15)
 
     # dekat resistance
     near_resistance = price >= resistance * 0.97
@@ -89,11 +94,19 @@ def detect_early_breakout(df):
 
 
 # ================= MAIN LOGIC =================
-def detect_day_trade(df):
+def detect_day_trade(df, features=None):
+
+    """
+    features: FeatureFrame df (FEATURE_STORE.frame) dari pemanggil,
+    supaya MA tidak dihitung ulang. None -> dibuat di sini.
+    """
 
     if df is None or len(df) < 50:
         return None
 
+    if features is None:
+        features = FEATURE_STORE.frame(df, interval="15m")
+
     close = df["CLOSE"]
     high = df["HIGH"]
     low = df["LOW"]
@@ -102,8 +115,8 @@ def detect_day_trade(df):
     price = close.iloc[-1]
 
     # ================= LEVEL =================
-    recent_high = high.tail(30).max()
-    recent_low = low.tail(30).min()
+    recent_high = features.high(30)
+    recent_low = features.low(30)
 
     entry_high = round_price(recent_high * 1.01)
     entry_low = round_price(entry_high * 0.985)
@@ -112,8 +125,8 @@ def detect_day_trade(df):
     sl = round_price(max(recent_low, entry_ref * 0.95))
 
     # ================= MOVING AVERAGE =================
-    ma20 = close.rolling(20).mean().iloc[-1]
-    ma50 = close.rolling(50).mean().iloc[-1]
+    ma20 = features.last("ma20")
+    ma50 = features.last("ma50")
 
     # ================= VOLUME =================
     avg_vol = volume.iloc[-30:-10].mean()
@@ -126,7 +139,7 @@ def detect_day_trade(df):
     up_count = (close.diff() > 0).tail(10).sum()
 
     # ================= EARLY BREAKOUT =================
-    early_break = detect_early_breakout(df)
+    early_break = detect_early_breakout(df, features)
 
     # ================= ARB DETECTION =================
     prev_close = close.iloc[-2]
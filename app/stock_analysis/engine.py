@@ -1,35 +1,35 @@
 import pandas as pd
 
+from app.core.features import FEATURE_STORE
+from app.core.ohlcv import as_ohlcv
+
 
 # ==========================================================
 # 📉 GAP FILL RATE
 # ==========================================================
 def calculate_gap_fill_rate(df):
 
+    # frame kanonik dari loader -> tanpa copy / rename
+    df = as_ohlcv(df)
+
     if df is None or df.empty:
         return 0
 
-    df = df.copy()
-
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [c[0] for c in df.columns]
-
-    df.columns = [str(c).upper().strip() for c in df.columns]
-
-    if not all(col in df.columns for col in ["OPEN", "HIGH", "LOW"]):
-        return 0
+    open_ = df["OPEN"].to_numpy()
+    high = df["HIGH"].to_numpy()
+    low = df["LOW"].to_numpy()
 
     gaps = []
 
     for i in range(1, len(df)):
-        prev_high = df.iloc[i - 1]["HIGH"]
+        prev_high = high[i - 1]
 
-        if df.iloc[i]["OPEN"] > prev_high:
+        if open_[i] > prev_high:
 
             filled = False
 
             for j in range(i, min(i + 10, len(df))):
-                if df.iloc[j]["LOW"] <= prev_high:
+                if low[j] <= prev_high:
                     filled = True
                     break
 
@@ -46,22 +46,22 @@ def calculate_gap_fill_rate(df):
 # ==========================================================
 def get_support_levels(df_price, result):
 
-    if df_price is None or df_price.empty:
-        return [], pd.DataFrame()
-
-    df = df_price.copy()
+    df = as_ohlcv(df_price)
 
-    df.columns = [str(c).upper().strip() for c in df.columns]
+    if df is None or df.empty:
+        return [], pd.DataFrame()
 
     last_price = result.get("last_price")
 
     major_support = result.get("support")
 
+    levels = FEATURE_STORE.frame(df)
+
     # 🔹 minor support (20 hari)
-    minor_support = df["LOW"].tail(20).min() if "LOW" in df.columns else None
+    minor_support = levels.low(20)
 
     # 🔹 micro support (7 hari)
-    micro_support = df["LOW"].tail(7).min() if "LOW" in df.columns else None
+    micro_support = levels.low(7)
 
     supports = []
 
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from app.core.ohlcv import as_ohlcv
+
 
 # ==========================================================
 # 📉 MINOR SUPPORT
@@ -42,45 +44,19 @@ def calc_minor_support(df, lookback=12):
 # ==========================================================
 def clean_price_df(df):
 
-    if df is None:
-        return None
-
-    df = df.copy()
-
-    # ===== FLATTEN MULTI INDEX =====
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [" ".join(col).upper() for col in df.columns]
-    else:
-        df.columns = [str(c).upper().strip() for c in df.columns]
-
-    # ===== NORMALIZE OHLC =====
-    col_map = {}
-
-    for col in df.columns:
-        c = col.upper()
-
-        if "OPEN" in c:
-            col_map[col] = "OPEN"
-        elif "HIGH" in c:
-            col_map[col] = "HIGH"
-        elif "LOW" in c:
-            col_map[col] = "LOW"
-        elif "CLOSE" in c:
-            col_map[col] = "CLOSE"
+    """
+    Frame kanonik (OHLCV float64, index tz Jakarta).
+    Frame dari loader dikembalikan apa adanya (zero-copy),
+    format lain dinormalisasi dulu.
+    """
 
-    df = df.rename(columns=col_map)
+    df = as_ohlcv(df)
 
-    # ===== VALIDATE =====
-    if "CLOSE" not in df.columns:
+    if df is None:
         return None
 
-    # ===== NUMERIC =====
-    for col in ["OPEN", "HIGH", "LOW", "CLOSE"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df = df.dropna(subset=["CLOSE"])
-    df = df.sort_index()
+    if df["CLOSE"].hasnans:
+        df = df.dropna(subset=["CLOSE"])
 
     return df
 
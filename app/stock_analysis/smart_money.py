@@ -1,4 +1,4 @@
-import pandas as pd
+from app.core.ohlcv import as_ohlcv
 
 
 # ==========================================================
@@ -6,74 +6,35 @@ import pandas as pd
 # ==========================================================
 def calculate_smart_money(df):
 
-    if df is None or df.empty:
-        return None
-
-    df = df.copy()
-
-    # ================= NORMALIZE COLUMN =================
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [c[0] for c in df.columns]
+    # frame kanonik dari loader -> tanpa copy / rename
+    df = as_ohlcv(df)
 
-    df.columns = [str(c).upper().strip() for c in df.columns]
-
-    # ================= MAP COLUMN =================
-    col_map = {}
-    for col in df.columns:
-        if "OPEN" in col: col_map["OPEN"] = col
-        elif "CLOSE" in col: col_map["CLOSE"] = col
-        elif "VOLUME" in col: col_map["VOLUME"] = col
-        elif "HIGH" in col: col_map["HIGH"] = col
-        elif "LOW" in col: col_map["LOW"] = col
-
-    required = ["OPEN", "CLOSE", "VOLUME"]
-    if not all(k in col_map for k in required):
+    if df is None or df.empty:
         return None
 
-    df = df.rename(columns={
-        col_map["OPEN"]: "OPEN",
-        col_map["CLOSE"]: "CLOSE",
-        col_map["VOLUME"]: "VOLUME",
-        **({col_map["HIGH"]: "HIGH"} if "HIGH" in col_map else {}),
-        **({col_map["LOW"]: "LOW"} if "LOW" in col_map else {}),
-    })
-
-    for col in ["OPEN", "CLOSE", "VOLUME"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df = df.dropna(subset=["OPEN", "CLOSE", "VOLUME"])
-
-    if df.empty:
-        return None
+    close = df["CLOSE"]
 
     # ================= CORE =================
-    df["VALUE"] = df["CLOSE"] * df["VOLUME"]
+    value = close * df["VOLUME"]
 
     # ================= AVP =================
-    if "HIGH" in df.columns and "LOW" in df.columns:
-        df["AVP"] = (df["OPEN"] + df["HIGH"] + df["LOW"] + df["CLOSE"]) / 4
-    else:
-        df["AVP"] = (df["OPEN"] + df["CLOSE"]) / 2
+    avp = (df["OPEN"] + df["HIGH"] + df["LOW"] + close) / 4
 
     # ================= SMART MONEY (IMPROVED) =================
-    if "HIGH" in df.columns and "LOW" in df.columns:
-        spread = (df["HIGH"] - df["LOW"]).replace(0, 1)
-        close_pos = (df["CLOSE"] - df["LOW"]) / spread
-        close_pos = close_pos.clip(0.2, 0.8)
-    else:
-        close_pos = (df["CLOSE"] > df["OPEN"]).astype(float)
+    spread = (df["HIGH"] - df["LOW"]).replace(0, 1)
+    close_pos = (close - df["LOW"]) / spread
+    close_pos = close_pos.clip(0.2, 0.8)
 
-    df["SMART"] = df["VALUE"] * close_pos
-    df["BAD"] = df["VALUE"] * (1 - close_pos)
-    df["BAD"] = -df["BAD"]
+    smart = value * close_pos
+    bad = -(value * (1 - close_pos))
 
-    df["CLEAN"] = df["SMART"] + df["BAD"]
+    clean = smart + bad
 
-    df["GAIN (%)"] = df["CLOSE"].pct_change() * 100
+    gain = close.pct_change() * 100
 
     # ================= RCV =================
-    df["RCV"] = (df["CLEAN"] / df["VALUE"]) * 100
-    df["RCV"] = df["RCV"].fillna(0).clip(-100, 100).round(0)
+    rcv = (clean / value) * 100
+    rcv = rcv.fillna(0).clip(-100, 100).round(0)
 
     # ================= SIGNAL =================
     def get_signal(rcv):
@@ -88,13 +49,25 @@ def calculate_smart_money(df):
         else:
             return "🔴"
 
-    df["SIGNAL"] = df["RCV"].apply(get_signal)
-
     # ================= STREAK =================
-    df["ACC"] = df["CLEAN"] > 0
-    df["STREAK"] = df["ACC"].astype(int).groupby((~df["ACC"]).cumsum()).cumsum()
-
-    sm_df = df.tail(10)
+    acc = clean > 0
+    streak = acc.astype(int).groupby((~acc).cumsum()).cumsum()
+
+    # cuma 10 bar terakhir yang jadi tabel (frame input tidak disentuh)
+    tail = slice(-10, None)
+
+    sm_df = df.iloc[tail].assign(
+        VALUE=value.iloc[tail],
+        AVP=avp.iloc[tail],
+        SMART=smart.iloc[tail],
+        BAD=bad.iloc[tail],
+        CLEAN=clean.iloc[tail],
+        **{"GAIN (%)": gain.iloc[tail]},
+        RCV=rcv.iloc[tail],
+        SIGNAL=rcv.iloc[tail].apply(get_signal),
+        ACC=acc.iloc[tail],
+        STREAK=streak.iloc[tail],
+    )
 
     # ================= SUMMARY =================
     total_value = sm_df["VALUE"].sum()
@@ -113,7 +86,7 @@ def calculate_smart_money(df):
     trend_up = last_half > first_half
 
     # ================= TABLE FORMAT =================
-    display_df = sm_df.copy()
+    display_df = sm_df
 
     display_df["Date"] = display_df.index.strftime("%d-%m-%Y")
     display_df["Tx"] = display_df["VOLUME"]
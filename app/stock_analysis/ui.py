@@ -14,6 +14,7 @@ from .engine import (
     get_entry_plan
 )
 
+from app.core.features import FEATURE_STORE
 from app.utils.news_engine import fetch_stock_news
 from app.utils.market_data import load_price_data
 from app.renderers.telegram_stock_analysis import render_stock_analysis_message
@@ -121,9 +122,11 @@ def render_stock_analysis():
 
     last_price = df_price["CLOSE"].iloc[-1]
 
-    ma200 = df_price["CLOSE"].rolling(200).mean().iloc[-1] if len(df_price) >= 200 else None
-    ma50 = df_price["CLOSE"].rolling(50).mean().iloc[-1] if len(df_price) >= 50 else None
-    std = df_price["CLOSE"].rolling(200).std().iloc[-1] if len(df_price) >= 200 else None
+    features = FEATURE_STORE.frame(df_price)
+
+    ma200 = features["ma200"].iloc[-1] if len(df_price) >= 200 else None
+    ma50 = features["ma50"].iloc[-1] if len(df_price) >= 50 else None
+    std = features["std200"].iloc[-1] if len(df_price) >= 200 else None
 
     z_score = (last_price - ma200) / std if ma200 and std else None
 
@@ -137,31 +140,17 @@ def render_stock_analysis():
     trend = result.get("trend", "-")
     st.markdown(f"### {trend}")
 
-    # ======================================================
-    # CLEAN COLUMNS
-    # ======================================================
-
-    df_price.columns = [
-        c[0] if isinstance(c, tuple) else c
-        for c in df_price.columns
-    ]
-
-    df_price.columns = [
-        str(c).upper()
-        for c in df_price.columns
-    ]
+    # df_price sudah kanonik (clean_price_df) & dipakai bersama
+    # dengan cache -> kolom JANGAN di-rename di sini
 
     # ======================================================
     # ATR
     # ======================================================
 
-    high = df_price["HIGH"]
-    low = df_price["LOW"]
-
     atr_pct = (
         (
-            high.tail(14).max()
-            - low.tail(14).min()
+            features.high(14)
+            - features.low(14)
         )
         / max(last_price, 1)
     ) * 100
@@ -125,7 +125,7 @@ def enrich_trades(df: pd.DataFrame) -> pd.DataFrame:
         last_price = 0
         df_price = load_daily_data(kode)
         if df_price is not None and not df_price.empty:
-            last_price = to_int_safe(df_price["Close"].iloc[-1])
+            last_price = to_int_safe(df_price["CLOSE"].iloc[-1])
 
         # ===== SAFE VALUES =====
         buy_price = to_int_safe(row.get("buy_price"))
@@ -1,6 +1,9 @@
 import numpy as np
 import pandas as pd
 
+from app.core.features import FEATURE_STORE
+from app.core.ohlcv import is_ohlcv
+
 
 # ==========================================================
 # =================== HELPER: TICK ROUND ===================
@@ -46,7 +49,7 @@ def analyze_cycle(df):
     if df is None or len(df) < 200:
         return None
 
-    close = df["Close"]
+    close = df["CLOSE"]
 
     if hasattr(close, "columns"):
         close = close.iloc[:, 0]
@@ -84,7 +87,8 @@ def analyze_cycle(df):
 
 
     last_low_date = dates[-1]
-    today = pd.Timestamp.today()
+    # index kanonik tz-aware (Jakarta) -> today ikut tz yang sama
+    today = pd.Timestamp.now(tz=last_low_date.tz)
 
     # ===============================
     # PROYEKSI LOW
@@ -171,7 +175,7 @@ def analyze_cycle(df):
 # =================== MAIN ANALYSIS ENGINE =================
 # ==========================================================
 def analyze_single_stock(df):
-    close = df["Close"]
+    close = df["CLOSE"]
 
     if hasattr(close, "columns"):
         close = close.iloc[:, 0]
@@ -179,15 +183,24 @@ def analyze_single_stock(df):
     close = close.astype(float)
 
     # === MOVING AVERAGE ===
-    ma20 = close.rolling(20).mean()
-    ma50 = close.rolling(50).mean()
+    features = FEATURE_STORE.frame(df) if is_ohlcv(df) else None
+
+    if features is not None:
+        ma20, ma50 = features.get("ma20", "ma50")
+    else:
+        ma20 = close.rolling(20).mean()
+        ma50 = close.rolling(50).mean()
 
     ma20_last = float(ma20.iloc[-1])
     ma50_last = float(ma50.iloc[-1])
 
     # === PRICE STRUCTURE ===
-    support = round_to_tick(close.tail(30).min())
-    resistance = round_to_tick(close.tail(30).max())
+    if features is not None:
+        support = round_to_tick(features.level("CLOSE", "min", 30))
+        resistance = round_to_tick(features.level("CLOSE", "max", 30))
+    else:
+        support = round_to_tick(close.tail(30).min())
+        resistance = round_to_tick(close.tail(30).max())
     last_price = round_to_tick(close.iloc[-1])
 
     price = last_price
@@ -1,4 +1,10 @@
-import yfinance as yf
+import pandas as pd
+
+from app.core.bar_store import BAR_STORE
+from app.core.fetcher import adjust_prices
+from app.core.ohlcv import normalize_ohlcv
+from app.core.price_cache import PRICE_CACHE
+
 
 def load_price_data(ticker, period="5y", interval="1d"):
 
@@ -10,12 +16,26 @@ def load_price_data(ticker, period="5y", interval="1d"):
     else:
         symbol = f"{ticker}.JK"
 
-    df = yf.download(
-        symbol,
-        period=period,
+    # frame dipakai bersama (cache) -> jangan di-mutate
+    df = PRICE_CACHE.get_or_load(
+        (symbol, period, interval, True),
+        lambda: _load_adjusted(symbol, period, interval),
         interval=interval
     )
 
-    df = df.dropna()
+    if df is None:
+        return pd.DataFrame()
+
+    return df
+
+
+def _load_adjusted(symbol, period, interval):
+
+    # store dulu, network cuma buat bar yang belum ada
+    df = BAR_STORE.load(symbol, period, interval)
+
+    if df is None:
+        return None
 
-    return df
\ No newline at end of file
+    # sama dengan default yf.download (auto_adjust=True)
+    return normalize_ohlcv(adjust_prices(df))
\ No newline at end of file
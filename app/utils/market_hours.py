@@ -0,0 +1,98 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+
+# ==========================================================
+# IDX SESSION
+# ==========================================================
+
+TZ = ZoneInfo("Asia/Jakarta")
+
+SESSION_OPEN = time(9, 0)
+
+SESSION_CLOSE = time(16, 0)
+
+# setelah close, bar daily Yahoo belum langsung final
+# (kadang masih bar berjalan / belum di-update)
+CLOSE_GRACE = timedelta(minutes=45)
+
+
+def now_jkt():
+
+    return datetime.now(TZ)
+
+
+def _to_jkt(now):
+
+    if now is None:
+        return now_jkt()
+
+    if now.tzinfo is None:
+        return now.replace(tzinfo=TZ)
+
+    return now.astimezone(TZ)
+
+
+def is_trading_day(d):
+
+    # libur bursa belum dihitung, cukup weekday
+    return d.weekday() < 5
+
+
+# ==========================================================
+# MARKET OPEN
+# ==========================================================
+
+def is_market_open(now=None):
+
+    now = _to_jkt(now)
+
+    return (
+        is_trading_day(now.date())
+        and SESSION_OPEN <= now.time() < SESSION_CLOSE
+    )
+
+
+def is_settling(now=None):
+
+    """Sesi baru tutup (< CLOSE_GRACE), bar hari ini mungkin belum final."""
+
+    now = _to_jkt(now)
+
+    close = datetime.combine(now.date(), SESSION_CLOSE, TZ)
+
+    return (
+        is_trading_day(now.date())
+        and close <= now < close + CLOSE_GRACE
+    )
+
+
+# ==========================================================
+# NEXT SESSION BOUNDARY
+# ==========================================================
+
+def next_session_boundary(now=None):
+
+    """
+    Open / close sesi berikutnya (> now), mana yang lebih dulu.
+
+    - saat market buka   -> close hari ini
+    - setelah close      -> open hari bursa berikutnya
+    """
+
+    now = _to_jkt(now)
+
+    d = now.date()
+
+    while True:
+
+        if is_trading_day(d):
+
+            for t in (SESSION_OPEN, SESSION_CLOSE):
+
+                boundary = datetime.combine(d, t, TZ)
+
+                if boundary > now:
+                    return boundary
+
+        d += timedelta(days=1)
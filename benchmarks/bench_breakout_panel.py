@@ -0,0 +1,126 @@
+"""
+Benchmark BreakoutScreener: compute per saham vs analyze_panel.
+
+    python benchmarks/bench_breakout_panel.py            # data sintetis
+    python benchmarks/bench_breakout_panel.py --live     # SAHAM_LIST via loader
+
+Hasil kedua jalur harus identik (dicek di akhir).
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.core.features import FEATURE_STORE
+from app.core.ohlcv import OHLCV_COLUMNS, TZ_NAME
+from app.core.panel import UniversePanel
+from app.screeners.breakout import BreakoutScreener
+
+
+# ======================================================
+# DATA
+# ======================================================
+
+def synthetic_frames(n=950, bars=125, seed=7):
+
+    """Random walk harga IDX, panjang history beda-beda."""
+
+    rng = np.random.default_rng(seed)
+
+    dates = pd.bdate_range(end="2026-10-16", periods=bars, tz=TZ_NAME)
+
+    frames = {}
+
+    for i in range(n):
+
+        length = int(rng.integers(20, bars + 1))
+
+        close = rng.choice([80, 500, 3000]) * np.exp(
+            np.cumsum(rng.normal(0.002, 0.025, length))
+        )
+
+        spread = np.abs(rng.normal(0, 0.01, length)) * close
+
+        frames[f"S{i:03d}"] = pd.DataFrame(
+            {
+                "OPEN": close + rng.normal(0, 0.3, length) * spread,
+                "HIGH": close + spread,
+                "LOW": close - spread,
+                "CLOSE": close,
+                "VOLUME": rng.integers(1, 50, length) * 100_000.0,
+            },
+            index=dates[-length:]
+        )[OHLCV_COLUMNS]
+
+    return frames
+
+
+def live_frames():
+
+    from app.config.saham_list import SAHAM_LIST
+    from app.core.data_loader import load_daily_data_batch
+
+    return load_daily_data_batch(SAHAM_LIST)
+
+
+# ======================================================
+# RUN
+# ======================================================
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = live_frames() if args.live else synthetic_frames()
+
+    screener = BreakoutScreener()
+
+    print(f"universe: {len(frames)} saham")
+
+    # ================= PER SAHAM =================
+    start = time.perf_counter()
+
+    for _ in range(args.repeat):
+
+        # indikator dihitung ulang tiap putaran (bukan dari FeatureStore)
+        FEATURE_STORE.invalidate()
+
+        loop_results = [screener.compute(kode, df) for kode, df in frames.items()]
+
+    loop_time = (time.perf_counter() - start) / args.repeat
+
+    # ================= PANEL =================
+    start = time.perf_counter()
+
+    for _ in range(args.repeat):
+        panel = UniversePanel.from_frames(frames)
+        table = screener.analyze_panel(panel)
+
+    panel_time = (time.perf_counter() - start) / args.repeat
+
+    # ================= PARITY =================
+    expected = {r.kode: r for r in loop_results if r is not None}
+
+    actual = {r.kode: r for r in table["result"].dropna()}
+
+    assert expected == actual, "hasil panel != compute per saham"
+
+    print(f"lolos filter : {len(actual)} saham (identik)")
+    print(f"per saham    : {loop_time * 1000:.1f} ms")
+    print(f"panel        : {panel_time * 1000:.1f} ms")
+    print(f"speedup      : {loop_time / panel_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark kernel 2-D (app.core.kernels) vs indikator per Series.
+
+    python benchmarks/bench_kernels.py                 # 1000 saham sintetis
+    python benchmarks/bench_kernels.py --n 2000 --bars 250
+    python benchmarks/bench_kernels.py --live          # SAHAM_LIST via loader
+
+Hasil kernel harus identik (bit per bit) dengan versi pandas.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
+
+from app.core import indicators, kernels
+from app.core.panel import FIELD_INDEX, UniversePanel
+
+from bench_breakout_panel import live_frames, synthetic_frames
+
+
+# ======================================================
+# INDIKATOR (NAMA, PER SERIES, KERNEL)
+# ======================================================
+
+# per series: fungsi(df) -> Series
+# kernel    : fungsi(fields {kolom: array (N, T)}) -> array (N, T)
+CASES = {
+    "ema20": (
+        lambda df: indicators.ema(df["CLOSE"], 20),
+        lambda f: kernels.ema(f["CLOSE"], 20),
+    ),
+    "rsi14": (
+        lambda df: indicators.rsi(df["CLOSE"], 14),
+        lambda f: kernels.rsi(f["CLOSE"], 14),
+    ),
+    "macd": (
+        lambda df: indicators.macd(df["CLOSE"])[0],
+        lambda f: kernels.macd(f["CLOSE"])[0],
+    ),
+    "sma20": (
+        lambda df: df["CLOSE"].rolling(20).mean(),
+        lambda f: kernels.sma(f["CLOSE"], 20),
+    ),
+    "vol_ma20": (
+        lambda df: df["VOLUME"].rolling(20).mean(),
+        lambda f: kernels.sma(f["VOLUME"], 20),
+    ),
+    "max20": (
+        lambda df: df["HIGH"].rolling(20).max(),
+        lambda f: kernels.rolling_max(f["HIGH"], 20),
+    ),
+    "min20": (
+        lambda df: df["LOW"].rolling(20).min(),
+        lambda f: kernels.rolling_min(f["LOW"], 20),
+    ),
+    "std20": (
+        lambda df: df["CLOSE"].rolling(20).std(),
+        lambda f: kernels.rolling_std(f["CLOSE"], 20),
+    ),
+}
+
+
+# ======================================================
+# RUN
+# ======================================================
+
+def _timed(fn, repeat):
+
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        out = fn()
+
+    return out, (time.perf_counter() - start) / repeat
+
+
+def main():
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--live", action="store_true")
+    parser.add_argument("--n", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=125)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    frames = (
+        live_frames() if args.live
+        else synthetic_frames(args.n, args.bars)
+    )
+
+    bars = UniversePanel.from_frames(frames).compact()
+
+    fields = {name: bars[:, :, i] for name, i in FIELD_INDEX.items()}
+
+    print(f"universe: {len(frames)} saham x {bars.shape[1]} bar")
+    print(f"{'indikator':<10} {'per series':>12} {'kernel':>10} {'speedup':>8}")
+
+    total_series = total_kernel = 0.0
+
+    for name, (per_series, kernel) in CASES.items():
+
+        series_out, series_time = _timed(
+            lambda: [per_series(df).to_numpy() for df in frames.values()],
+            args.repeat
+        )
+
+        kernel_out, kernel_time = _timed(
+            lambda: kernel(fields),
+            args.repeat
+        )
+
+        # ================= PARITY =================
+        # baris kernel rata kanan: ekor baris = Series saham itu
+        for row, expected in zip(kernel_out, series_out):
+
+            actual = row[len(row) - len(expected):]
+
+            assert np.array_equal(actual, expected, equal_nan=True), (
+                f"{name}: kernel != pandas"
+            )
+
+        total_series += series_time
+        total_kernel += kernel_time
+
+        print(
+            f"{name:<10} {series_time * 1000:>10.1f}ms "
+            f"{kernel_time * 1000:>8.1f}ms "
+            f"{series_time / kernel_time:>7.1f}x"
+        )
+
+    print(
+        f"{'total':<10} {total_series * 1000:>10.1f}ms "
+        f"{total_kernel * 1000:>8.1f}ms "
+        f"{total_series / total_kernel:>7.1f}x (identik)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,15 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+import os
 import logging
 import time
 from datetime import datetime, time as dtime
 from zoneinfo import ZoneInfo
 
 from app.core.scanner import scan_day
+from app.core.runtime import shutdown_runtime
+from app.core.sharding import ShardCoordinator
 
 
 # ==========================================================
@@ -30,6 +33,9 @@ logging.basicConfig(
 # ==========================================================
 INTERVAL = 180  # scan setiap 3 menit
 
+# scan dibagi ke N worker process lokal (0 = 1 proses saja)
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", "0"))
+
 
 # ==========================================================
 # ===================== MARKET TIME =========================
@@ -54,7 +60,7 @@ def is_market_open():
 # ==========================================================
 # ===================== MAIN LOOP ===========================
 # ==========================================================
-def run_bot():
+def run_bot(coordinator=None):
 
     print("🚀 BOT STARTED...")
     logging.info("BOT STARTED")
@@ -93,7 +99,10 @@ def run_bot():
             print(f"\n🕒 Scan Time: {now.strftime('%H:%M:%S')}")
 
             # ================= RUN SCANNER =================
-            df, alerts, state = scan_day(state)
+            if coordinator is not None:
+                df, alerts, state = coordinator.scan_day(state)
+            else:
+                df, alerts, state = scan_day(state)
 
             print(f"📊 Top Result : {len(df)}")
             print(f"🚨 Alerts Sent: {len(alerts)}")
@@ -118,4 +127,17 @@ def run_bot():
 # ===================== ENTRY POINT =========================
 # ==========================================================
 if __name__ == "__main__":
-    run_bot()
\ No newline at end of file
+
+    coordinator = None
+
+    if SHARD_WORKERS:
+        coordinator = ShardCoordinator(local_workers=SHARD_WORKERS).start()
+
+    try:
+        run_bot(coordinator)
+    finally:
+        if coordinator is not None:
+            coordinator.close()
+
+        # stop event loop + thread pool scanner dengan rapi
+        shutdown_runtime()
\ No newline at end of file
@@ -0,0 +1,10 @@
+import pytest
+
+from app.core import scan_report
+
+
+@pytest.fixture(autouse=True)
+def scan_log(tmp_path, monkeypatch):
+
+    # report scan dari test jangan masuk bot.log repo
+    monkeypatch.setattr(scan_report, "LOG_PATH", str(tmp_path / "bot.log"))
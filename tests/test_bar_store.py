@@ -0,0 +1,155 @@
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core import bar_store
+from app.core.bar_store import OVERLAP_BARS, BarStore
+
+
+# ======================================================
+# YAHOO PALSU (HISTORY TETAP, DOWNLOAD DICATAT)
+# ======================================================
+
+def history(days=200, bump=0.0):
+
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days, name="Date")
+
+    close = np.linspace(100.0, 200.0, days) + bump
+
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": np.full(days, 1000.0),
+        },
+        index=index
+    )
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+
+    state = {"frame": history(), "calls": []}
+
+    def download_bars(symbol, interval="1d", period=None, start=None):
+
+        state["calls"].append({"period": period, "start": start})
+
+        df = state["frame"]
+
+        if start is not None:
+            return df[df.index >= pd.Timestamp(start)]
+
+        return bar_store._slice(df, period)
+
+    monkeypatch.setattr(bar_store, "download_bars", download_bars)
+
+    return state
+
+
+@pytest.fixture
+def store(tmp_path):
+
+    return BarStore(root=str(tmp_path))
+
+
+def age(store, seconds):
+
+    """Mundurkan fetched_at meta -> data tidak fresh lagi."""
+
+    path = store._path("BBCA.JK", "1d", "json")
+
+    with open(path) as f:
+        meta = json.load(f)
+
+    meta["fetched_at"] = time.time() - seconds
+
+    with open(path, "w") as f:
+        json.dump(meta, f)
+
+
+# ======================================================
+# PLAN: FULL / FRESH / TAIL
+# ======================================================
+
+def test_empty_store_downloads_full_period(store, yahoo):
+
+    df = store.load("BBCA.JK", "6mo", "1d")
+
+    assert yahoo["calls"] == [{"period": "6mo", "start": None}]
+
+    assert store.plan("BBCA.JK", "6mo", "1d") == ("fresh", None)
+
+    pd.testing.assert_frame_equal(df, bar_store._slice(yahoo["frame"], "6mo"), check_freq=False)
+
+
+def test_fresh_store_skips_network(store, yahoo):
+
+    first = store.load("BBCA.JK", "6mo", "1d")
+
+    second = store.load("BBCA.JK", "6mo", "1d")
+
+    assert len(yahoo["calls"]) == 1
+
+    pd.testing.assert_frame_equal(first, second, check_freq=False)
+
+
+def test_stale_store_appends_tail(store, yahoo):
+
+    yahoo["frame"] = history()[:-1]
+
+    store.load("BBCA.JK", "6mo", "1d")
+
+    stored, _ = store.read("BBCA.JK", "1d")
+
+    # bar baru muncul + store basi -> download sejak OVERLAP_BARS terakhir
+    yahoo["frame"] = history()
+
+    age(store, 30 * 24 * 3600)
+
+    mode, tail_start = store.plan("BBCA.JK", "6mo", "1d")
+
+    assert (mode, tail_start) == ("tail", stored.index[-OVERLAP_BARS])
+
+    df = store.load("BBCA.JK", "6mo", "1d")
+
+    assert yahoo["calls"][-1] == {"period": None, "start": tail_start}
+
+    assert df.index[-1] == yahoo["frame"].index[-1]
+
+    pd.testing.assert_frame_equal(df, bar_store._slice(yahoo["frame"], "6mo"), check_freq=False)
+
+
+def test_longer_period_downloads_full(store, yahoo):
+
+    store.load("BBCA.JK", "1mo", "1d")
+
+    assert store.plan("BBCA.JK", "6mo", "1d") == ("full", None)
+
+    store.load("BBCA.JK", "6mo", "1d")
+
+    assert yahoo["calls"][-1] == {"period": "6mo", "start": None}
+
+
+def test_adjustment_change_refreshes_covered_range(store, yahoo):
+
+    store.load("BBCA.JK", "6mo", "1d")
+
+    _, meta = store.read("BBCA.JK", "1d")
+
+    # split / dividen: harga lama ikut berubah -> tail ditolak
+    yahoo["frame"] = history(bump=5.0)
+
+    age(store, 30 * 24 * 3600)
+
+    df = store.load("BBCA.JK", "6mo", "1d")
+
+    assert yahoo["calls"][-1] == {"period": None, "start": meta["covered_from"]}
+
+    assert df["Close"].iloc[0] == bar_store._slice(yahoo["frame"], "6mo")["Close"].iloc[0]
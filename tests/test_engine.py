@@ -0,0 +1,171 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from app.core import engine as engine_module
+from app.core.coverage import ScanCoverage
+from app.core.engine import ScreenerEngine
+from app.core.result_memo import RESULT_MEMO
+from app.core.scan_report import last_report
+from app.screeners.base import BaseScreener
+
+
+# ======================================================
+# FAKE SCREENER (TANPA NETWORK)
+# ======================================================
+
+class BrokenScreener(BaseScreener):
+
+    """OK di-load, tapi compute() BAD selalu error."""
+
+    screener_type = "test_broken"
+
+    memo_version = 1
+
+    def load(self, kode):
+
+        return pd.DataFrame(
+            {col: [1.0, 2.0, 3.0] for col in ("OPEN", "HIGH", "LOW", "CLOSE", "VOLUME")},
+            index=pd.date_range("2024-01-01", periods=3, freq="D")
+        )
+
+    def compute(self, kode, df):
+
+        if kode == "BAD":
+            raise ValueError("rusak")
+
+        return SimpleNamespace(kode=kode, score=50) if kode == "SIG" else None
+
+
+class BrokenPanelScreener(BrokenScreener):
+
+    """Screener panel: panel gagal -> fallback compute per saham."""
+
+    screener_type = "test_broken_panel"
+
+    def analyze_panel(self, panel):
+
+        raise ValueError("panel rusak")
+
+
+SCREENERS = {
+    "test_broken": BrokenScreener,
+    "test_broken_panel": BrokenPanelScreener,
+}
+
+
+@pytest.fixture
+def memo(monkeypatch):
+
+    for screener_type, screener_cls in SCREENERS.items():
+        monkeypatch.setitem(engine_module.SCREENER_MAP, screener_type, screener_cls)
+
+    # second pass tanpa jeda
+    monkeypatch.setattr(ScanCoverage.recover, "__defaults__", (1, 0.0))
+
+    stored = []
+
+    monkeypatch.setattr(
+        RESULT_MEMO,
+        "store",
+        lambda screener, kode, df, result: stored.append(kode)
+    )
+
+    monkeypatch.setattr(RESULT_MEMO, "lookup", lambda screener, kode, df: (False, None))
+
+    monkeypatch.setattr(RESULT_MEMO, "split", lambda screener, frames: ({}, dict(frames)))
+
+    return stored
+
+
+@pytest.fixture(params=[
+    ("thread", "test_broken"),
+    ("process", "test_broken"),
+    ("thread", "test_broken_panel"),
+    ("process", "test_broken_panel"),
+], ids=lambda p: "-".join(p))
+def scan(request, memo):
+
+    mode, screener_type = request.param
+
+    engine = ScreenerEngine(mode=mode, workers=1)
+
+    results = engine.run(["SIG", "NONE", "BAD"], screener_type, prefetch=False)
+
+    return screener_type, results, memo
+
+
+def test_compute_error_is_coverage_failure(scan):
+
+    screener_type, results, _ = scan
+
+    report = last_report(screener_type)
+
+    assert [r.kode for r in results] == ["SIG"]
+
+    assert report.coverage.missing == ["BAD"]
+
+    assert report.coverage.covered == 2
+
+    assert report.counters["failures"] >= 1
+
+
+def test_compute_error_not_memoized(scan):
+
+    _, results, stored = scan
+
+    assert [r.kode for r in results] == ["SIG"]
+
+    assert "BAD" not in stored
+
+    assert {"SIG", "NONE"} <= set(stored)
+
+
+def test_iter_compute_error_is_coverage_failure(memo):
+
+    engine = ScreenerEngine(mode="thread", workers=1)
+
+    updates = list(engine.run_iter(["SIG", "NONE", "BAD"], "test_broken_panel", prefetch=False))
+
+    report = last_report("test_broken_panel")
+
+    assert [u.result.kode for u in updates if u.result is not None] == ["SIG"]
+
+    assert report.coverage.missing == ["BAD"]
+
+
+class OtherLoaderScreener(BrokenScreener):
+
+    """Loader beda: frame 4 bar (BrokenScreener 3 bar)."""
+
+    screener_type = "test_other_loader"
+
+    def load(self, kode):
+
+        return pd.concat([BrokenScreener.load(self, kode)] * 2).iloc[:4]
+
+    def compute(self, kode, df):
+
+        return SimpleNamespace(kode=kode, score=len(df)) if kode == "SIG" else None
+
+
+def test_run_many_groups_by_loader(memo, monkeypatch):
+
+    monkeypatch.setitem(engine_module.SCREENER_MAP, "test_other_loader", OtherLoaderScreener)
+
+    engine = ScreenerEngine(mode="thread", workers=1)
+
+    grouped = engine.run_many(
+        ["SIG", "NONE", "BAD"],
+        ["test_broken", "test_other_loader"],
+        prefetch=False
+    )
+
+    # tiap screener dapat frame dari load-nya sendiri
+    assert [r.score for r in grouped["test_other_loader"]] == [4]
+
+    assert [r.kode for r in grouped["test_broken"]] == ["SIG"]
+
+    # compute error run_many ikut tercatat di coverage
+    assert last_report("test_broken+test_other_loader").coverage.missing == ["BAD"]
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.features import FeatureStore
+
+
+def bars(n=80, seed=0):
+
+    rng = np.random.default_rng(seed)
+
+    close = 100 + rng.normal(0, 1, n).cumsum()
+
+    return pd.DataFrame(
+        {
+            "OPEN": close,
+            "HIGH": close + rng.uniform(0, 2, n),
+            "LOW": close - rng.uniform(0, 2, n),
+            "CLOSE": close,
+            "VOLUME": rng.uniform(1e5, 1e6, n),
+        },
+        index=pd.bdate_range("2024-01-01", periods=n)
+    )
+
+
+@pytest.fixture
+def store():
+
+    return FeatureStore()
+
+
+def computed(store):
+
+    return store.stats()["computed"]
+
+
+# ======================================================
+# REUSE 1 BAR
+# ======================================================
+
+def test_same_bar_computed_once(store):
+
+    df = bars()
+
+    first = store.frame(df, "BBCA", "1d")["ma20"]
+
+    # frame lain (copy) dengan bar sama -> tetap reuse
+    second = store.frame(df.copy(), "BBCA", "1d")["ma20"]
+
+    assert second is first
+
+    assert computed(store) == 1
+
+    assert store.stats()["reused"] == 1
+
+    pd.testing.assert_series_equal(first, df["CLOSE"].rolling(20).mean())
+
+
+def test_symbols_and_intervals_are_separate(store):
+
+    df = bars()
+
+    store.get(df, "ma20", "BBCA", "1d")
+
+    store.get(df, "ma20", "BBRI", "1d")
+
+    store.get(df, "ma20", "BBCA", "1wk")
+
+    assert computed(store) == 3
+
+    assert store.stats()["entries"] == 3
+
+
+# ======================================================
+# INVALIDASI: BAR BARU / BAR BERJALAN BERGERAK
+# ======================================================
+
+def test_new_bar_invalidates_features(store):
+
+    full = bars(81)
+
+    df = full.iloc[:-1]
+
+    before = store.frame(df, "BBCA", "1d")
+
+    ma_before = before["ma20"]
+
+    high_before = before.high(10, shift=1)
+
+    after = store.frame(full, "BBCA", "1d")
+
+    ma_after = after["ma20"]
+
+    assert ma_after is not ma_before
+
+    assert computed(store) == 3
+
+    pd.testing.assert_series_equal(ma_after, full["CLOSE"].rolling(20).mean())
+
+    assert high_before == df["HIGH"].iloc[-11:-1].max()
+
+    assert after.high(10, shift=1) == full["HIGH"].iloc[-11:-1].max()
+
+
+def test_running_bar_change_invalidates_features(store):
+
+    df = bars()
+
+    rsi_before = store.get(df, "rsi14", "BBCA", "15m")
+
+    moved = df.copy()
+
+    moved.iloc[-1, moved.columns.get_loc("CLOSE")] += 5
+
+    rsi_after = store.get(moved, "rsi14", "BBCA", "15m")
+
+    assert rsi_after.iloc[-1] != rsi_before.iloc[-1]
+
+    assert computed(store) == 2
+
+
+def test_invalidate_symbol(store):
+
+    df = bars()
+
+    store.get(df, "ma5", "BBCA", "1d")
+
+    store.get(df, "ma5", "BBRI", "1d")
+
+    store.invalidate("BBCA")
+
+    store.get(df, "ma5", "BBCA", "1d")
+
+    store.get(df, "ma5", "BBRI", "1d")
+
+    assert computed(store) == 3
+
+
+# ======================================================
+# TANPA SYMBOL / LRU
+# ======================================================
+
+def test_unknown_symbol_keyed_by_frame(store):
+
+    store.get(bars(seed=1), "ema20")
+
+    store.get(bars(seed=1), "ema20")
+
+    store.get(bars(seed=2), "ema20")
+
+    assert computed(store) == 2
+
+
+def test_lru_drops_oldest():
+
+    store = FeatureStore(max_entries=2)
+
+    df = bars()
+
+    for symbol in ("A", "B", "C"):
+        store.get(df, "ma5", symbol)
+
+    store.get(df, "ma5", "A")
+
+    assert computed(store) == 4
+
+    assert store.stats()["entries"] == 2
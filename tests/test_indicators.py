@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.indicators import (
+    IndicatorStreams,
+    StreamingEMA,
+    StreamingMACD,
+    StreamingRSI,
+    StreamingSMA,
+    TickerStream,
+    ema,
+    macd,
+    rsi,
+)
+
+
+def prices(n=300, seed=0, gaps=True):
+
+    rng = np.random.default_rng(seed)
+
+    values = 100 + rng.normal(0, 1, n).cumsum()
+
+    if gaps:
+        # bar tanpa trade (NaN), termasuk NaN berturut-turut
+        holes = [i for i in (3, 40, 41, 42, 150) if i < n] + [n - 2]
+
+        values[holes] = np.nan
+
+    return values
+
+
+def assert_close(actual, expected):
+
+    np.testing.assert_allclose(
+        np.asarray(actual, dtype=float),
+        np.asarray(expected, dtype=float),
+        rtol=1e-9,
+        atol=1e-9,
+        equal_nan=True
+    )
+
+
+# ======================================================
+# PARITY PER INDIKATOR (UPDATE + REVISE, NaN)
+# ======================================================
+
+CASES = {
+    "sma20": (lambda: StreamingSMA(20), lambda s: s.rolling(20).mean()),
+    "sma5": (lambda: StreamingSMA(5), lambda s: s.rolling(5).mean()),
+    "ema20": (lambda: StreamingEMA(20), lambda s: ema(s, 20)),
+    "rsi14": (lambda: StreamingRSI(14), lambda s: rsi(s, 14)),
+    "macd": (StreamingMACD, lambda s: pd.concat(macd(s), axis=1)),
+}
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_update_matches_batch(name):
+
+    factory, batch = CASES[name]
+
+    values = prices()
+
+    indicator = factory()
+
+    streamed = [indicator.update(x) for x in values]
+
+    assert_close(streamed, batch(pd.Series(values)).to_numpy())
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_revise_running_bar_matches_batch(name):
+
+    factory, batch = CASES[name]
+
+    values = prices()
+
+    rng = np.random.default_rng(1)
+
+    indicator = factory()
+
+    streamed = []
+
+    for x in values:
+
+        # bar baru muncul dengan harga sementara, lalu bergerak 2x
+        indicator.update(x + rng.normal())
+
+        indicator.revise(x - rng.normal())
+
+        streamed.append(indicator.revise(x))
+
+    assert_close(streamed, batch(pd.Series(values)).to_numpy())
+
+
+def test_sma_long_run_stays_exact():
+
+    values = prices(20_000, gaps=False) * 1e4
+
+    indicator = StreamingSMA(50)
+
+    for x in values:
+        indicator.update(x)
+
+    assert indicator.value == pytest.approx(values[-50:].mean(), rel=1e-12)
+
+
+# ======================================================
+# TICKER STREAM (SYNC FRAME TIAP CYCLE)
+# ======================================================
+
+def frame(n, seed=0):
+
+    rng = np.random.default_rng(seed)
+
+    close = prices(n, seed)
+
+    return pd.DataFrame(
+        {
+            "HIGH": close + rng.uniform(0, 2, n),
+            "LOW": close - rng.uniform(0, 2, n),
+            "CLOSE": close,
+            "VOLUME": rng.uniform(1e5, 1e6, n),
+        },
+        index=pd.date_range("2024-01-01 09:00", periods=n, freq="15min")
+    )
+
+
+def expected(df):
+
+    close = df["CLOSE"]
+
+    line, signal, hist = macd(close)
+
+    return {
+        "ma5": close.rolling(5).mean().iloc[-1],
+        "ma20": close.rolling(20).mean().iloc[-1],
+        "ma50": close.rolling(50).mean().iloc[-1],
+        "vol_ma20": df["VOLUME"].rolling(20).mean().iloc[-1],
+        "ema20": ema(close, 20).iloc[-1],
+        "rsi14": rsi(close, 14).iloc[-1],
+        "macd": (line.iloc[-1], signal.iloc[-1], hist.iloc[-1]),
+    }
+
+
+def assert_stream(stream, df):
+
+    for name, value in expected(df).items():
+        assert_close(stream.value(name), value)
+
+    for window in (5, 10, 20, 30):
+
+        assert_close(stream.level("high_max", window), df["HIGH"].tail(window).max())
+
+        assert_close(stream.level("low_min", window), df["LOW"].tail(window).min())
+
+
+def test_sync_growing_frame_with_running_bar():
+
+    full = frame(200)
+
+    stream = TickerStream()
+
+    assert stream.sync(full.iloc[:100]) == (100, True)
+
+    assert_stream(stream, full.iloc[:100])
+
+    for stop in range(101, 200):
+
+        # bar terakhir masih berjalan: close sementara dulu
+        running = full.iloc[:stop].copy()
+
+        running.iloc[-1, running.columns.get_loc("CLOSE")] += 3
+
+        running.iloc[-1, running.columns.get_loc("HIGH")] += 5
+
+        assert stream.sync(running) == (1, False)
+
+        assert_stream(stream, running)
+
+        # cycle berikutnya: bar yang sama sudah final, tanpa bar baru
+        assert stream.sync(full.iloc[:stop]) == (0, False)
+
+        assert_stream(stream, full.iloc[:stop])
+
+
+def test_sync_replays_when_window_shifts():
+
+    full = frame(200)
+
+    stream = TickerStream()
+
+    stream.sync(full.iloc[:150])
+
+    # jendela period geser (bar awal dibuang) -> replay penuh
+    shifted = full.iloc[10:160]
+
+    assert stream.sync(shifted) == (150, True)
+
+    assert_stream(stream, shifted)
+
+    # history beda (adjustment) di tengah -> juga replay
+    adjusted = shifted.copy()
+
+    adjusted.index = adjusted.index + pd.Timedelta(minutes=1)
+
+    assert stream.sync(adjusted)[1]
+
+    assert_stream(stream, adjusted)
+
+
+def test_registry_counts_updates_and_replays():
+
+    full = frame(120)
+
+    streams = IndicatorStreams()
+
+    streams.sync("BBCA", full.iloc[:100])
+
+    streams.sync("BBCA", full.iloc[:110])
+
+    streams.sync("BBCA", full.iloc[:110], interval="1h")
+
+    assert streams.stats() == {"entries": 2, "updates": 10, "replays": 2}
+
+    streams.invalidate("BBCA")
+
+    assert streams.stats()["entries"] == 0
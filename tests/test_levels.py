@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.levels import LEVEL_WINDOWS, MonotonicExtrema, level_at, rolling_extrema
+
+
+def series(n=200, seed=0, gaps=True):
+
+    rng = np.random.default_rng(seed)
+
+    values = 100 + rng.normal(0, 1, n).cumsum()
+
+    # harga sama berturut-turut (tie) + NaN, termasuk jendela NaN semua
+    values[20:26] = values[20]
+
+    if gaps:
+        values[[5, 60]] = np.nan
+        values[100:140] = np.nan
+
+    return values
+
+
+def reference(values, window, mode):
+
+    s = pd.Series(values)
+
+    return np.array([
+        getattr(s.iloc[:i + 1].tail(window), mode)()
+        for i in range(len(s))
+    ])
+
+
+# ======================================================
+# BATCH (TABEL DOUBLING)
+# ======================================================
+
+@pytest.mark.parametrize("mode", ["max", "min"])
+def test_rolling_extrema_matches_tail(mode):
+
+    values = series()
+
+    windows = LEVEL_WINDOWS + (1, 2, 3, 33, 64)
+
+    out = rolling_extrema(values, windows, mode)
+
+    assert set(out) == set(windows)
+
+    for window in windows:
+        np.testing.assert_array_equal(out[window], reference(values, window, mode))
+
+
+def test_rolling_extrema_panel_rows_match_1d():
+
+    panel = np.vstack([series(seed=seed) for seed in range(4)])
+
+    out = rolling_extrema(panel, (5, 20), "max")
+
+    for i in range(len(panel)):
+
+        row = rolling_extrema(panel[i], (5, 20), "max")
+
+        np.testing.assert_array_equal(out[20][i], row[20])
+
+
+def test_level_at_shift():
+
+    values = series(gaps=False)
+
+    highs = rolling_extrema(values, (10,), "max")[10]
+
+    assert level_at(highs) == pd.Series(values).tail(10).max()
+
+    assert level_at(highs, shift=1) == pd.Series(values).iloc[-11:-1].max()
+
+    assert np.isnan(level_at(highs[:1], shift=1))
+
+
+# ======================================================
+# STREAMING (MONOTONIC DEQUE)
+# ======================================================
+
+@pytest.mark.parametrize("mode", ["max", "min"])
+def test_monotonic_update_matches_tail(mode):
+
+    values = series()
+
+    extrema = MonotonicExtrema(LEVEL_WINDOWS, mode)
+
+    expected = {window: reference(values, window, mode) for window in LEVEL_WINDOWS}
+
+    for i, x in enumerate(values):
+
+        extrema.update(x)
+
+        for window in LEVEL_WINDOWS:
+            np.testing.assert_array_equal(extrema.get(window), expected[window][i])
+
+
+@pytest.mark.parametrize("mode", ["max", "min"])
+def test_monotonic_revise_matches_tail(mode):
+
+    values = series()
+
+    rng = np.random.default_rng(1)
+
+    extrema = MonotonicExtrema(LEVEL_WINDOWS, mode)
+
+    expected = {window: reference(values, window, mode) for window in LEVEL_WINDOWS}
+
+    for i, x in enumerate(values):
+
+        # bar berjalan: ekstrem sementara (spike / NaN) lalu nilai final
+        extrema.update(x + 50 * rng.choice([-1, 1]))
+
+        extrema.revise(np.nan)
+
+        extrema.revise(x)
+
+        for window in LEVEL_WINDOWS:
+            np.testing.assert_array_equal(extrema.get(window), expected[window][i])
+
+    assert extrema.value == {window: expected[window][-1] for window in LEVEL_WINDOWS}
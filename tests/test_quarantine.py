@@ -0,0 +1,157 @@
+import pandas as pd
+import pytest
+
+from app.core import quarantine as quarantine_module
+from app.core.quarantine import (
+    COOLDOWN_SECONDS,
+    FAIL_DEDUP_SECONDS,
+    FAIL_THRESHOLD,
+    ZERO_VOLUME_SESSIONS,
+    Quarantine,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+
+    now = [1_000_000.0]
+
+    monkeypatch.setattr(quarantine_module.time, "time", lambda: now[0])
+
+    return now
+
+
+@pytest.fixture
+def quarantine(tmp_path, clock):
+
+    return Quarantine(path=str(tmp_path / "quarantine.json"))
+
+
+def fail(quarantine, clock, symbol="MATI.JK", times=FAIL_THRESHOLD):
+
+    for _ in range(times):
+
+        quarantine.record_failure(symbol)
+
+        clock[0] += FAIL_DEDUP_SECONDS
+
+
+def frame(volumes):
+
+    index = pd.bdate_range("2024-01-01", periods=len(volumes))
+
+    return pd.DataFrame({"CLOSE": 100.0, "VOLUME": volumes}, index=index)
+
+
+# ======================================================
+# GAGAL -> KARANTINA -> COOLDOWN HABIS
+# ======================================================
+
+def test_repeated_failures_quarantine_symbol(quarantine, clock):
+
+    fail(quarantine, clock, times=FAIL_THRESHOLD - 1)
+
+    assert not quarantine.is_blocked("MATI.JK")
+
+    fail(quarantine, clock, times=1)
+
+    assert quarantine.is_blocked("MATI.JK")
+
+    assert quarantine.filter(["MATI", "BBCA"]) == ["BBCA"]
+
+
+def test_failures_within_dedup_count_once(quarantine, clock):
+
+    for _ in range(FAIL_THRESHOLD * 2):
+        quarantine.record_failure("MATI.JK")
+
+    assert not quarantine.is_blocked("MATI.JK")
+
+
+def test_cooldown_expires_then_doubles(quarantine, clock):
+
+    fail(quarantine, clock)
+
+    clock[0] += COOLDOWN_SECONDS
+
+    # cooldown habis -> dicoba lagi
+    assert not quarantine.is_blocked("MATI.JK")
+
+    assert quarantine.filter(["MATI"]) == ["MATI"]
+
+    # gagal lagi -> langsung karantina, cooldown 2x
+    fail(quarantine, clock, times=1)
+
+    assert quarantine.is_blocked("MATI.JK")
+
+    clock[0] += COOLDOWN_SECONDS
+
+    assert quarantine.is_blocked("MATI.JK")
+
+    clock[0] += COOLDOWN_SECONDS
+
+    assert not quarantine.is_blocked("MATI.JK")
+
+
+def test_success_after_cooldown_releases(quarantine, clock):
+
+    fail(quarantine, clock)
+
+    clock[0] += COOLDOWN_SECONDS
+
+    quarantine.record_success("MATI.JK", frame([1000.0] * 10))
+
+    assert not quarantine.is_suspect("MATI.JK")
+
+    assert quarantine.report().empty
+
+
+def test_state_shared_through_file(quarantine, clock):
+
+    fail(quarantine, clock)
+
+    other = Quarantine(path=quarantine.path)
+
+    assert other.is_blocked("MATI.JK")
+
+
+# ======================================================
+# VOLUME 0 / INDEX / OUTAGE
+# ======================================================
+
+def test_zero_volume_sessions_quarantine(quarantine):
+
+    volumes = [1000.0] * 5 + [0.0] * ZERO_VOLUME_SESSIONS
+
+    quarantine.record_success("SUSPEND.JK", frame(volumes))
+
+    assert quarantine.is_blocked("SUSPEND.JK")
+
+    quarantine.record_success("AKTIF.JK", frame(volumes[:-1] + [10.0]))
+
+    assert not quarantine.is_blocked("AKTIF.JK")
+
+
+def test_index_never_quarantined(quarantine, clock):
+
+    fail(quarantine, clock, symbol="^JKSE")
+
+    assert not quarantine.is_blocked("^JKSE")
+
+
+def test_outage_does_not_quarantine(quarantine, clock):
+
+    # network down: hampir semua load gagal -> bukan salah ticker
+    for i in range(50):
+
+        quarantine.track(f"K{i}.JK", None)
+
+        clock[0] += FAIL_DEDUP_SECONDS
+
+    assert quarantine.outage()
+
+    fail_count = sum(quarantine.is_suspect(f"K{i}.JK") for i in range(50))
+
+    assert fail_count < 50
+
+    assert not any(quarantine.is_blocked(f"K{i}.JK") for i in range(50))
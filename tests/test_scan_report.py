@@ -0,0 +1,47 @@
+from app.core.runtime import get_runtime
+from app.core.scan_report import ScanReport, count, last_report, scan_report
+
+
+async def inner_scan(name):
+
+    with scan_report(name):
+        count("retries")
+
+
+def test_nested_scan_logs_once_with_render(monkeypatch):
+
+    logged = []
+
+    monkeypatch.setattr(ScanReport, "log", lambda self: logged.append(self))
+
+    runtime = get_runtime()
+
+    # scan jalan di loop runtime (run + submit), render sesudahnya di caller
+    with scan_report("test_outer") as report:
+
+        runtime.run(inner_scan("test_inner"))
+
+        runtime.submit(inner_scan("test_inner")).result()
+
+        report.add("render", 0.25)
+
+    assert logged == [report]
+
+    assert report.counters["retries"] == 2
+
+    assert "render" in set(report.summary()["Stage"])
+
+    assert last_report("test_outer") is report
+
+    assert last_report("test_inner") is None
+
+
+def test_scan_without_outer_logs_itself(monkeypatch):
+
+    logged = []
+
+    monkeypatch.setattr(ScanReport, "log", lambda self: logged.append(self))
+
+    get_runtime().run(inner_scan("test_alone"))
+
+    assert logged == [last_report("test_alone")]
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.ohlcv import OHLCV_COLUMNS, TZ_NAME
+from app.core.panel import UniversePanel
+from app.screeners.breakout import BreakoutScreener
+from app.screeners.swing_trade_day import SwingTradeDayScreener
+from app.screeners.swing_trade_week import SwingTradeWeekScreener
+
+
+def universe(n=300, bars=170, seed=3):
+
+    """Random walk, history beda-beda + kasus tepi (volume 0, lonjakan)."""
+
+    rng = np.random.default_rng(seed)
+
+    dates = pd.bdate_range(end="2026-10-16", periods=bars, tz=TZ_NAME)
+
+    frames = {}
+
+    for i in range(n):
+
+        length = int(rng.integers(20, bars + 1))
+
+        close = rng.choice([80, 500, 3000]) * np.exp(
+            np.cumsum(rng.normal(0.002, 0.025, length))
+        )
+
+        # uptrend + pullback (kandidat swing week)
+        if i % 4 == 0 and length > 100:
+            close[-60:] = close[-60] * np.exp(np.linspace(0, 0.25, 60))
+            close[-3:] *= [0.97, 0.95, 0.97]
+
+        # lonjakan hari ini (kandidat ARA hunter)
+        if i % 3 == 0:
+            close[-1] *= rng.choice([1.03, 1.1, 1.25])
+
+        spread = np.abs(rng.normal(0, 0.01, length)) * close
+
+        df = pd.DataFrame(
+            {
+                "OPEN": close * 0.99,
+                "HIGH": close + spread,
+                "LOW": close - 4 * spread,
+                "CLOSE": close,
+                "VOLUME": rng.integers(1, 50, length) * rng.choice([1e4, 1e5, 1e6]),
+            },
+            index=dates[-length:]
+        )[OHLCV_COLUMNS]
+
+        # bar terakhir tanpa transaksi (get_last_valid_idx mundur)
+        if i % 7 == 0:
+            df.iloc[-int(rng.integers(1, 7)):, OHLCV_COLUMNS.index("VOLUME")] = 0.0
+
+        frames[f"S{i:03d}"] = df
+
+    return frames
+
+
+@pytest.mark.parametrize(
+    "screener_cls",
+    [BreakoutScreener, SwingTradeDayScreener, SwingTradeWeekScreener]
+)
+def test_panel_matches_compute(screener_cls, capsys):
+
+    frames = universe()
+
+    screener = screener_cls()
+
+    expected = {}
+
+    for kode, df in frames.items():
+
+        result = screener.compute(kode, df)
+
+        if result is not None:
+            expected[kode] = result
+
+    compute_log = capsys.readouterr().out
+
+    table = screener.analyze_panel(UniversePanel.from_frames(frames))
+
+    panel_log = capsys.readouterr().out
+
+    actual = dict(table["result"].dropna())
+
+    assert expected, "data uji tidak menghasilkan sinyal"
+
+    assert actual == expected
+
+    # log reject / debug week ikut sama & urut
+    assert panel_log == compute_log
+
+    for kode, result in actual.items():
+        assert table.loc[kode, "score"] == result.score
+
+
+def test_week_points_kept_out_of_breakdown():
+
+    frames = universe()
+
+    screener = SwingTradeWeekScreener()
+
+    results = [r for r in (screener.compute(k, df) for k, df in frames.items()) if r]
+
+    assert results
+
+    for result in results:
+
+        assert "Volume Ratio" in result.score_breakdown
+
+        assert not any(key.startswith("Skor") for key in result.score_breakdown)
+
+        assert sum(result.score_points.values()) + 40 == pytest.approx(result.score, abs=40)
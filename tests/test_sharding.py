@@ -0,0 +1,105 @@
+import os
+import socket
+import time
+
+import pytest
+
+from app.core import sharding
+from app.core.sharding import ShardCoordinator, split_shards
+
+
+# ======================================================
+# EXECUTE PALSU (JALAN DI WORKER SPAWN, TANPA NETWORK)
+# ======================================================
+
+def echo(task, engine):
+
+    # cukup lama supaya worker lain sempat start & ambil shard
+    time.sleep(0.3)
+
+    return [(kode, os.getpid()) for kode in task["codes"]]
+
+
+def die_once(task, engine):
+
+    # shard 0 percobaan pertama: worker mati tanpa kirim hasil
+    marker = os.path.join(task["tmp"], "died")
+
+    if task["shard"] == 0 and not os.path.exists(marker):
+
+        open(marker, "w").close()
+
+        os._exit(1)
+
+    return echo(task, engine)
+
+
+def _free_port():
+
+    with socket.socket() as sock:
+
+        sock.bind(("127.0.0.1", 0))
+
+        return sock.getsockname()[1]
+
+
+CODES = [f"K{i:03d}" for i in range(50)]
+
+
+# ======================================================
+# TEST
+# ======================================================
+
+def test_local_workers_cover_all_shards():
+
+    with ShardCoordinator(port=_free_port(), local_workers=3, shard_size=5, execute=echo) as coordinator:
+
+        parts = coordinator._dispatch("echo", CODES)
+
+    assert len(parts) == len(split_shards(CODES, 5))
+
+    assert [kode for part in parts for kode, _ in part] == CODES
+
+    # shard memang dibagi ke lebih dari 1 proses
+    assert len({pid for part in parts for _, pid in part}) > 1
+
+
+def test_dead_worker_shard_is_requeued(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(sharding, "POLL_INTERVAL", 0.2)
+
+    with ShardCoordinator(port=_free_port(), local_workers=2, shard_size=10, execute=die_once) as coordinator:
+
+        started = time.time()
+
+        parts = coordinator._dispatch("echo", CODES, tmp=str(tmp_path))
+
+        elapsed = time.time() - started
+
+        # worker yang mati diganti
+        assert sum(worker.is_alive() for worker in coordinator._workers.values()) == 2
+
+    assert [kode for part in parts for kode, _ in part] == CODES
+
+    assert elapsed < sharding.SHARD_TIMEOUT
+
+
+def test_stale_tasks_are_drained():
+
+    with ShardCoordinator(port=_free_port(), local_workers=0) as coordinator:
+
+        coordinator._tasks.put({"job": "lama", "shard": 0, "kind": "echo", "codes": []})
+
+        assert coordinator._drain() == 1
+
+        assert coordinator._drain() == 0
+
+
+def test_public_broker_requires_authkey():
+
+    coordinator = ShardCoordinator(host="0.0.0.0", port=_free_port())
+
+    with pytest.raises(RuntimeError):
+        coordinator.start()
+
+    assert coordinator._broker is None
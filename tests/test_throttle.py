@@ -0,0 +1,188 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import fetcher, throttle
+from app.core.quarantine import Quarantine
+from app.core.throttle import ConcurrencyController, Throttle, TokenBucket
+
+
+@pytest.fixture
+def gate(tmp_path, monkeypatch):
+
+    # bucket di tmp (tidak berbagi data/throttle.state), tanpa cooldown turun
+    monkeypatch.setattr(throttle, "DECREASE_COOLDOWN", 0.0)
+
+    gate = Throttle()
+
+    gate.bucket = TokenBucket(rate=1000, burst=1000, path=str(tmp_path / "throttle.state"))
+
+    return gate
+
+
+def request(gate, symbol=None, **failed):
+
+    with gate.slot(symbol=symbol) as slot:
+
+        if failed:
+            slot.failed(**failed)
+
+
+# ======================================================
+# AIMD
+# ======================================================
+
+def test_aimd_backoff_and_recovery(monkeypatch):
+
+    monkeypatch.setattr(throttle, "DECREASE_COOLDOWN", 0.0)
+
+    controller = ConcurrencyController(start=16, minimum=2, maximum=20)
+
+    controller.acquire()
+    controller.release(0.1, ok=False, backoff=True)
+
+    assert controller.limit == 8
+
+    # sukses sehat -> naik ~1 per putaran limit
+    for _ in range(8):
+        controller.acquire()
+        controller.release(0.1, ok=True, backoff=False)
+
+    assert 8.9 < controller.limit < 9.1
+
+    # lambat per request juga menurunkan limit (batch dinilai per cost)
+    controller.acquire()
+    controller.release(10 * throttle.LATENCY_TARGET, ok=True, backoff=False, cost=20)
+
+    assert controller.limit > 9
+
+    controller.acquire()
+    controller.release(2 * throttle.LATENCY_TARGET, ok=True, backoff=False)
+
+    assert controller.limit < 5
+
+    for _ in range(10):
+        controller.acquire()
+        controller.release(0.1, ok=False, backoff=True)
+
+    assert controller.limit == 2
+
+    assert controller.in_flight == 0
+
+
+def test_decrease_cooldown():
+
+    controller = ConcurrencyController(start=16)
+
+    for _ in range(3):
+        controller.acquire()
+        controller.release(0.1, ok=False, backoff=True)
+
+    # 1 ledakan kegagalan = 1x turun
+    assert controller.limit == 8
+
+
+# ======================================================
+# RESPON 200 KOSONG
+# ======================================================
+
+def test_empty_single_symbol_does_not_back_off(gate):
+
+    limit = gate.controller.limit
+
+    for _ in range(10):
+        request(gate, "MATI.JK", empty=True)
+
+    assert gate.controller.limit == limit
+
+    assert gate.errors == 10
+
+
+def test_empty_spread_backs_off(gate):
+
+    limit = gate.controller.limit
+
+    for i in range(throttle.EMPTY_SPREAD - 1):
+        request(gate, f"K{i}.JK", empty=True)
+
+    assert gate.controller.limit == limit
+
+    request(gate, "LAIN.JK", empty=True)
+
+    assert gate.controller.limit == limit * throttle.DECREASE_FACTOR
+
+
+def test_empty_window_expires(gate, monkeypatch):
+
+    clock = [1000.0]
+
+    monkeypatch.setattr(throttle.time, "time", lambda: clock[0])
+
+    limit = gate.controller.limit
+
+    for i in range(throttle.EMPTY_SPREAD - 1):
+        request(gate, f"K{i}.JK", empty=True)
+
+    clock[0] += throttle.EMPTY_WINDOW + 1
+
+    request(gate, "LAIN.JK", empty=True)
+
+    assert gate.controller.limit == limit
+
+
+def test_throttled_pauses_bucket(gate):
+
+    request(gate, "BBCA.JK", throttled=True)
+
+    assert gate.bucket.peek()["paused_for"] > 0
+
+    assert gate.stats()["throttled"] == 1
+
+
+class EmptySession:
+
+    """Session palsu: selalu 200 tanpa bar (soft block / ticker mati)."""
+
+    async def get(self, url, params=None):
+
+        return SimpleNamespace(
+            status_code=200,
+            content=b"{}",
+            json=lambda: {"chart": {"result": []}}
+        )
+
+
+def test_quarantined_empty_does_not_count(gate, tmp_path, monkeypatch):
+
+    quarantine = Quarantine(path=str(tmp_path / "quarantine.json"))
+
+    monkeypatch.setattr(fetcher, "THROTTLE", gate)
+
+    monkeypatch.setattr(fetcher, "QUARANTINE", quarantine)
+
+    symbols = [f"K{i}.JK" for i in range(throttle.EMPTY_SPREAD)]
+
+    # semua sudah dicatat gagal di karantina -> bukan tanda soft block
+    for symbol in symbols:
+        quarantine.record_failure(symbol)
+
+    async def download():
+
+        for symbol in symbols:
+            assert await fetcher.download_bars_async(EmptySession(), symbol) is None
+
+    limit = gate.controller.limit
+
+    asyncio.run(download())
+
+    assert gate.controller.limit == limit
+
+    assert gate.errors == len(symbols)
+
+    # symbol sehat yang tiba-tiba kosong tetap dihitung
+    quarantine.release()
+
+    asyncio.run(download())
+
+    assert gate.controller.limit == limit * throttle.DECREASE_FACTOR
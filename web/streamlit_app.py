@@ -3,6 +3,7 @@
 # ==========================================================
 import sys
 import os
+import time
 from datetime import date, datetime, timedelta
 import pytz
 
@@ -27,6 +28,8 @@ import numpy as np
 
 
 from app.core.engine import ScreenerEngine
+from app.core.quarantine import QUARANTINE
+from app.core.scan_report import current_report, scan_report
 from app.core.scanner_bsjp import scan_bsjp
 from app.config.saham_list import SAHAM_LIST
 from app.config.saham_profile import SAHAM_PROFILE
@@ -836,222 +839,190 @@ def format_rsi_status(status):
 # ===================== WEEK ================================
 # ==========================================================
 
-def scan_week(min_price=None, max_price=None):
+def _week_row(r):
 
-    engine = ScreenerEngine()
+    """StockResult swing week -> (row tabel, ready_entry)."""
 
-    results = engine.run(
-        SAHAM_LIST[:1000],
-        "swing_trade_week"
-    )
-
-    entry_rows = []
-    watchlist_rows = []
-
-    for r in results:
+    # ==================================================
+    # BASIC DATA
+    # ==================================================
 
-        if r is None:
-            continue
+    last_price = float(r.last_price)
 
-        try:
+    entry_low = float(r.entry_low)
 
-            # ==================================================
-            # BASIC DATA
-            # ==================================================
+    entry_high = float(r.entry_high)
 
-            last_price = float(r.last_price)
+    score = int(r.score)
 
-            entry_low = float(r.entry_low)
+    setup = str(r.setup)
 
-            entry_high = float(r.entry_high)
+    trend = str(r.trend)
 
-            score = int(r.score)
+    # ==================================================
+    # DISTANCE
+    # ==================================================
 
-            setup = str(r.setup)
+    distance = abs(
+        last_price - entry_low
+    ) / max(entry_low, 1)
 
-            trend = str(r.trend)
+    # ==================================================
+    # ENTRY CHECK
+    # ==================================================
 
-            # ==================================================
-            # DISTANCE
-            # ==================================================
+    distance_entry = (
 
-            distance = abs(
-                last_price - entry_low
-            ) / max(entry_low, 1)
+        abs(last_price - entry_low)
 
-            # ==================================================
-            # ENTRY CHECK
-            # ==================================================
-
-            distance_entry = (
-
-                abs(last_price - entry_low)
-
-                / max(entry_low, 1)
-            )
-
-            # ==================================================
-            # TRUE ENTRY ZONE
-            # ==================================================
-
-            in_entry = (
-
-                entry_low <= last_price <= entry_high
-            )
-
-            # ==================================================
-            # NEAR ENTRY
-            # ==================================================
+        / max(entry_low, 1)
+    )
 
-            near_entry = (
+    # ==================================================
+    # TRUE ENTRY ZONE
+    # ==================================================
 
-                distance_entry <= 0.03
-            )
+    in_entry = (
 
-            # ==================================================
-            # EXTENDED FILTER
-            # ==================================================
+        entry_low <= last_price <= entry_high
+    )
 
-            too_extended = (
+    # ==================================================
+    # NEAR ENTRY
+    # ==================================================
 
-                distance >= 0.06
-            )
+    near_entry = (
 
-            # ==================================================
-            # READY ENTRY
-            # ==================================================
-
-            ready_entry = (
+        distance_entry <= 0.03
+    )
 
-                near_entry
+    # ==================================================
+    # EXTENDED FILTER
+    # ==================================================
 
-                and
+    too_extended = (
 
-                not too_extended
+        distance >= 0.06
+    )
 
-                and
+    # ==================================================
+    # READY ENTRY
+    # ==================================================
 
-                trend != "Extended"
+    ready_entry = (
 
-                and
+        near_entry
 
-                setup in [
+        and
 
-                    "🔥 Elite Rebound",
+        not too_extended
 
-                    "🚀 Strong Pullback",
+        and
 
-                    "⚡ Healthy Setup"
-                ]
-            )
+        trend != "Extended"
 
-            # ==================================================
-            # STATUS
-            # ==================================================
+        and
 
-            if score >= 90:
+        setup in [
 
-                status = "🔥 Top Momentum"
+            "🔥 Elite Rebound",
 
-            elif score >= 80:
+            "🚀 Strong Pullback",
 
-                status = "🚀 Strong Momentum"
+            "⚡ Healthy Setup"
+        ]
+    )
 
-            elif score >= 70:
+    # ==================================================
+    # STATUS
+    # ==================================================
 
-                status = "⚡ Pre-Breakout"
+    if score >= 90:
 
-            elif score >= 60:
+        status = "🔥 Top Momentum"
 
-                status = "📈 Trend"
+    elif score >= 80:
 
-            else:
+        status = "🚀 Strong Momentum"
 
-                status = "👀 Watchlist"
+    elif score >= 70:
 
-            # ==================================================
-            # VOLUME
-            # ==================================================
+        status = "⚡ Pre-Breakout"
 
-            volume_display = "-"
+    elif score >= 60:
 
-            try:
+        status = "📈 Trend"
 
-                volume_display = (
-                    r.score_breakdown.get(
-                        "Volume",
-                        "-"
-                    )
-                )
+    else:
 
-            except:
-                pass
+        status = "👀 Watchlist"
 
-            # ==================================================
-            # ROW
-            # ==================================================
+    # ==================================================
+    # VOLUME
+    # ==================================================
 
-            row = {
+    volume_display = "-"
 
-                "Kode": r.kode,
+    try:
 
-                "Harga": int(last_price),
+        volume_display = (
+            r.score_breakdown.get(
+                "Volume",
+                "-"
+            )
+        )
 
-                "Score": score,
+    except:
+        pass
 
-                "Setup": (
+    # ==================================================
+    # ROW
+    # ==================================================
 
-                    setup
+    row = {
 
-                    if ready_entry
+        "Kode": r.kode,
 
-                    else "👀 Watchlist"
-                ),
+        "Harga": int(last_price),
 
-                "Trend": trend,
+        "Score": score,
 
-                "Near Entry": near_entry,
+        "Setup": (
 
-                "Distance": round(distance, 3),
+            setup
 
-                "Volume": volume_display,
+            if ready_entry
 
-                "Entry": (
-                    f"{int(entry_low)}"
-                    f" - "
-                    f"{int(entry_high)}"
-                ),
+            else "👀 Watchlist"
+        ),
 
-                "TP": (
-                    f"{int(r.tp[0])}"
-                    f" / "
-                    f"{int(r.tp[1])}"
-                ),
+        "Trend": trend,
 
-                "SL": int(r.sl),
-            }
+        "Near Entry": near_entry,
 
-            # ==================================================
-            # SPLIT ENTRY & WATCHLIST
-            # ==================================================
+        "Distance": round(distance, 3),
 
-            if ready_entry:
+        "Volume": volume_display,
 
-                entry_rows.append(row)
+        "Entry": (
+            f"{int(entry_low)}"
+            f" - "
+            f"{int(entry_high)}"
+        ),
 
-            else:
+        "TP": (
+            f"{int(r.tp[0])}"
+            f" / "
+            f"{int(r.tp[1])}"
+        ),
 
-                watchlist_rows.append(row)
+        "SL": int(r.sl),
+    }
 
-        except Exception as e:
+    return row, ready_entry
 
-            print(
-                "[ERROR]",
-                getattr(r, "kode", "-"),
-                e
-            )
 
-            continue
+def _week_tables(entry_rows, watchlist_rows, min_price=None, max_price=None):
 
     # ======================================================
     # DATAFRAME
@@ -1165,6 +1136,135 @@ def scan_week(min_price=None, max_price=None):
 
         watchlist_df.index += 1
 
+    return entry_df, watchlist_df
+
+
+@st.cache_resource
+def get_engine():
+
+    # 1 engine per server: event loop + thread pool dipakai ulang
+    # antar rerun / klik (tidak bocor thread, tanpa startup ulang)
+    return ScreenerEngine()
+
+
+def scan_week(min_price=None, max_price=None, on_update=None):
+
+    """
+    on_update(update, entry_rows, watchlist_rows) opsional:
+    dipanggil tiap saham selesai (tabel sementara, untuk live view).
+    """
+
+    engine = get_engine()
+
+    universe = SAHAM_LIST[:1000]
+
+    results = []
+
+    entry_rows = []
+    watchlist_rows = []
+
+    render_seconds = 0.0
+
+    # ======================================================
+    # STREAM (HASIL MUNCUL BEGITU SAHAM SELESAI)
+    # ======================================================
+
+    for update in engine.run_iter(
+        universe,
+        "swing_trade_week"
+    ):
+
+        r = update.result
+
+        if r is not None:
+
+            results.append(r)
+
+            try:
+
+                row, ready_entry = _week_row(r)
+
+                if ready_entry:
+                    entry_rows.append(row)
+                else:
+                    watchlist_rows.append(row)
+
+            except Exception as e:
+
+                print(
+                    "[ERROR]",
+                    getattr(r, "kode", "-"),
+                    e
+                )
+
+        if on_update is not None:
+
+            started = time.perf_counter()
+
+            on_update(
+                update,
+                entry_rows,
+                watchlist_rows
+            )
+
+            render_seconds += time.perf_counter() - started
+
+    # ======================================================
+    # FINAL (URUTAN SAMA DENGAN engine.run)
+    # ======================================================
+
+    order = {kode: i for i, kode in enumerate(universe)}
+
+    results.sort(key=lambda r: order.get(r.kode, 0))
+
+    results.sort(
+        key=lambda x: x.score,
+        reverse=True
+    )
+
+    entry_rows = []
+    watchlist_rows = []
+
+    for r in results:
+
+        try:
+
+            row, ready_entry = _week_row(r)
+
+        except Exception as e:
+
+            print(
+                "[ERROR]",
+                getattr(r, "kode", "-"),
+                e
+            )
+
+            continue
+
+        if ready_entry:
+            entry_rows.append(row)
+        else:
+            watchlist_rows.append(row)
+
+    started = time.perf_counter()
+
+    entry_df, watchlist_df = _week_tables(
+        entry_rows,
+        watchlist_rows,
+        min_price,
+        max_price
+    )
+
+    # waktu live table + tabel final masuk report scan
+    # (caller membuka scan_report, log sesudah render)
+    report = current_report()
+
+    if report is not None:
+        report.add(
+            "render",
+            render_seconds + time.perf_counter() - started
+        )
+
     # ======================================================
     # TERMINAL DEBUG
     # ======================================================
@@ -1224,12 +1324,30 @@ def render_screener():
         st.markdown(
             """
     - Sebelum menggunakan screener, disarankan membaca panduan di menu **📘 Strategy Guide**
-    - Untuk menu **ARA Hunter** dan **BSJP**, lakukan scan beberapa kali jika hasil tidak ditemukan atau hanya sedikit, karena:
-        - Scanner berjalan sangat cepat sehingga memungkinkan beberapa emiten terlewat pada scan tertentu
-        - Re-scan biasanya dapat membantu menangkap momentum dan kandidat tambahan
+    - Untuk menu **ARA Hunter** dan **BSJP**, hasil kosong / sedikit berarti memang sedikit emiten yang memenuhi kriteria saat itu:
+        - Emiten yang gagal di-fetch otomatis dicoba ulang di akhir scan, jadi tidak ada yang terlewat diam-diam
+        - Coverage scan (mis. 947/950 saham) ditampilkan setelah scan; scan ulang hanya perlu kalau coverage belum penuh
+        - Scan ulang di jam berikutnya tetap berguna untuk menangkap momentum baru
     """
         )
 
+    # ======================================================
+    # QUARANTINE REPORT
+    # ======================================================
+
+    quarantine_df = QUARANTINE.report()
+
+    if not quarantine_df.empty:
+
+        with st.expander(f"🚫 Ticker Dikarantina ({len(quarantine_df)})"):
+
+            st.caption(
+                "Ticker yang terus gagal load / volume 0 di-skip "
+                "sementara dari scan sampai waktu Until."
+            )
+
+            st.dataframe(quarantine_df, use_container_width=True)
+
     import subprocess
 
     # ======================================================
@@ -1327,9 +1445,11 @@ def render_screener():
 
             if "ARA Hunter" in screener_type:
 
-                df, alerts, state = scan_day(
-                    st.session_state["scanner_state"]
-                )
+                with scan_report("scan_day") as report:
+
+                    df, alerts, state = scan_day(
+                        st.session_state["scanner_state"]
+                    )
 
                 if not df.empty:
 
@@ -1358,6 +1478,8 @@ def render_screener():
 
                 st.session_state["mode"] = "day"
 
+                st.session_state["scan_report"] = report
+
                 st.session_state["data"] = df
 
             # ==================================================
@@ -1370,9 +1492,11 @@ def render_screener():
                 "Beli Sore Jual Pagi (BSJP)"
             ):
 
-                df, alerts, state = scan_bsjp(
-                    st.session_state["scanner_state"]
-                )
+                with scan_report("scan_bsjp") as report:
+
+                    df, alerts, state = scan_bsjp(
+                        st.session_state["scanner_state"]
+                    )
 
                 st.session_state[
                     "scanner_state"
@@ -1380,6 +1504,8 @@ def render_screener():
 
                 st.session_state["mode"] = "bsjp"
 
+                st.session_state["scan_report"] = report
+
                 st.session_state["data"] = df
 
             # ==================================================
@@ -1392,9 +1518,64 @@ def render_screener():
 
                 watchlist_df = pd.DataFrame()
 
+                # ==============================================
+                # LIVE VIEW (HASIL MUNCUL SELAMA SCAN)
+                # ==============================================
+
+                progress_bar = st.progress(0.0)
+
+                live_table = st.empty()
+
+                last_render = [0.0]
+
+                def on_update(update, entry_rows, watchlist_rows):
+
+                    now = time.monotonic()
+
+                    # render maks 2x per detik (kecuali update terakhir)
+                    if (
+                        update.done < update.total
+                        and now - last_render[0] < 0.5
+                    ):
+                        return
+
+                    last_render[0] = now
+
+                    rows = entry_rows + watchlist_rows
+
+                    progress_bar.progress(
+
+                        update.done / max(update.total, 1),
+
+                        text=(
+                            f"Scanning {update.done}/{update.total} | "
+                            f"hasil {len(rows)} | "
+                            f"gagal {update.failed}"
+                        )
+                    )
+
+                    if rows:
+
+                        live_table.dataframe(
+
+                            pd.DataFrame(rows)
+                            .sort_values("Score", ascending=False)
+                            .head(30)
+                            .reset_index(drop=True),
+
+                            use_container_width=True
+                        )
+
+                report = None
+
                 try:
 
-                    entry_df, watchlist_df = scan_week()
+                    # render live + tabel final ikut report scan
+                    with scan_report("swing_trade_week") as report:
+
+                        entry_df, watchlist_df = scan_week(
+                            on_update=on_update
+                        )
 
                 except Exception as e:
 
@@ -1402,8 +1583,14 @@ def render_screener():
                         f"Scan error: {e}"
                     )
 
+                progress_bar.empty()
+
+                live_table.empty()
+
                 st.session_state["mode"] = "week"
 
+                st.session_state["scan_report"] = report
+
                 st.session_state["entry_data"] = entry_df
 
                 st.session_state["watchlist_data"] = watchlist_df
@@ -1425,6 +1612,49 @@ def render_screener():
         f"{st.session_state.get('time','-')}"
     )
 
+    # ======================================================
+    # SCAN REPORT (TIMING PER STAGE)
+    # ======================================================
+
+    report = st.session_state.get("scan_report")
+
+    if report is not None and report.coverage is not None:
+
+        coverage = report.coverage
+
+        if coverage.failed:
+
+            st.warning(
+                f"📊 Coverage: {coverage} saham | "
+                f"gagal fetch: {', '.join(coverage.missing[:20])}"
+            )
+
+        else:
+            st.caption(f"📊 Coverage: {coverage} saham")
+
+    if report is not None:
+
+        with st.expander("⏱ Scan Report"):
+
+            st.caption(report.lines()[0])
+
+            st.dataframe(
+                report.summary(),
+                use_container_width=True,
+                hide_index=True
+            )
+
+            slowest = report.slowest()
+
+            if slowest:
+
+                st.caption(
+                    "🐢 Paling lambat: " + ", ".join(
+                        f"{kode} {seconds:.2f}s ({stage})"
+                        for kode, seconds, stage in slowest
+                    )
+                )
+
     # ======================================================
     # DAY
     # ======================================================